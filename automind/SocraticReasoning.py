@@ -11,7 +11,9 @@ import pathlib
 import ujson
 from datetime import datetime
 from webmind.chatter import GPT4o, GroqModel, OllamaModel
-from automind.logic import LogicTables
+from automind.confidence import ConfidenceEngine
+from automind.logic import LogicTables, has_file_handler
+from automind.tracing import tracer
 from memory.memory import create_memory_folders, store_in_stm, DialogEntry, save_valid_truth, append_json_log
 from webmind.api import APIManager
 
@@ -31,22 +33,23 @@ class SocraticReasoning:
         logs_dir = './memory/logs'
         os.makedirs(logs_dir, exist_ok=True)
 
-        # File handler for saving Socratic Reasoning logs
+        # File handler for saving Socratic Reasoning logs; the logger is shared by
+        # every instance, so each handler is attached once (see has_file_handler)
         self.socraticlogs_file = './memory/logs/socraticlogs.txt'
-        file_handler = logging.FileHandler(self.socraticlogs_file)
-        file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(file_formatter)
+        if not has_file_handler(self.logger, self.socraticlogs_file):
+            file_handler = logging.FileHandler(self.socraticlogs_file)
+            file_handler.setLevel(logging.DEBUG)
+            file_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            file_handler.setFormatter(file_formatter)
+            self.logger.addHandler(file_handler)
 
         # Stream handler to suppress lower-level logs in the terminal
-        stream_handler = logging.StreamHandler()
-        stream_handler.setLevel(logging.CRITICAL)  # Show only critical logs in the terminal
-        stream_formatter = logging.Formatter('%(message)s')
-        stream_handler.setFormatter(stream_formatter)
-
-        # Adding handlers to the logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(stream_handler)
+        if not any(type(h) is logging.StreamHandler for h in self.logger.handlers):
+            stream_handler = logging.StreamHandler()
+            stream_handler.setLevel(logging.CRITICAL)  # Show only critical logs in the terminal
+            stream_formatter = logging.Formatter('%(message)s')
+            stream_handler.setFormatter(stream_formatter)
+            self.logger.addHandler(stream_handler)
 
         # File paths for saving premises, non-premises, conclusions, and truth tables
         self.socraticlogs_file = './memory/logs/socraticlogs.txt'
@@ -62,6 +65,7 @@ class SocraticReasoning:
         self.dialogue_history = []  # List to hold the history of dialogues
         self.logical_conclusion = ""  # Variable to store the conclusion
         self.last_confidence = 0.0  # Confidence of the most recent conclusion
+        self.confidence = ConfidenceEngine()  # fuzzy confidence from the validation signals
         self.on_event = None  # optional observer callback(event_type: str, payload: dict) for live reasoning traces
         self.on_token = None  # optional callback(str) streaming the conclusion generation token by token
 
@@ -102,8 +106,9 @@ class SocraticReasoning:
         """
         error_logs_path = './memory/logs/errorlogs.txt'
         pathlib.Path(error_logs_path).parent.mkdir(parents=True, exist_ok=True)
-        with open(error_logs_path, 'a') as file:
-            file.write(f"{level.upper()}: {message}\n")
+        with tracer.span("file.write", path=error_logs_path):
+            with open(error_logs_path, 'a') as file:
+                file.write(f"{level.upper()}: {message}\n")
 
     def log_not_premise(self, message, level='info'):
         """
@@ -116,23 +121,25 @@ class SocraticReasoning:
         not_premises_path = self.not_premises_file
         pathlib.Path(not_premises_path).parent.mkdir(parents=True, exist_ok=True)
         entry = {"level": level.upper(), "message": message}
-        try:
-            with open(not_premises_path, 'r') as file:
-                logs = ujson.load(file)
-        except (FileNotFoundError, ValueError):
-            logs = []
+        with tracer.span("file.write", path=not_premises_path):
+            try:
+                with open(not_premises_path, 'r') as file:
+                    logs = ujson.load(file)
+            except (FileNotFoundError, ValueError):
+                logs = []
 
-        logs.append(entry)
-        with open(not_premises_path, 'w') as file:
-            ujson.dump(logs, file, indent=2)
+            logs.append(entry)
+            with open(not_premises_path, 'w') as file:
+                ujson.dump(logs, file, indent=2)
 
     def save_premises(self):
         """
         Saves the current list of premises to a JSON file.
         """
         pathlib.Path(self.premises_file).parent.mkdir(parents=True, exist_ok=True)
-        with open(self.premises_file, 'w') as file:
-            ujson.dump(self.premises, file, indent=2)
+        with tracer.span("file.write", path=self.premises_file):
+            with open(self.premises_file, 'w') as file:
+                ujson.dump(self.premises, file, indent=2)
 
     def add_premise(self, premise):
         """
@@ -171,7 +178,8 @@ class SocraticReasoning:
             str: A new premise generated from the current premise.
         """
         premise_text = f"- {premise}"
-        new_premise = self.chatter.generate_response(premise_text)
+        with tracer.span("premise_generation"):
+            new_premise = self.chatter.generate_response(premise_text)
         new_premise = new_premise.strip()
         self._emit("generated_premise", {"premise": new_premise})
         return new_premise
@@ -215,116 +223,142 @@ class SocraticReasoning:
         if not self.premises:  # Check if there are no premises
             return "No premises available for logic as conclusion."
 
-        current_premise = self.premises[0]  # Start with the first premise
-        additional_premises_count = 0  # Counter for additional premises
-        validated = False
-
-        # Generate new premises until a valid conclusion is drawn or the maximum limit is reached
-        while additional_premises_count < 5:
-            new_premise = self.generate_new_premise(current_premise)
-            if not self.parse_statement(new_premise):
-                continue
-            self.premises.append(new_premise)
-            self.save_premises()
-            additional_premises_count += 1
-
-            # Use the current premise as the input (knowledge) for generating a response,
-            # streaming tokens to the observer when one is attached
-            self._emit("conclusion_attempt", {"attempt": additional_premises_count})
-            if self.on_token is not None and hasattr(self.chatter, 'generate_response_with_tokens'):
-                raw_response = self.chatter.generate_response_with_tokens(current_premise, self.on_token)
-            else:
-                raw_response = self.chatter.generate_response(current_premise)
-
-            # Process the response to get the conclusion
-            conclusion = raw_response.strip()
-
-            self.logical_conclusion = conclusion  # Store the conclusion
-
-            if self.validate_conclusion():  # Validate the conclusion
-                validated = True
-                break
+        with tracer.span("reasoning.turn", premises=len(self.premises)) as turn:
+            current_premise = self.premises[0]  # Start with the first premise
+            additional_premises_count = 0  # Counter for additional premises
+            validated = False
+
+            # Generate new premises until a valid conclusion is drawn or the maximum limit is reached
+            while additional_premises_count < 5:
+                new_premise = self.generate_new_premise(current_premise)
+                if not self.parse_statement(new_premise):
+                    continue
+                self.premises.append(new_premise)
+                self.save_premises()
+                additional_premises_count += 1
+
+                # Use the current premise as the input (knowledge) for generating a response,
+                # streaming tokens to the observer when one is attached
+                self._emit("conclusion_attempt", {"attempt": additional_premises_count})
+                with tracer.span("conclusion_generation", attempt=additional_premises_count):
+                    if self.on_token is not None and hasattr(self.chatter, 'generate_response_with_tokens'):
+                        raw_response = self.chatter.generate_response_with_tokens(current_premise, self.on_token)
+                    else:
+                        raw_response = self.chatter.generate_response(current_premise)
+
+                # Process the response to get the conclusion
+                conclusion = raw_response.strip()
+
+                self.logical_conclusion = conclusion  # Store the conclusion
+
+                if self.validate_conclusion(retries=additional_premises_count):  # Validate the conclusion
+                    validated = True
+                    break
+                else:
+                    self.log_not_premise('Invalid conclusion. Generating more premises.', level='error')
+
+            # Save the conclusion along with premises
+            conclusion_entry = {"premises": self.premises, "conclusion": self.logical_conclusion}
+            pathlib.Path(self.premises_file).parent.mkdir(parents=True, exist_ok=True)
+            with tracer.span("file.write", path=self.premises_file):
+                with open(self.premises_file, 'w') as file:
+                    ujson.dump(conclusion_entry, file, indent=2)
+
+            # Log the conclusion to conclusions.txt
+            pathlib.Path(self.conclusions_file).parent.mkdir(parents=True, exist_ok=True)
+            with tracer.span("file.write", path=self.conclusions_file):
+                with open(self.conclusions_file, 'a') as file:
+                    file.write(f"Premises: {self.premises}\nConclusion: {self.logical_conclusion}\n")
+
+            if validated:
+                # Save the validated conclusion as a truth and register it with the logic tables
+                self.save_truth(self.logical_conclusion)
+                self.update_logic_tables(
+                    self.logic_tables.variables,
+                    self.logic_tables.expressions,
+                    self.logic_tables.valid_truths + [self.logical_conclusion])
             else:
-                self.log_not_premise('Invalid conclusion. Generating more premises.', level='error')
+                # An unvalidated conclusion is a belief, not a truth; its confidence
+                # is the last validation's
+                self.log_not_premise(
+                    f'Unvalidated conclusion (confidence {self.last_confidence}): {self.logical_conclusion}',
+                    level='error')
 
-        # Save the conclusion along with premises
-        conclusion_entry = {"premises": self.premises, "conclusion": self.logical_conclusion}
-        pathlib.Path(self.premises_file).parent.mkdir(parents=True, exist_ok=True)
-        with open(self.premises_file, 'w') as file:
-            ujson.dump(conclusion_entry, file, indent=2)
-
-        # Log the conclusion to conclusions.txt
-        pathlib.Path(self.conclusions_file).parent.mkdir(parents=True, exist_ok=True)
-        with open(self.conclusions_file, 'a') as file:
-            file.write(f"Premises: {self.premises}\nConclusion: {self.logical_conclusion}\n")
-
-        if validated:
-            # Save the validated conclusion as a truth and register it with the logic tables
-            self.save_truth(self.logical_conclusion)
-            self.update_logic_tables(
-                self.logic_tables.variables,
-                self.logic_tables.expressions,
-                self.logic_tables.valid_truths + [self.logical_conclusion])
-        else:
-            # An unvalidated conclusion is a belief, not a truth
-            self.last_confidence = 0.3
-            self.log_not_premise(
-                f'Unvalidated conclusion (confidence 0.3): {self.logical_conclusion}', level='error')
-
-        self._emit("conclusion", {
-            "conclusion": self.logical_conclusion,
-            "validated": validated,
-            "confidence": self.last_confidence,
-        })
+            self._emit("conclusion", {
+                "conclusion": self.logical_conclusion,
+                "validated": validated,
+                "confidence": self.last_confidence,
+            })
+            turn.set(attempts=additional_premises_count, validated=validated,
+                     confidence=self.last_confidence)
 
-        # Clear the premises list for the next round
-        self.premises = []
+            # Clear the premises list for the next round
+            self.premises = []
 
-        return self.logical_conclusion  # Return the conclusion
+            return self.logical_conclusion  # Return the conclusion
 
-    def validate_conclusion(self):
+    def validate_conclusion(self, retries=1):
         """
         Validates the logical conclusion: truth tables for genuinely
         propositional statements, LLM judgment for natural language.
-        Sets self.last_confidence.
+        Sets self.last_confidence from the fuzzy confidence engine
+        (automind/confidence.py).
+
+        Args:
+            retries: the conclusion attempt being validated (1 for the first),
+                scored by the confidence engine.
 
         Returns:
             bool: True if the conclusion is valid, False otherwise.
         """
-        conclusion = self.logical_conclusion
-
-        # fast path: propositional expressions go through the truth tables
-        if self.logic_tables.variables and self.logic_tables.is_propositional(conclusion):
-            valid = self.logic_tables.tautology(conclusion)
-            self.last_confidence = 1.0 if valid else 0.4
-            self._emit("validation", {"method": "truth_table", "valid": valid,
-                                      "confidence": self.last_confidence})
+        with tracer.span("validation") as span:
+            conclusion = self.logical_conclusion
+
+            # fast path: propositional expressions go through the truth tables
+            if self.logic_tables.variables and self.logic_tables.is_propositional(conclusion):
+                span.set(method="truth_table")
+                valid = self.logic_tables.tautology(conclusion)
+                self.last_confidence = self._assess(retries, truth_table=valid)
+                self._emit("validation", {"method": "truth_table", "valid": valid,
+                                          "confidence": self.last_confidence,
+                                          "signals": self.confidence.last_signals})
+                span.set(valid=valid)
+                return valid
+
+            # primary path: LLM-judged validation of the conclusion against the premises
+            premises_text = "\n".join(f"- {p}" for p in self.premises)
+            judgment_prompt = (
+                "You are validating a conclusion against its premises.\n"
+                f"Premises:\n{premises_text}\n"
+                f"Conclusion: {conclusion}\n"
+                "Does the conclusion follow from and remain consistent with the premises? "
+                "Answer exactly VALID or INVALID."
+            )
+            span.set(method="llm_judgment")
+            try:
+                verdict = self.chatter.generate_response(judgment_prompt).strip().upper()
+            except Exception as e:
+                self.socraticlogs(f"validation error: {e}", level='error')
+                self.last_confidence = self._assess(retries)
+                span.set(valid=False, error="validation_error")
+                return False
+            valid = verdict.startswith("VALID")
+            self.last_confidence = self._assess(retries, verdict=valid)
+            self._emit("validation", {"method": "llm_judgment", "valid": valid,
+                                      "confidence": self.last_confidence,
+                                      "signals": self.confidence.last_signals})
+            span.set(valid=valid)
             return valid
 
-        # primary path: LLM-judged validation of the conclusion against the premises
-        premises_text = "\n".join(f"- {p}" for p in self.premises)
-        judgment_prompt = (
-            "You are validating a conclusion against its premises.\n"
-            f"Premises:\n{premises_text}\n"
-            f"Conclusion: {conclusion}\n"
-            "Does the conclusion follow from and remain consistent with the premises? "
-            "Answer exactly VALID or INVALID."
-        )
-        try:
-            verdict = self.chatter.generate_response(judgment_prompt).strip().upper()
-        except Exception as e:
-            self.socraticlogs(f"validation error: {e}", level='error')
-            self.last_confidence = 0.3
-            return False
-        valid = verdict.startswith("VALID")
-        self.last_confidence = 0.9 if valid else 0.4
-        self._emit("validation", {"method": "llm_judgment", "valid": valid,
-                                  "confidence": self.last_confidence})
-        return valid
+    def _assess(self, retries, truth_table=None, verdict=None):
+        """Fuzzy confidence of the current conclusion from its validation signals."""
+        return self.confidence.assess(self.logical_conclusion, self.premises, truth_table=truth_table,
+                                      verdict=verdict, retries=retries)
 
     def save_truth(self, truth):
         """
-        Saves the valid conclusion as a truth (JSON-array log with confidence).
+        Saves the valid conclusion as a truth (JSON-array log with the fuzzy
+        confidence and the signals behind it).
 
         Args:
             truth: The truth to be saved.
@@ -332,6 +366,7 @@ class SocraticReasoning:
         truth_tables_entry = {
             "truth": truth,
             "confidence": self.last_confidence,
+            "signals": self.confidence.last_signals,
             "timestamp": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
         append_json_log(self.truth_tables_file, truth_tables_entry)
@@ -357,15 +392,17 @@ class SocraticReasoning:
             "valid_truths": valid_truths
         }
         pathlib.Path(self.truth_tables_state_file).parent.mkdir(parents=True, exist_ok=True)
-        with open(self.truth_tables_state_file, 'w') as file:
-            ujson.dump(truth_tables_entry, file, indent=2)
+        with tracer.span("file.write", path=self.truth_tables_state_file):
+            with open(self.truth_tables_state_file, 'w') as file:
+                ujson.dump(truth_tables_entry, file, indent=2)
 
         # Save a timestamped file in ./memory/truth
         timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
         belief_timestamp_file = f'./memory/truth/belief_{timestamp}.json'
         pathlib.Path(belief_timestamp_file).parent.mkdir(parents=True, exist_ok=True)
-        with open(belief_timestamp_file, 'w') as file:
-            ujson.dump(truth_tables_entry, file, indent=2)
+        with tracer.span("file.write", path=belief_timestamp_file):
+            with open(belief_timestamp_file, 'w') as file:
+                ujson.dump(truth_tables_entry, file, indent=2)
 
         # Prepare and save the structured truth log for training
         structured_truth = {
@@ -377,9 +414,10 @@ class SocraticReasoning:
         }
         truth_log_path = './memory/truth/truth_log.json'
         pathlib.Path(truth_log_path).parent.mkdir(parents=True, exist_ok=True)
-        with open(truth_log_path, 'a') as file:
-            ujson.dump(structured_truth, file, indent=2)
-            file.write("\n")
+        with tracer.span("file.write", path=truth_log_path):
+            with open(truth_log_path, 'a') as file:
+                ujson.dump(structured_truth, file, indent=2)
+                file.write("\n")
 
         # Add a log entry to confirm the update
         self.logger.info("Updated logic tables: %s", truth_tables_entry)
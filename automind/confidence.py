@@ -0,0 +1,201 @@
+# confidence.py (c) 2024 Gregory L. Magnusson MIT license
+# fuzzy confidence for SocraticReasoning conclusions
+# five validation signals are combined by a Mamdani rule base from automindx.fuzzy:
+#   truth_table  LogicTables tautology result (1 / 0, 0.5 when not propositional)
+#   verdict      LLM judgment VALID / INVALID (0.5 when the judge failed or wasn't asked)
+#   retries      conclusion attempts so far (1..5)
+#   agreement    share of each premise's content words the conclusion keeps
+#   history      earlier verdicts for the same conclusion (0.5 when never seen)
+# the rule base is precompiled once per process: RuleBase.infer_batch evaluates it
+# over a grid of every signal combination in one vectorized pass, and score() is a
+# table lookup with bilinear interpolation in agreement and history (microseconds)
+# without numpy (the optional [learn] extras) score() returns the fixed confidences
+# SocraticReasoning used before: 1.0 / 0.4 truth table, 0.9 / 0.4 LLM, 0.3 unvalidated
+
+import re
+import threading
+from collections import OrderedDict
+
+from automindx import fuzzy
+
+LEVELS = (0.0, 0.5, 1.0)  # truth_table and verdict: false / unknown / true
+MAX_RETRIES = 5
+STEPS = 11  # grid points for agreement and history
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset("a an and are as at be by for from has have in is it its of on or that the "
+                       "then therefore this to was were will with".split())
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def build_rule_base():
+    """
+    The confidence rule base and its input domains.
+
+    Returns:
+        tuple: (RuleBase, {signal name: Domain})
+    """
+    truth = fuzzy.Domain("truth_table", 0, 1, res=0.5)
+    truth.false, truth.true = fuzzy.S(0, 0.5), fuzzy.R(0.5, 1)
+    truth.unknown = fuzzy.triangular(0.25, 0.75)
+    verdict = fuzzy.Domain("verdict", 0, 1, res=0.5)
+    verdict.invalid, verdict.valid = fuzzy.S(0, 0.5), fuzzy.R(0.5, 1)
+    verdict.unknown = fuzzy.triangular(0.25, 0.75)
+    retries = fuzzy.Domain("retries", 0, MAX_RETRIES)
+    retries.few, retries.many = fuzzy.S(1, 3), fuzzy.R(2, MAX_RETRIES)
+    agreement = fuzzy.Domain("agreement", 0, 1, res=0.1)
+    agreement.high = fuzzy.R(0.3, 0.8)
+    history = fuzzy.Domain("history", 0, 1, res=0.1)
+    history.bad, history.good = fuzzy.S(0, 0.5), fuzzy.R(0.5, 1)
+    confidence = fuzzy.Domain("confidence", 0, 1, res=0.01)
+    confidence.low = fuzzy.triangular(0, 0.5, c=0.25)
+    confidence.medium = fuzzy.triangular(0.3, 0.8, c=0.55)
+    confidence.high = fuzzy.triangular(0.65, 1, c=0.9)
+    confidence.certain = fuzzy.R(0.9, 1)
+    rules = fuzzy.RuleBase({
+        truth.true: confidence.certain,
+        truth.false: confidence.low,
+        (verdict.valid, retries.few): confidence.high,
+        (verdict.valid, retries.many): confidence.medium,
+        (verdict.valid, retries.few, agreement.high): confidence.certain,
+        verdict.invalid: confidence.low,
+        (verdict.unknown, truth.unknown): confidence.low,
+        history.good: confidence.high,
+        history.bad: confidence.low,
+    })
+    domains = {"truth_table": truth, "verdict": verdict, "retries": retries,
+               "agreement": agreement, "history": history}
+    return rules, domains
+
+
+def compile_table():
+    """
+    Infer the rule base over every grid combination of the signals in one batch.
+
+    Returns:
+        list: nested lists indexed [truth_table][verdict][retries][agreement][history].
+    """
+    rules, domains = build_rule_base()
+    steps = fuzzy.np.linspace(0, 1, STEPS)
+    grids = fuzzy.np.meshgrid(LEVELS, LEVELS, fuzzy.np.arange(MAX_RETRIES + 1), steps, steps,
+                              indexing="ij")
+    names = ("truth_table", "verdict", "retries", "agreement", "history")
+    values = rules.infer_batch({domains[n]: g.ravel() for n, g in zip(names, grids)})
+    values = fuzzy.np.nan_to_num(values, nan=0.3)  # no rule fired: an unvalidated belief
+    return values.reshape(grids[0].shape).tolist()  # python floats index fastest
+
+
+def _precompiled():
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                _table = compile_table()
+    return _table
+
+
+def _level(value):
+    """True / False / None -> index into LEVELS."""
+    return 1 if value is None else (2 if value else 0)
+
+
+def _words(text):
+    return {w for w in _WORD.findall(text.lower()) if w not in _STOPWORDS}
+
+
+def premise_agreement(conclusion, premises):
+    """
+    Mean share of each premise's content words that reappear in the conclusion
+    (0.5 when there is nothing to compare).
+    """
+    words = _words(conclusion)
+    shares = []
+    for premise in premises:
+        premise_words = _words(premise)
+        if premise_words:
+            shares.append(len(words & premise_words) / len(premise_words))
+    return sum(shares) / len(shares) if shares and words else 0.5
+
+
+def score(truth_table=None, verdict=None, retries=1, agreement=0.5, history=0.5):
+    """
+    Confidence in [0, 1] for one conclusion.
+
+    Args:
+        truth_table: tautology result, or None when the truth tables weren't used.
+        verdict: LLM judgment, or None when it wasn't asked or failed.
+        retries: conclusion attempts so far.
+        agreement: premise agreement in [0, 1].
+        history: share of earlier VALID verdicts for this conclusion in [0, 1].
+
+    Returns:
+        float: the defuzzified confidence, rounded to 3 decimals.
+    """
+    if fuzzy.np is None:
+        if truth_table is not None:
+            return 1.0 if truth_table else 0.4
+        return 0.3 if verdict is None else (0.9 if verdict else 0.4)
+    plane = _precompiled()[_level(truth_table)][_level(verdict)][min(max(int(retries), 0), MAX_RETRIES)]
+    a = min(max(agreement, 0.0), 1.0) * (STEPS - 1)
+    h = min(max(history, 0.0), 1.0) * (STEPS - 1)
+    i, j = min(int(a), STEPS - 2), min(int(h), STEPS - 2)
+    a, h = a - i, h - j
+    low, high = plane[i], plane[i + 1]
+    value = ((low[j] * (1 - h) + low[j + 1] * h) * (1 - a)
+             + (high[j] * (1 - h) + high[j + 1] * h) * a)
+    return round(value, 3)
+
+
+class ConfidenceEngine:
+    """
+    Scores conclusions from their validation signals and remembers the verdicts
+    each conclusion received (the history signal) in a bounded LRU.
+
+    Args:
+        history_size: distinct conclusions remembered.
+    """
+    def __init__(self, history_size=1024):
+        self.history_size = history_size
+        self.history = OrderedDict()  # normalized conclusion: [valid verdicts, verdicts]
+        self.last_signals = {}
+
+    @staticmethod
+    def _key(conclusion):
+        return " ".join(conclusion.lower().split())
+
+    def history_signal(self, conclusion):
+        seen = self.history.get(self._key(conclusion))
+        return 0.5 if seen is None else seen[0] / seen[1]
+
+    def record(self, conclusion, valid):
+        """Remember one verdict for conclusion."""
+        key = self._key(conclusion)
+        seen = self.history.pop(key, None) or [0, 0]
+        seen[0] += bool(valid)
+        seen[1] += 1
+        self.history[key] = seen
+        if len(self.history) > self.history_size:
+            self.history.popitem(last=False)
+
+    def assess(self, conclusion, premises, truth_table=None, verdict=None, retries=1):
+        """
+        Score a conclusion, then record its verdict in the history.
+
+        Returns:
+            float: the confidence; the signals used are kept in last_signals.
+        """
+        signals = {
+            "truth_table": truth_table,
+            "verdict": verdict,
+            "retries": retries,
+            "agreement": round(premise_agreement(conclusion, premises), 3),
+            "history": round(self.history_signal(conclusion), 3),
+        }
+        confidence = score(**signals)
+        valid = truth_table if truth_table is not None else verdict
+        if valid is not None:
+            self.record(conclusion, valid)
+        self.last_signals = signals
+        return confidence
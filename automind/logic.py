@@ -16,7 +16,9 @@ import logging
 import datetime
 import pathlib
 import json
+import os
 from memory.memory import create_memory_folders, save_valid_truth, store_in_stm, DialogEntry
+from automind.tracing import tracer
 
 # word-infix connectives rewritten to python-evaluable forms before parsing
 _INFIX_REWRITES = [
@@ -73,6 +75,16 @@ class SafeBooleanEvaluator(ast.NodeVisitor):
     def generic_visit(self, node):
         raise ValueError(f"disallowed expression element: {type(node).__name__}")
 
+def has_file_handler(logger, path):
+    """
+    True when logger already writes to path. Loggers are process-wide, so every
+    instance constructing its own FileHandler would duplicate lines and leak
+    file descriptors (one isolated SocraticReasoning per API request).
+    """
+    target = os.path.abspath(path)
+    return any(isinstance(h, logging.FileHandler) and h.baseFilename == target
+               for h in logger.handlers)
+
 class LogicTables:
     def __init__(self):
         self.variables = []
@@ -87,20 +99,21 @@ class LogicTables:
         pathlib.Path(general_log_dir).mkdir(parents=True, exist_ok=True)
         pathlib.Path(memory_log_dir).mkdir(parents=True, exist_ok=True)
 
-        # General log file for mindx
-        file_handler_mindx = logging.FileHandler(f'{general_log_dir}/log.txt')
-        file_handler_mindx.setLevel(logging.DEBUG)
-        file_formatter_mindx = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler_mindx.setFormatter(file_formatter_mindx)
+        # General log file for mindx (attached once per process, see has_file_handler)
+        if not has_file_handler(self.logger, f'{general_log_dir}/log.txt'):
+            file_handler_mindx = logging.FileHandler(f'{general_log_dir}/log.txt')
+            file_handler_mindx.setLevel(logging.DEBUG)
+            file_formatter_mindx = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            file_handler_mindx.setFormatter(file_formatter_mindx)
+            self.logger.addHandler(file_handler_mindx)
 
         # Log file for memory/truth
-        file_handler_memory = logging.FileHandler(f'{memory_log_dir}/logs.txt')
-        file_handler_memory.setLevel(logging.DEBUG)
-        file_formatter_memory = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler_memory.setFormatter(file_formatter_memory)
-
-        self.logger.addHandler(file_handler_mindx)
-        self.logger.addHandler(file_handler_memory)
+        if not has_file_handler(self.logger, f'{memory_log_dir}/logs.txt'):
+            file_handler_memory = logging.FileHandler(f'{memory_log_dir}/logs.txt')
+            file_handler_memory.setLevel(logging.DEBUG)
+            file_formatter_memory = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            file_handler_memory.setFormatter(file_formatter_memory)
+            self.logger.addHandler(file_handler_memory)
 
         # Remove any other handlers (like StreamHandler) if they exist
         self.logger.propagate = False
@@ -200,15 +213,17 @@ class LogicTables:
 
     def generate_truth_table(self):
         n = len(self.variables)
-        combinations = list(itertools.product([True, False], repeat=n))
-        truth_table = []
-
-        for combo in combinations:
-            values = {self.variables[i]: combo[i] for i in range(n)}
-            result = values.copy()
-            for expr in self.expressions:
-                result[expr] = self.evaluate_expression(expr, values)
-            truth_table.append(result)
+        with tracer.span("truth_table", variables=n, expressions=len(self.expressions)) as span:
+            combinations = list(itertools.product([True, False], repeat=n))
+            truth_table = []
+
+            for combo in combinations:
+                values = {self.variables[i]: combo[i] for i in range(n)}
+                result = values.copy()
+                for expr in self.expressions:
+                    result[expr] = self.evaluate_expression(expr, values)
+                truth_table.append(result)
+            span.set(rows=len(truth_table))
 
         self.log(f"Generated truth table with {len(truth_table)} rows")
         self.output_belief(f"Generated truth table with {len(truth_table)} rows")
@@ -249,13 +264,16 @@ class LogicTables:
         return self.valid_truths
 
     def tautology(self, expression):
-        truth_table = self.generate_truth_table()
-        for row in truth_table:
-            if not self.evaluate_expression(expression, row):
-                self.log(f"Expression '{expression}' is not a tautology.", level='info')
-                return False
-        self.log(f"Expression '{expression}' is a tautology.", level='info')
-        return True
+        with tracer.span("tautology", variables=len(self.variables)) as span:
+            truth_table = self.generate_truth_table()
+            for row in truth_table:
+                if not self.evaluate_expression(expression, row):
+                    self.log(f"Expression '{expression}' is not a tautology.", level='info')
+                    span.set(tautology=False)
+                    return False
+            self.log(f"Expression '{expression}' is a tautology.", level='info')
+            span.set(tautology=True)
+            return True
 
     def modus_ponens(self, fact1, fact2):
         if fact1['type'] == 'fact' and fact2['type'] == 'rule':
@@ -0,0 +1,293 @@
+# metrics.py (c) 2024 Gregory L. Magnusson MIT license
+# operational metrics for ezAGI in the Prometheus text exposition format (0.0.4)
+# no client library: counters, gauges and histograms are kept in per-thread cells so
+# the hot paths (chatter calls, file writes, reasoning turns) increment without a lock;
+# /metrics sums the cells when scraped, and a thread's cell is folded into a shared base
+# when the thread exits, so pools that come and go do not grow the cell list
+# most metrics are fed from trace spans (automind/tracing.py) through MetricsExporter:
+#   llm             -> ezagi_llm_requests_total, ezagi_llm_request_seconds, ezagi_llm_ttft_seconds
+#   reasoning.turn  -> ezagi_reasoning_turn_seconds
+#   bdi.deliberate  -> ezagi_bdi_deliberation_seconds
+#   file.write      -> ezagi_file_write_seconds
+#   other stages    -> ezagi_stage_seconds
+# token counts are fed by OpenMind._account_usage (deltas of chatter.cumulative_usage),
+# cache lookups by record_cache() (bdi.validity, fuzzy.grid, fuzzy.rule_table, decision.validation);
+# queue depths and sessions are callback gauges
+
+import math
+import os
+import threading
+import weakref
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Sentinel:
+    """Weak-referenceable marker held in a thread's local storage."""
+    __slots__ = ("__weakref__",)
+
+
+class _Metric:
+    """
+    Base for metrics with per-thread cells. Each thread writes only to its own
+    dict (created once under a lock); collection sums every live thread's dict and
+    the base that the cells of exited threads were folded into.
+    """
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._cells = {}  # id(cell) -> cell, for live threads
+        self._base = {}  # folded cells of threads that have exited
+        self._cells_lock = threading.Lock()
+
+    def _cell(self):
+        cell = getattr(self._local, "cell", None)
+        if cell is None:
+            cell = self._local.cell = {}
+            # the thread's local storage is dropped when it exits, collecting the sentinel
+            self._local.sentinel = sentinel = _Sentinel()
+            weakref.finalize(sentinel, self._fold, cell)
+            with self._cells_lock:
+                self._cells[id(cell)] = cell
+        return cell
+
+    def _fold(self, cell):
+        with self._cells_lock:
+            self._cells.pop(id(cell), None)
+            self._combine(self._base, cell)
+
+    def _combine(self, totals, snapshot):
+        """Add a cell snapshot into totals, replacing (never mutating) the values in totals."""
+        raise NotImplementedError
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _snapshots(self):
+        with self._cells_lock:
+            cells = list(self._cells.values())
+            base = dict(self._base)
+        return [base] + [dict(cell) for cell in cells]  # dict() copies atomically under the GIL
+
+    def collect(self):
+        totals = {}
+        for snapshot in self._snapshots():
+            self._combine(totals, snapshot)
+        return totals
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Monotonic counter."""
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("counters only go up")
+        cell = self._cell()
+        key = self._key(labels)
+        cell[key] = cell.get(key, 0) + amount
+
+    def _combine(self, totals, snapshot):
+        for key, value in snapshot.items():
+            totals[key] = totals.get(key, 0) + value
+
+    def value(self, **labels):
+        return self.collect().get(self._key(labels), 0)
+
+    def render(self):
+        lines = self.header()
+        for key, value in sorted(self.collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket latency histogram (seconds)."""
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        cell = self._cell()
+        key = self._key(labels)
+        state = cell.get(key)
+        if state is None:
+            state = cell[key] = [[0] * len(self.buckets), 0.0, 0]  # per-bucket counts, sum, count
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[0][i] += 1
+                break
+        state[1] += value
+        state[2] += 1
+
+    def _combine(self, totals, snapshot):
+        empty = ([0] * len(self.buckets), 0.0, 0)
+        for key, (counts, total, count) in snapshot.items():
+            merged_counts, merged_total, merged_count = totals.get(key, empty)
+            totals[key] = [[a + b for a, b in zip(merged_counts, counts)],
+                           merged_total + total, merged_count + count]
+
+    def render(self):
+        lines = self.header()
+        for key, (counts, total, count) in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, n in zip(self.buckets, counts):
+                cumulative += n
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(float(bound))}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            plain = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {_format_value(total)}")
+            lines.append(f"{self.name}_count{plain} {count}")
+        return lines
+
+
+class Gauge(_Metric):
+    """
+    A value read when scraped from a callback. The callback returns a number,
+    or a {label-values tuple: number} dict for labelled gauges.
+    """
+    kind = "gauge"
+
+    def __init__(self, name, documentation, callback, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def collect(self):
+        value = self.callback()
+        if isinstance(value, dict):
+            return {tuple(str(v) for v in key): val for key, val in value.items()}
+        return {(): value}
+
+    def render(self):
+        lines = self.header()
+        try:
+            collected = self.collect()
+        except Exception:
+            return lines  # a failing callback drops its samples, never the scrape
+        for key, value in sorted(collected.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Registry:
+    """Named metrics rendered together for one /metrics scrape."""
+    def __init__(self):
+        self.metrics = {}
+
+    def register(self, metric):
+        existing = self.metrics.get(metric.name)
+        if existing is not None and type(existing) is type(metric) and not isinstance(metric, Gauge):
+            return existing  # re-registering (e.g. a module reload) keeps the original counts
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, callback, labelnames=()):
+        return self.register(Gauge(name, documentation, callback, labelnames))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+LLM_REQUESTS = REGISTRY.counter(
+    "ezagi_llm_requests_total", "LLM calls by provider and outcome.", ("provider", "status"))
+LLM_LATENCY = REGISTRY.histogram(
+    "ezagi_llm_request_seconds", "LLM call latency by provider.", ("provider",))
+LLM_TTFT = REGISTRY.histogram(
+    "ezagi_llm_ttft_seconds", "LLM time to first token by provider.", ("provider",))
+TOKENS = REGISTRY.counter(
+    "ezagi_tokens_total", "Tokens accounted per turn from chatter cumulative_usage.",
+    ("provider", "direction"))
+TURN_LATENCY = REGISTRY.histogram(
+    "ezagi_reasoning_turn_seconds", "SocraticReasoning turn duration.")
+DELIBERATION_LATENCY = REGISTRY.histogram(
+    "ezagi_bdi_deliberation_seconds", "BDI Deliberator cycle duration.",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0))
+STAGE_LATENCY = REGISTRY.histogram(
+    "ezagi_stage_seconds", "Reasoning stage duration (validation, truth tables, generation).",
+    ("stage",))
+FILE_IO_LATENCY = REGISTRY.histogram(
+    "ezagi_file_write_seconds", "Memory/log write latency by folder.", ("folder",))
+CACHE_REQUESTS = REGISTRY.counter(
+    "ezagi_cache_requests_total", "Cache lookups by cache and result (hit/miss).",
+    ("cache", "result"))
+
+
+def record_cache(cache, hit):
+    """Count one lookup against a named cache; hit rate = hit / (hit + miss)."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def record_tokens(provider, input_tokens, output_tokens):
+    """Count the tokens of one accounted turn."""
+    if input_tokens > 0:
+        TOKENS.inc(input_tokens, provider=provider, direction="input")
+    if output_tokens > 0:
+        TOKENS.inc(output_tokens, provider=provider, direction="output")
+
+
+class MetricsExporter:
+    """Tracer exporter that turns finished spans into REGISTRY observations."""
+    def export(self, span):
+        seconds = (span.duration_ms or 0.0) / 1000.0
+        attrs = span.attrs
+        if span.name == "llm":
+            provider = attrs.get("provider", "unknown")
+            LLM_REQUESTS.inc(provider=provider, status="error" if "error" in attrs else "ok")
+            LLM_LATENCY.observe(seconds, provider=provider)
+            if attrs.get("ttft_ms") is not None:
+                LLM_TTFT.observe(attrs["ttft_ms"] / 1000.0, provider=provider)
+        elif span.name == "reasoning.turn":
+            TURN_LATENCY.observe(seconds)
+        elif span.name == "bdi.deliberate":
+            DELIBERATION_LATENCY.observe(seconds)
+        elif span.name == "file.write":
+            folder = os.path.dirname(os.path.normpath(str(attrs.get("path", "")))) or "."
+            FILE_IO_LATENCY.observe(seconds, folder=folder)
+        else:
+            STAGE_LATENCY.observe(seconds, stage=span.name)
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
@@ -18,6 +18,7 @@ from memory.memory import (create_memory_folders, store_in_stm, save_conversatio
                            save_internal_reasoning, DialogEntry, save_valid_truth, append_json_log)
 from webmind.ollama_handler import OllamaHandler, OLLAMA_CLOUD_MODELS
 from automind.automind import FundamentalAGI
+from automind.metrics import record_tokens
 from webmind.chatter import (GPT4o, GroqModel, TogetherModel, AnthropicModel, OllamaModel,
                              resolve_chatter, check_ollama_running, DEFAULT_MODELS, KNOWN_MODELS)
 from webmind.api import APIManager
@@ -267,6 +268,7 @@ class OpenMind:
         self.session_tokens["last_in"] = d_in
         self.session_tokens["last_out"] = d_out
         self.session_tokens["total"] += d_in + d_out
+        record_tokens(self.current_provider or "unknown", d_in, d_out)
 
     def _trace(self, event_type, payload):
         """Queue a reasoning-trace event for the UI panel (thread-safe)."""
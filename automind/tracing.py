@@ -0,0 +1,227 @@
+# tracing.py (c) 2024 Gregory L. Magnusson MIT license
+# turn-level profiling and tracing for the reasoning pipeline
+# spans time each stage of a reasoning turn:
+#   llm             one chatter call: time to first token, tokens/sec, usage
+#   reasoning.turn  one SocraticReasoning.draw_conclusion
+#   validation      truth-table or LLM-judged validation of a conclusion
+#   truth_table     LogicTables truth-table evaluation
+#   file.write      a memory/log write
+# usage:
+#   from automind.tracing import tracer, RingBufferExporter
+#   tracer.enable(RingBufferExporter())
+#   with tracer.span("validation", method="llm_judgment") as span:
+#       ...
+#       span.set(valid=True)
+# tracing is off by default: span() then returns a shared no-op span, so the
+# instrumented hot paths pay a single attribute check
+
+import collections
+import contextvars
+import itertools
+import logging
+import pathlib
+import threading
+import time
+import ujson
+
+
+class Span:
+    """
+    One timed stage. Use as a context manager; attributes set on the span are
+    exported with it when the block exits.
+    """
+    __slots__ = ("name", "attrs", "span_id", "parent_id", "thread", "start", "duration_ms",
+                 "_tracer", "_t0", "_token")
+
+    def __init__(self, tracer, name, attrs, span_id, parent_id):
+        self._tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.thread = threading.current_thread().name
+        self.start = None
+        self.duration_ms = None
+        self._t0 = None
+        self._token = None
+
+    def __enter__(self):
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        self._token = self._tracer._current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ms = self.elapsed_ms()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self._tracer._restore(self._token)
+        self._tracer._finish(self)
+        return False
+
+    def elapsed_ms(self):
+        """Milliseconds since the span started."""
+        return (time.perf_counter() - self._t0) * 1000.0
+
+    def set(self, **attrs):
+        """Attach attributes (usage, verdicts, sizes) to the span."""
+        self.attrs.update(attrs)
+
+    def mark(self, name):
+        """Record the elapsed milliseconds under name, e.g. mark("ttft_ms")."""
+        if name not in self.attrs:
+            self.attrs[name] = round(self.elapsed_ms(), 3)
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "thread": self.thread,
+            "start": self.start,
+            "duration_ms": round(self.duration_ms, 3) if self.duration_ms is not None else None,
+            **self.attrs,
+        }
+
+
+class _NoopSpan:
+    """Returned by a disabled tracer: every operation does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def elapsed_ms(self):
+        return 0.0
+
+    def set(self, **attrs):
+        pass
+
+    def mark(self, name):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    Process-wide span factory. The open span lives in a context variable, so spans
+    nest per thread and per asyncio task (interleaved coroutines on one loop keep
+    their own parents), and are handed to every registered exporter when they finish.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.exporters = []
+        self._current = contextvars.ContextVar("ezagi_span", default=None)
+        self._ids = itertools.count(1)
+
+    def enable(self, *exporters):
+        """Turn tracing on, registering any exporters given."""
+        for exporter in exporters:
+            self.add_exporter(exporter)
+        self.enabled = True
+
+    def disable(self):
+        """Turn tracing off and drop every exporter."""
+        self.enabled = False
+        self.exporters = []
+
+    def add_exporter(self, exporter):
+        if exporter not in self.exporters:
+            self.exporters = self.exporters + [exporter]
+
+    def remove_exporter(self, exporter):
+        self.exporters = [e for e in self.exporters if e is not exporter]
+
+    def span(self, name, **attrs):
+        """Open a span named after the pipeline stage; a no-op while disabled."""
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = self._current.get()
+        return Span(self, name, attrs, next(self._ids), parent.span_id if parent else None)
+
+    def _restore(self, token):
+        try:
+            self._current.reset(token)
+        except ValueError:  # exited in another context than it entered (e.g. a moved generator)
+            logging.debug("trace span exited outside the context it was opened in")
+
+    def _finish(self, span):
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logging.debug(f"trace exporter error: {e}")
+
+
+class JSONLExporter:
+    """Append every finished span to a JSON-lines file (all logs are memories)."""
+    def __init__(self, path='./memory/logs/trace.jsonl'):
+        self.path = path
+        self._lock = threading.Lock()
+        pathlib.Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, span):
+        line = ujson.dumps(span.to_dict())
+        with self._lock:
+            with open(self.path, 'a') as file:
+                file.write(line + "\n")
+
+
+class RingBufferExporter:
+    """
+    Keep the most recent spans in memory for the console metrics tab.
+    deque.append is atomic, so exporting needs no lock.
+    """
+    def __init__(self, capacity=2048):
+        self.buffer = collections.deque(maxlen=capacity)
+
+    def export(self, span):
+        self.buffer.append(span.to_dict())
+
+    def spans(self, name=None):
+        """Snapshot of the buffered spans, optionally for a single stage."""
+        spans = list(self.buffer)
+        if name is not None:
+            spans = [s for s in spans if s["name"] == name]
+        return spans
+
+    def clear(self):
+        self.buffer.clear()
+
+    def stats(self):
+        """
+        Per-stage latency summary of the buffered spans.
+
+        Returns:
+            dict: {stage: {"count": n, "p50_ms": x, "p95_ms": y}}
+        """
+        durations = collections.defaultdict(list)
+        for span in list(self.buffer):
+            if span.get("duration_ms") is not None:
+                durations[span["name"]].append(span["duration_ms"])
+        return {
+            name: {
+                "count": len(values),
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+            }
+            for name, values in sorted(durations.items())
+        }
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of a list of numbers (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil(n * q / 100)
+    return ordered[min(len(ordered), int(rank)) - 1]
+
+
+# process-wide tracer: off until something (the ezAGI console, a benchmark) enables it
+tracer = Tracer()
@@ -1,14 +1,38 @@
 # abduction.py (c) 2024 Gregory L. Magnusson MIT licence
 # infers the most likely explanation for a given observation
+# a fact explains an observation when it occurs in it (fact in observation)
+# the knowledge base is loaded once into a KnowledgeBase: facts keyed in one hash map, plus
+# the lengths of the facts starting and ending with each 4 character prefix / suffix (int
+# bitmasks), so matching probes only the windows of the observation that begin and end like
+# some fact - the cost follows the observation, not the size of the knowledge base
+# explanations are ranked by coverage, prior and specificity instead of picked at random
+# KnowledgeBase.load streams JSONL or the compact binary format (write_compact) through a
+# memory map: the index is built record by record, only offsets and fact hashes stay in RAM,
+# and reload() indexes the records appended since the last pass without rebuilding
 
+import heapq
 import json
-import random
 import logging
-from typing import List, Dict
+import math
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Tuple, Union
 
 # Setting up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+_WORD = re.compile(r"[a-z0-9]+")
+
+MAGIC = b"EZKB1\n"  # compact binary knowledge base header
+_RECORD = struct.Struct("<Id")  # utf-8 size, prior (NaN: none), then the fact bytes
+_HASH_OFFSET = 1 << 63  # hash() -> non-negative, packed above a 40 bit fact id
+_ID_MASK = (1 << 40) - 1
+
 class Proposition:
     """
     Class representing a proposition or statement.
@@ -19,11 +43,373 @@ class Proposition:
     def __str__(self):
         return self.statement
 
+def write_compact(path: str, facts) -> int:
+    """
+    Append facts to a compact binary knowledge base, creating it when missing.
+
+    Args:
+        path: the .ezkb file.
+        facts: fact strings, or {"fact": str, "prior": float} entries.
+
+    Returns:
+        int: records written.
+    """
+    written = 0
+    with open(path, "ab") as file:
+        if file.tell() == 0:
+            file.write(MAGIC)
+        for entry in facts:
+            fact, prior = (entry["fact"], entry.get("prior")) if isinstance(entry, dict) else (entry, None)
+            data = fact.encode("utf-8")
+            file.write(_RECORD.pack(len(data), math.nan if prior is None else float(prior)) + data)
+            written += 1
+    return written
+
+class MappedFacts:
+    """
+    Facts read on demand from a memory-mapped JSONL or compact binary file: only the
+    offset and size of each record are kept in RAM.
+
+    Args:
+        path: the knowledge base file.
+        binary: True for the compact binary format, False for JSONL.
+    """
+    def __init__(self, path: str, binary: bool):
+        self.path = path
+        self.binary = binary
+        self.offsets = array("Q")
+        self.sizes = array("I")
+        self.end = len(MAGIC) if binary else 0  # bytes indexed so far
+        self._map = None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        start = self.offsets[index]
+        data = self._map[start:start + self.sizes[index]]
+        if self.binary:
+            return data.decode("utf-8")
+        entry = json.loads(data)
+        return entry["fact"] if isinstance(entry, dict) else entry
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def append(self, fact):
+        raise TypeError("a mapped knowledge base grows by appending to its file and calling reload()")
+
+    def _remap(self):
+        size = os.path.getsize(self.path)
+        if size and (self._map is None or size != len(self._map)):
+            with open(self.path, "rb") as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return size
+
+    def scan(self):
+        """
+        Index the records past the last pass; a torn record at the end is left for the next one.
+
+        Yields:
+            tuple: (fact, prior or None) for each new record.
+        """
+        size = self._remap()
+        if self.binary:
+            if self.end == len(MAGIC) and size and self._map[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{self.path} is not a compact knowledge base")
+            while self.end + _RECORD.size <= size:
+                length, prior = _RECORD.unpack_from(self._map, self.end)
+                start = self.end + _RECORD.size
+                if start + length > size:
+                    break
+                self.offsets.append(start)
+                self.sizes.append(length)
+                self.end = start + length
+                yield self._map[start:start + length].decode("utf-8"), None if math.isnan(prior) else prior
+            return
+        while self.end < size:
+            newline = self._map.find(b"\n", self.end)
+            stop = size if newline < 0 else newline
+            start, line = self.end, self._map[self.end:stop]
+            try:
+                entry = json.loads(line) if line.strip() else None
+            except ValueError:
+                if newline < 0:
+                    break  # torn final line: a writer is mid-append
+                logging.warning(f"Skipping malformed knowledge base line at byte {start} of {self.path}")
+                entry = None
+            self.end = size if newline < 0 else newline + 1
+            if entry is None:
+                continue
+            if isinstance(entry, dict):
+                fact, prior = entry.get("fact"), entry.get("prior")
+            else:
+                fact, prior = entry, None
+            if not isinstance(fact, str) or not (prior is None or _is_number(prior)):
+                logging.warning(f"Skipping knowledge base line at byte {start} of {self.path}: "
+                                f"expected a fact string or {{\"fact\": str, \"prior\": float}}")
+                continue
+            self.offsets.append(start)
+            self.sizes.append(stop - start)
+            yield fact, prior
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+class _HashedIds:
+    """
+    fact -> id for facts kept on disk: sorted arrays of fact hashes and ids, plus a dict of
+    recent additions merged into them as it outgrows them; every hit is checked against the
+    stored fact.
+    """
+    def __init__(self, facts):
+        self.facts = facts
+        self.hashes = array("q")
+        self.order = array("q")
+        self.recent = {}  # hash -> id
+        self.collisions = []  # (hash, id) of recent facts whose hash was already taken
+        self._size_filter(0)
+
+    def _size_filter(self, count):
+        """A Bloom filter with 3 probes and 16 to 64 bits per fact, so most misses skip the search."""
+        bits = max(1 << 20, 1 << (32 * count).bit_length())
+        self.filter = bytearray(bits >> 3)
+        self.filter_mask = bits - 1
+
+    def _mark(self, key):
+        mask, bits = self.filter_mask, self.filter
+        for probe in (key, key >> 21, key >> 42):
+            probe &= mask
+            bits[probe >> 3] |= 1 << (probe & 7)
+
+    def get(self, fact, default=None):
+        key = hash(fact)
+        mask, bits = self.filter_mask, self.filter
+        for probe in (key, key >> 21, key >> 42):
+            probe &= mask
+            if not bits[probe >> 3] >> (probe & 7) & 1:
+                return default
+        facts = self.facts
+        if self.recent:
+            fact_id = self.recent.get(key)
+            if fact_id is not None and facts[fact_id] == fact:
+                return fact_id
+            for other, fact_id in self.collisions:
+                if other == key and facts[fact_id] == fact:
+                    return fact_id
+        hashes, order = self.hashes, self.order
+        at = bisect_left(hashes, key)
+        while at < len(hashes) and hashes[at] == key:
+            if facts[order[at]] == fact:
+                return order[at]
+            at += 1
+        return default
+
+    def __contains__(self, fact):
+        return self.get(fact) is not None
+
+    def __setitem__(self, fact, fact_id):
+        key = hash(fact)
+        self._mark(key)
+        if key in self.recent:
+            self.collisions.append((key, fact_id))
+        else:
+            self.recent[key] = fact_id
+        if len(self.recent) > max(65536, len(self.hashes)):
+            self.merge()
+
+    def merge(self):
+        """Fold the recent additions into the sorted arrays."""
+        if not self.recent:
+            return
+        entries = [(key + _HASH_OFFSET) << 40 | fact_id for key, fact_id in zip(self.hashes, self.order)]
+        entries.extend((key + _HASH_OFFSET) << 40 | fact_id for key, fact_id in self.recent.items())
+        entries.extend((key + _HASH_OFFSET) << 40 | fact_id for key, fact_id in self.collisions)
+        entries.sort()  # one int per entry: (hash, id) packed
+        self.hashes = array("q", ((entry >> 40) - _HASH_OFFSET for entry in entries))
+        self.order = array("q", (entry & _ID_MASK for entry in entries))
+        self.recent, self.collisions = {}, []
+        if 16 * len(self.hashes) > self.filter_mask:
+            self._size_filter(len(self.hashes))
+            for key in self.hashes:
+                self._mark(key)
+
+class KnowledgeBase:
+    """
+    Facts with their priors in a compact, matchable form.
+
+    Args:
+        facts: fact strings, or {"fact": str, "prior": float} entries.
+    """
+    DEFAULT_PRIOR = 0.5
+    WEIGHTS = (0.5, 0.3, 0.2)  # coverage, prior, specificity
+    PREFIX = 4
+
+    def __init__(self, facts=()):
+        self.facts = []
+        self.priors = array("d")
+        self.ids = {}  # fact -> id
+        self.starts = {}  # first PREFIX characters -> bitmask of the lengths of facts starting so
+        self.ends = {}  # last PREFIX characters -> bitmask of the lengths of facts ending so
+        self.short = 0  # bitmask of the lengths shorter than PREFIX
+        self.document_frequency = Counter()  # token -> facts containing it
+        self.path = None
+        self.add_facts(facts)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "KnowledgeBase":
+        """Build from the JSON layout {"facts": [...]}."""
+        return cls(data.get("facts", ()))
+
+    @classmethod
+    def load(cls, path: str) -> "KnowledgeBase":
+        """
+        Load a knowledge base file: .jsonl (one fact or {"fact", "prior"} object per line)
+        and compact binary files are streamed through a memory map, anything else is read
+        as the JSON layout {"facts": [...]}.
+        """
+        with open(path, "rb") as file:
+            binary = file.read(len(MAGIC)) == MAGIC
+        if not binary and not path.endswith(".jsonl"):
+            with open(path, "r") as file:
+                knowledge_base = cls.from_dict(json.load(file))
+            knowledge_base.path = path
+            return knowledge_base
+        knowledge_base = cls()
+        knowledge_base.path = path
+        knowledge_base.facts = MappedFacts(path, binary)
+        knowledge_base.ids = _HashedIds(knowledge_base.facts)
+        knowledge_base.reload()
+        return knowledge_base
+
+    def reload(self) -> int:
+        """
+        Index the facts appended to the knowledge base file since it was loaded.
+
+        Returns:
+            int: facts read.
+        """
+        if not isinstance(self.facts, MappedFacts):
+            if self.path is None:
+                return 0
+            before = len(self.facts)
+            with open(self.path, "r") as file:
+                self.add_facts(json.load(file).get("facts", ()))
+            return len(self.facts) - before
+        count = 0
+        for fact, prior in self.facts.scan():
+            fact_id = len(self.facts) - 1
+            known = self.ids.get(fact)
+            if known is None:
+                self._index(fact, fact_id)
+                known = fact_id
+            else:
+                self.priors.append(self.DEFAULT_PRIOR)  # a repeated record keeps the first id
+            if prior is not None:
+                self.priors[known] = min(max(float(prior), 0.0), 1.0)
+            count += 1
+        self.ids.merge()
+        logging.info(f"Indexed {count} facts from {self.path}")
+        return count
+
+    def __len__(self):
+        return len(self.facts)
+
+    def __contains__(self, fact):
+        return fact in self.ids
+
+    def add_fact(self, fact, prior=None) -> int:
+        """
+        Add one fact; a repeated fact keeps its id and takes the new prior if one is given.
+
+        Returns:
+            int: the fact id.
+        """
+        fact_id = self.ids.get(fact)
+        if fact_id is None:
+            fact_id = len(self.facts)
+            self.facts.append(fact)
+            self._index(fact, fact_id)
+        if prior is not None:
+            self.priors[fact_id] = min(max(float(prior), 0.0), 1.0)
+        return fact_id
+
+    def _index(self, fact, fact_id):
+        self.ids[fact] = fact_id
+        self.priors.append(self.DEFAULT_PRIOR)
+        self.document_frequency.update(set(_WORD.findall(fact.lower())))
+        if len(fact) >= self.PREFIX:
+            key, bit = fact[:self.PREFIX], 1 << len(fact)
+            self.starts[key] = self.starts.get(key, 0) | bit
+            key = fact[-self.PREFIX:]
+            self.ends[key] = self.ends.get(key, 0) | bit
+        else:
+            self.short |= 1 << len(fact)
+
+    def add_facts(self, facts):
+        for entry in facts:
+            if isinstance(entry, dict):
+                self.add_fact(entry["fact"], entry.get("prior"))
+            else:
+                self.add_fact(entry)
+
+    def match(self, observation: str) -> List[int]:
+        """
+        Ids of every fact occurring in the observation, in knowledge base order.
+        """
+        ids, starts, ends, prefix = self.ids, self.starts, self.ends, self.PREFIX
+        found, size = set(), len(observation)
+        closing = [0] * (size + 1)  # lengths of the facts that may end at each position
+        for end in range(prefix, size + 1):
+            closing[end] = ends.get(observation[end - prefix:end], 0)
+        for start in range(size + 1):
+            mask = starts.get(observation[start:start + prefix], 0)
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                end = start + bit.bit_length() - 1
+                if end > size:
+                    break
+                if closing[end] & bit:
+                    fact_id = ids.get(observation[start:end])
+                    if fact_id is not None:
+                        found.add(fact_id)
+            mask = self.short
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                fact_id = ids.get(observation[start:start + bit.bit_length() - 1])
+                if fact_id is not None:
+                    found.add(fact_id)
+        return sorted(found)
+
+    def specificity(self, fact: str) -> float:
+        """Mean normalized inverse document frequency of the fact's words, in [0, 1]."""
+        words = set(_WORD.findall(fact.lower()))
+        if not words or not len(self.facts):  # an empty base has no frequencies to weigh
+            return 0.0
+        total = len(self.facts) + 1
+        frequency = self.document_frequency
+        return sum(math.log(total / max(frequency[w], 1)) for w in words) / (len(words) * math.log(total))
+
+    def score(self, fact: str, observation: str) -> float:
+        """
+        Weighted sum of coverage (share of the observation the fact spans), prior and
+        specificity.
+        """
+        fact_id = self.ids.get(fact)
+        prior = self.DEFAULT_PRIOR if fact_id is None else self.priors[fact_id]
+        coverage = min(len(fact) / len(observation), 1.0) if observation else 0.0
+        w_coverage, w_prior, w_specificity = self.WEIGHTS
+        return w_coverage * coverage + w_prior * prior + w_specificity * self.specificity(fact)
+
 class AbductiveReasoning:
     """
     Class handling the abductive reasoning process.
     """
-    def __init__(self, knowledge_base: Dict):
+    def __init__(self, knowledge_base: Union[Dict, KnowledgeBase]):
+        if not isinstance(knowledge_base, KnowledgeBase):
+            knowledge_base = KnowledgeBase.from_dict(knowledge_base)
         self.knowledge_base = knowledge_base
 
     def reason(self, observation: str) -> str:
@@ -32,14 +418,15 @@ class AbductiveReasoning:
         """
         logging.info(f"Reasoning for observation: {observation}")
         possible_explanations = self.find_possible_explanations(observation)
-        best_explanation = self.select_best_explanation(possible_explanations)
+        best_explanation = self.select_best_explanation(possible_explanations, observation)
         return best_explanation
 
     def find_possible_explanations(self, observation: str) -> List[str]:
         """
         Searches the knowledge base for possible explanations of the observation.
         """
-        explanations = [fact for fact in self.knowledge_base["facts"] if self.explains(observation, fact)]
+        facts = self.knowledge_base.facts
+        explanations = [facts[i] for i in self.knowledge_base.match(observation)]
         logging.info(f"Possible explanations found: {explanations}")
         return explanations
 
@@ -49,12 +436,30 @@ class AbductiveReasoning:
         """
         return fact in observation
 
-    def select_best_explanation(self, explanations: List[str]) -> str:
+    def rank(self, observation: str, k: int = 5, explanations: List[str] = None) -> List[Tuple[str, float]]:
+        """
+        The k best explanations of the observation.
+
+        Args:
+            observation: the observation to explain.
+            k: explanations returned.
+            explanations: candidates to rank; found in the knowledge base when omitted.
+
+        Returns:
+            list: (explanation, score) pairs, best first; ties keep knowledge base order.
+        """
+        if explanations is None:
+            explanations = self.find_possible_explanations(observation)
+        score = self.knowledge_base.score
+        scored = [(score(fact, observation), -order, fact) for order, fact in enumerate(explanations)]
+        return [(fact, value) for value, _, fact in heapq.nlargest(k, scored)]
+
+    def select_best_explanation(self, explanations: List[str], observation: str = "") -> str:
         """
         Selects the best explanation from possible explanations.
         """
         if explanations:
-            best_explanation = random.choice(explanations)
+            best_explanation = self.rank(observation, 1, explanations)[0][0]
             logging.info(f"Selected explanation: {best_explanation}")
             return best_explanation
         logging.warning("No explanations found.")
@@ -68,18 +473,23 @@ class AbductionAgent:
         self.knowledge_base = self.load_knowledge_base(knowledge_base_path)
         self.reasoner = AbductiveReasoning(self.knowledge_base)
 
-    def load_knowledge_base(self, path: str) -> Dict:
+    def load_knowledge_base(self, path: str) -> KnowledgeBase:
         """
-        Loads the knowledge base from a JSON file.
+        Loads the knowledge base from a JSON, JSONL or compact binary file.
         """
         try:
-            with open(path, 'r') as file:
-                knowledge_base = json.load(file)
+            knowledge_base = KnowledgeBase.load(path)
             logging.info(f"Knowledge base loaded from {path}")
             return knowledge_base
         except Exception as e:
             logging.error(f"Error loading knowledge base: {e}")
-            return {"facts": []}
+            return KnowledgeBase()
+
+    def reload_knowledge_base(self) -> int:
+        """
+        Picks up facts appended to the knowledge base file without rebuilding the index.
+        """
+        return self.knowledge_base.reload()
 
     def handle_observation(self, observation: str) -> str:
         """
@@ -1,8 +1,15 @@
 # bdi.py (c) 2024 Gregory L. Magnusson MIT license
 # Belief, Desire, Intention (BDI) Model with Goal and Reward
 
+import heapq
+import itertools
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from automind.logic import LogicTables
+from automind.metrics import record_cache
+from automind.tracing import tracer
 from automind.SocraticReasoning import SocraticReasoning
 from memory.memory import store_in_stm, DialogEntry
 from webmind.chatter import GPT4o
@@ -16,14 +23,31 @@ logger = logging.getLogger('BDI')
 
 # Belief Class
 class Belief:
-    def __init__(self, belief):
+    """
+    A belief statement. Its LogicTables and SocraticReasoning are built on
+    first use; a Belief from BeliefBase.add uses the base's shared ones.
+    """
+    def __init__(self, belief, base=None):
         self.belief = belief
-        self.logic = LogicTables()  # Initialize LogicTables class for logical operations
-        self.api_manager = APIManager()  # Initialize APIManager for managing API keys
-        api_key = self.api_manager.get_api_key('openai')  # Retrieve the API key for the chatter service
-        if not api_key:
-            raise ValueError("API key for GPT4o is missing. Please add it using APIManager.")
-        self.socratic = SocraticReasoning(GPT4o(api_key))  # Initialize SocraticReasoning class with a chatter instance
+        self.base = base
+        self._logic = None
+        self._socratic = None
+
+    @property
+    def logic(self):
+        if self.base is not None:
+            return self.base.logic
+        if self._logic is None:
+            self._logic = LogicTables()  # Initialize LogicTables class for logical operations
+        return self._logic
+
+    @property
+    def socratic(self):
+        if self.base is not None:
+            return self.base.socratic
+        if self._socratic is None:
+            self._socratic = SocraticReasoning(_default_chatter())
+        return self._socratic
 
     def __str__(self):
         return self.belief
@@ -31,7 +55,10 @@ class Belief:
     def evaluate_belief(self):
         try:
             # Use logic to evaluate the belief
-            valid = self.logic.validate_truth(self.belief)
+            if self.base is not None:
+                valid = self.base.is_valid(self.belief)
+            else:
+                valid = self.logic.validate_truth(self.belief)
             if valid:
                 return f"Belief '{self.belief}' is valid."
             else:
@@ -43,6 +70,8 @@ class Belief:
     def reason_belief(self):
         try:
             # Use SocraticReasoning to reason about the belief
+            if self.base is not None:
+                return self.base.reason(self.belief)
             self.socratic.add_premise(self.belief)
             self.socratic.draw_conclusion()
             return self.socratic.logical_conclusion
@@ -50,6 +79,126 @@ class Belief:
             logger.error(f"Error reasoning belief '{self.belief}': {e}")
             return f"Error reasoning belief '{self.belief}': {e}"
 
+def _default_chatter():
+    api_manager = APIManager()  # Initialize APIManager for managing API keys
+    api_key = api_manager.get_api_key('openai')  # Retrieve the API key for the chatter service
+    if not api_key:
+        raise ValueError("API key for GPT4o is missing. Please add it using APIManager.")
+    return GPT4o(api_key)
+
+# BeliefBase Class
+class BeliefBase:
+    """
+    Beliefs indexed by statement, sharing one LogicTables and one chatter.
+
+    Nothing touches disk or the network until it is needed: the LogicTables,
+    the chatter (GPT4o from the openai key, as Belief did) and the
+    SocraticReasoning are built on first use unless they are passed in.
+    Validity is computed from one truth table for every statement and cached
+    until the logic tables gain a variable or an expression.
+
+    Args:
+        logic: a LogicTables to share (default: built on first evaluation).
+        chatter: the model wrapper for reasoning (default: GPT4o, built on first use).
+    """
+    def __init__(self, logic=None, chatter=None):
+        self._logic = logic
+        self._chatter = chatter
+        self._socratic = None
+        self._socratic_lock = threading.Lock()
+        self.beliefs = {}  # statement: Belief
+        self.listeners = []  # callables(statement), told when a statement is added or removed
+        self._valid = None  # {valid expressions} for the tables' current state
+        self._state = None
+
+    @property
+    def logic(self):
+        if self._logic is None:
+            self._logic = LogicTables()
+        return self._logic
+
+    @property
+    def chatter(self):
+        if self._chatter is None:
+            self._chatter = _default_chatter()
+        return self._chatter
+
+    @property
+    def socratic(self):
+        if self._socratic is None:
+            self._socratic = SocraticReasoning(self.chatter)
+        return self._socratic
+
+    def add(self, statement):
+        """The Belief for statement, created once."""
+        belief = self.beliefs.get(statement)
+        if belief is None:
+            belief = self.beliefs[statement] = Belief(statement, base=self)
+            for listener in self.listeners:
+                listener(statement)
+        return belief
+
+    def remove(self, statement):
+        """Stop believing statement (no-op when it isn't held)."""
+        if self.beliefs.pop(statement, None) is not None:
+            for listener in self.listeners:
+                listener(statement)
+
+    def get(self, statement):
+        return self.beliefs.get(statement)
+
+    def __contains__(self, statement):
+        return statement in self.beliefs
+
+    def __iter__(self):
+        return iter(self.beliefs.values())
+
+    def __len__(self):
+        return len(self.beliefs)
+
+    def _tables_state(self):
+        logic = self.logic
+        return (len(logic.variables), len(logic.expressions),
+                logic.variables[-1] if logic.variables else None,
+                logic.expressions[-1] if logic.expressions else None)
+
+    def invalidate(self):
+        """Forget cached validity (after editing the logic tables other than by appending)."""
+        self._valid = None
+
+    def is_valid(self, statement):
+        """
+        True when statement is one of the tables' expressions and holds in every
+        row of their truth table (LogicTables.validate_truth, evaluated for all
+        expressions at once and cached).
+        """
+        state = self._tables_state()
+        fresh = self._valid is not None and state == self._state
+        record_cache("bdi.validity", fresh)
+        if not fresh:
+            self._valid = self._validate_all()
+            self._state = state
+        return statement in self._valid
+
+    def _validate_all(self):
+        logic = self.logic
+        if not logic.expressions:
+            return frozenset()
+        table = logic.generate_truth_table()
+        valid = frozenset(e for e in logic.expressions if all(row[e] for row in table))
+        for expression in valid:
+            logic.save_valid_truth(expression)
+        return valid
+
+    def reason(self, statement):
+        """Reason about one statement with the shared SocraticReasoning."""
+        with self._socratic_lock:
+            socratic = self.socratic
+            socratic.premises = []  # each belief is reasoned about on its own
+            socratic.add_premise(statement)
+            socratic.draw_conclusion()
+            return socratic.logical_conclusion
+
 # Desire Class
 class Desire:
     def __init__(self, goal):
@@ -60,12 +209,19 @@ class Desire:
 
 # Intention Class
 class Intention:
-    def __init__(self, plan):
+    """
+    A plan and, optionally, the action that carries it out: a callable taking
+    a threading.Event that is set when the intention is cancelled.
+    """
+    def __init__(self, plan, action=None):
         self.plan = plan
+        self.action = action
 
-    def execute(self):
+    def execute(self, cancelled=None):
         try:
             logger.info(f"Executing plan: {self.plan}")
+            if self.action is not None:
+                return self.action(cancelled if cancelled is not None else threading.Event())
             print(f"Executing plan: {self.plan}")
         except Exception as e:
             logger.error(f"Error executing plan '{self.plan}': {e}")
@@ -81,9 +237,14 @@ class Goal:
         try:
             # Evaluate conditions based on beliefs, desires, and intentions
             # Return True if the goal is fulfilled, otherwise False
+            if isinstance(belief_system, BeliefBase):
+                return all(cond in belief_system and belief_system.is_valid(cond) for cond in self.conditions)
+            by_statement = {}
+            for belief in belief_system:
+                by_statement.setdefault(str(belief), []).append(belief)
             return all(
-                any(str(belief) == cond and belief.evaluate_belief() == f"Belief '{cond}' is valid."
-                    for belief in belief_system)
+                any(belief.evaluate_belief() == f"Belief '{cond}' is valid."
+                    for belief in by_statement.get(cond, ()))
                 for cond in self.conditions
             )
         except Exception as e:
@@ -109,6 +270,194 @@ class Reward:
     def get_reward(self):
         return self.total_reward
 
+# Deliberator Class
+class Deliberator:
+    """
+    A BDI deliberation engine over a BeliefBase.
+
+    Goal fulfilment is memoized: goals are indexed by the statements their
+    conditions name, and a cycle re-checks only the goals whose statements
+    were added or removed since the last one (all of them when the logic
+    tables changed). Unfulfilled goals with an intention wait in a priority
+    queue keyed by Goal.priority; each cycle starts the most important ones
+    on a thread pool. A goal that becomes fulfilled earns its priority as
+    reward once and has its running intention cancelled. An intention that
+    finishes with its goal still unfulfilled is retried after retry_delay
+    seconds, doubling each time, and the goal is given up on after
+    max_attempts runs (add_goal again to retry it).
+
+    Cycles are traced as "bdi.deliberate" spans (ezagi_bdi_deliberation_seconds).
+
+    Args:
+        beliefs: the BeliefBase (default: a new one).
+        workers: intentions executed at once.
+        reward: the Reward credited for fulfilled goals (default: a new one).
+        max_attempts: intention runs allowed to leave a goal unfulfilled.
+        retry_delay: seconds before the first retry of an unfulfilled goal.
+    """
+    def __init__(self, beliefs=None, workers=4, reward=None, max_attempts=3, retry_delay=1.0):
+        self.beliefs = beliefs if beliefs is not None else BeliefBase()
+        self.beliefs.listeners.append(self._belief_changed)
+        self.workers = workers
+        self.reward = reward if reward is not None else Reward()
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.goals = {}  # name: Goal
+        self.intentions = {}  # goal name: Intention
+        self.fulfilled = {}  # goal name: memoized fulfilment
+        self._watchers = {}  # statement: names of the goals with it as a condition
+        self._dirty = set()
+        self._queue = []  # heap of (-priority, sequence, goal name)
+        self._queued = set()
+        self._sequence = itertools.count()
+        self._running = {}  # goal name: (future, cancelled event), until the future is done
+        self._attempts = {}  # goal name: intention runs that left it unfulfilled
+        self._retry_at = {}  # goal name: monotonic time before which it is not queued again
+        self._delayed = []  # heap of (retry time, goal name)
+        self._tables = None
+        self._lock = threading.RLock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bdi-intention")
+
+    def add_goal(self, goal, intention=None):
+        """Adopt a goal, with the intention that pursues it (None: only watched)."""
+        with self._lock:
+            self.remove_goal(goal.name)
+            self.goals[goal.name] = goal
+            if intention is not None:
+                self.intentions[goal.name] = intention
+            for condition in goal.conditions:
+                self._watchers.setdefault(condition, set()).add(goal.name)
+            self._dirty.add(goal.name)
+
+    def remove_goal(self, name):
+        """Drop a goal, cancelling its intention."""
+        with self._lock:
+            goal = self.goals.pop(name, None)
+            if goal is None:
+                return
+            self.cancel(name)
+            self.intentions.pop(name, None)
+            self.fulfilled.pop(name, None)
+            self._attempts.pop(name, None)
+            self._retry_at.pop(name, None)
+            self._dirty.discard(name)
+            self._queued.discard(name)  # its heap entry is skipped when popped
+            for condition in goal.conditions:
+                watchers = self._watchers.get(condition)
+                if watchers is not None:
+                    watchers.discard(name)
+                    if not watchers:
+                        del self._watchers[condition]
+
+    def believe(self, statement):
+        """Add a belief (goals that name it are re-checked next cycle)."""
+        return self.beliefs.add(statement)
+
+    def forget(self, statement):
+        """Remove a belief (goals that name it are re-checked next cycle)."""
+        self.beliefs.remove(statement)
+
+    def _belief_changed(self, statement):
+        with self._lock:
+            self._dirty.update(self._watchers.get(statement, ()))
+
+    def cancel(self, name):
+        """
+        Cancel a goal's intention: not started yet, it never runs; running, its event is set.
+        It keeps its worker slot until its action returns.
+        """
+        with self._lock:
+            running = self._running.get(name)
+        if running is not None:
+            future, cancelled = running
+            cancelled.set()
+            future.cancel()
+
+    def running(self):
+        """Names of the goals whose intentions are executing or waiting for a worker."""
+        with self._lock:
+            return [name for name, (future, _) in self._running.items() if not future.done()]
+
+    def deliberate(self):
+        """
+        One deliberation cycle: reap finished intentions, re-check the goals
+        touched by belief changes, then start the most important unfulfilled
+        goals' intentions while workers are free.
+
+        Returns:
+            list: names of the goals whose intentions were started.
+        """
+        with tracer.span("bdi.deliberate", goals=len(self.goals)) as span, self._lock:
+            now = time.monotonic()
+            for name, (future, cancelled) in list(self._running.items()):
+                if future.done():
+                    del self._running[name]
+                    if not future.cancelled() and future.exception() is not None:
+                        logger.error(f"Intention for goal '{name}' failed: {future.exception()}")
+                    if not cancelled.is_set() and name in self.goals:  # its plan ran its course
+                        attempts = self._attempts[name] = self._attempts.get(name, 0) + 1
+                        self._retry_at[name] = now + self.retry_delay * 2 ** (attempts - 1)
+                    self._dirty.add(name)  # re-checked now, queued again if still unfulfilled
+            while self._delayed and self._delayed[0][0] <= now:
+                self._dirty.add(heapq.heappop(self._delayed)[1])
+            if self.beliefs._logic is not None:
+                tables = self.beliefs._tables_state()
+                if tables != self._tables:
+                    self._tables = tables
+                    self._dirty.update(self.goals)  # validity may have changed for every statement
+            rechecked = len(self._dirty)
+            for name in self._dirty:
+                self._recheck(name)
+            self._dirty.clear()
+            started = []
+            while self._queue and len(self._running) < self.workers:
+                _, _, name = heapq.heappop(self._queue)
+                if name not in self._queued:
+                    continue  # removed or fulfilled since it was queued
+                self._queued.discard(name)
+                if self.fulfilled.get(name) or name in self._running:
+                    continue
+                cancelled = threading.Event()
+                future = self._executor.submit(self.intentions[name].execute, cancelled)
+                self._running[name] = (future, cancelled)
+                started.append(name)
+            span.set(rechecked=rechecked, started=len(started), running=len(self._running))
+        return started
+
+    def _recheck(self, name):
+        goal = self.goals.get(name)
+        if goal is None:
+            return
+        was, now = self.fulfilled.get(name, False), goal.is_fulfilled(self.beliefs, [], [])
+        self.fulfilled[name] = now
+        if now:
+            self._queued.discard(name)
+            self._attempts.pop(name, None)
+            self._retry_at.pop(name, None)
+            if not was:
+                self.reward.total_reward += goal.priority
+                logger.info(f"Goal '{name}' fulfilled (+{goal.priority})")
+                self.cancel(name)
+        elif name in self.intentions and name not in self._queued and name not in self._running:
+            attempts = self._attempts.get(name, 0)
+            if attempts >= self.max_attempts:
+                if self._retry_at.pop(name, None) is not None:  # the run that used the last attempt
+                    logger.warning(f"Goal '{name}' still unfulfilled after {attempts} attempts; giving up on it")
+                return  # until it is added again
+            retry_at = self._retry_at.get(name, 0)
+            if retry_at > time.monotonic():
+                heapq.heappush(self._delayed, (retry_at, name))  # back off before trying again
+                return
+            heapq.heappush(self._queue, (-goal.priority, next(self._sequence), name))
+            self._queued.add(name)
+
+    def shutdown(self, wait=True, cancel=False):
+        """Stop the executor, cancelling every intention first when cancel is True."""
+        if cancel:
+            for name in list(self._running):
+                self.cancel(name)
+        self._executor.shutdown(wait=wait, cancel_futures=cancel)
+
 # BDI Classes End
 
 # Example usage
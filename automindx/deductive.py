@@ -2,28 +2,377 @@
 # deductive (c) 2024 Trung Luong MIT licence
 # deductive (c) 2024 Gregory L. Magnusson MIT licence
 
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
 import datetime
 import json
 import logging
 import pathlib
 from automind.logic import LogicTables
+from automindx import unification
 from memory.memory import save_valid_truth
 
+class Condensation:
+    """
+    Strongly connected components of an implication graph and the DAG between them.
+
+    Every statement in a cycle implies every other, so a component answers for
+    all of its members. Components are numbered by Tarjan's algorithm in
+    reverse topological order (a DAG edge always runs from a higher number to
+    a lower one) and labelled with LABELLINGS post-order intervals, each from a
+    depth-first traversal visiting children in a different order: when a
+    component reaches another, every labelling nests the second interval in
+    the first. With each component's level (its longest path down to a sink)
+    most negative queries are answered by those comparisons alone; the rest
+    and the positive ones by a bidirectional search that only enters
+    components whose labels could still lie on a path.
+
+    Args:
+        successors: id: [ids] adjacency lists.
+    """
+    LABELLINGS = 2
+
+    def __init__(self, successors):
+        self.component, self.count = self._tarjan(successors)
+        component = self.component
+        dag = [set() for _ in range(self.count)]
+        for u, targets in enumerate(successors):
+            cu = component[u]
+            for v in targets:
+                if component[v] != cu:
+                    dag[cu].add(component[v])
+        self.dag = [list(targets) for targets in dag]
+        self.children = dag  # sets, for the direct-edge check on hub components
+        self.parents = [[] for _ in range(self.count)]
+        for c, targets in enumerate(self.dag):
+            for w in targets:
+                self.parents[w].append(c)
+        self.level = level = [0] * self.count  # longest path down to a sink
+        for c in range(self.count):  # children are numbered lower, so already levelled
+            for w in self.dag[c]:
+                if level[w] >= level[c]:
+                    level[c] = level[w] + 1
+        self.labels = [self._label(self.dag, reverse=bool(k % 2)) for k in range(self.LABELLINGS)]
+        self._successors = successors
+        self._predecessors = None
+
+    def predecessors(self):
+        """id: [ids] reverse adjacency lists, built on first use (proof searches)."""
+        if self._predecessors is None:
+            self._predecessors = [[] for _ in self._successors]
+            for u, targets in enumerate(self._successors):
+                for v in targets:
+                    self._predecessors[v].append(u)
+        return self._predecessors
+
+    @staticmethod
+    def _tarjan(successors):
+        """Iterative Tarjan: (component id per node, number of components)."""
+        n = len(successors)
+        index = [-1] * n
+        lowlink = [0] * n
+        on_stack = bytearray(n)
+        component = [-1] * n
+        stack = []
+        counter = count = 0
+        for root in range(n):
+            if index[root] != -1:
+                continue
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            work = [[root, 0]]
+            while work:
+                frame = work[-1]
+                v, i = frame
+                targets = successors[v]
+                if i < len(targets):
+                    frame[1] = i + 1
+                    w = targets[i]
+                    if index[w] == -1:
+                        index[w] = lowlink[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = 1
+                        work.append([w, 0])
+                    elif on_stack[w] and index[w] < lowlink[v]:
+                        lowlink[v] = index[w]
+                    continue
+                work.pop()
+                if work and lowlink[v] < lowlink[work[-1][0]]:
+                    lowlink[work[-1][0]] = lowlink[v]
+                if lowlink[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = 0
+                        component[w] = count
+                        if w == v:
+                            break
+                    count += 1
+        return component, count
+
+    @staticmethod
+    def _label(dag, reverse=False):
+        """One post-order interval labelling: (low, post) lists per component."""
+        size = len(dag)
+        post = [-1] * size
+        low = [0] * size
+        counter = 0
+        has_parent = bytearray(size)
+        for targets in dag:
+            for w in targets:
+                has_parent[w] = 1
+        roots = [c for c in range(size) if not has_parent[c]]
+        for root in reversed(roots) if reverse else roots:
+            post[root] = -2  # entered
+            work = [[root, 0]]
+            while work:
+                frame = work[-1]
+                c, i = frame
+                targets = dag[c]
+                if i < len(targets):
+                    frame[1] = i + 1
+                    w = targets[~i if reverse else i]
+                    if post[w] == -1:
+                        post[w] = -2
+                        work.append([w, 0])
+                    continue
+                work.pop()
+                lowest = counter
+                for w in targets:
+                    if low[w] < lowest:
+                        lowest = low[w]
+                low[c], post[c] = lowest, counter
+                counter += 1
+        return low, post
+
+    def may_reach(self, cu, cv):
+        """False when the labels rule the path out; True means 'maybe'."""
+        if cu == cv:
+            return True
+        if cu < cv or self.level[cu] <= self.level[cv]:
+            return False
+        for low, post in self.labels:
+            if low[cv] < low[cu] or post[cv] > post[cu]:
+                return False
+        return True
+
+    def reaches(self, u, v):
+        """True when node v is reachable from node u."""
+        cu, cv = self.component[u], self.component[v]
+        if cu == cv:
+            return True
+        if not self.may_reach(cu, cv):
+            return False
+        if cv in self.children[cu]:
+            return True
+        # bidirectional: grow whichever frontier has fewer edges to follow, so a
+        # hub component (thousands of children) is met from both sides, not scanned
+        dag, parents = self.dag, self.parents
+        ahead, behind = {cu}, {cv}
+        forward, backward = [cu], [cv]
+        while forward and backward:
+            if sum(len(dag[c]) for c in forward) <= sum(len(parents[c]) for c in backward):
+                frontier = []
+                for c in forward:
+                    for w in dag[c]:
+                        if w in behind:
+                            return True
+                        if w not in ahead and self.may_reach(w, cv):
+                            ahead.add(w)
+                            frontier.append(w)
+                forward = frontier
+            else:
+                frontier = []
+                for c in backward:
+                    for w in parents[c]:
+                        if w in ahead:
+                            return True
+                        if w not in behind and self.may_reach(cu, w):
+                            behind.add(w)
+                            frontier.append(w)
+                backward = frontier
+        return False
+
+class _Adjacency(defaultdict):
+    """The name -> [consequents] dict of a Graph, linked back to the Graph's index."""
+    __slots__ = ("owner",)
+
 class Graph:
     """
     Create graph for condition statements
     Ex: A -> B
+
+    Statements are interned: every name gets an integer id and the edges are
+    kept as id adjacency lists. Reachability is answered from a Condensation
+    (strongly connected components, a DAG between them and interval labels),
+    built on the first query after statements change. While it is stale,
+    sources with a memoized reach set (reach(), an LRU kept current as
+    statements are added) answer with a set lookup instead of a rebuild.
+    proof() returns the shortest chain of statements between two names.
+    get_graph() still returns the name -> [consequents] dict; add statements
+    through add_condition_statement so the index sees them.
     """
 
-    def __init__(self):
-        self.graph = defaultdict(list)
+    def __init__(self, cache_budget=1 << 22):
+        self.graph = _Adjacency(list)
+        self.graph.owner = self
+        self.ids = {}  # name: id
+        self.names = []  # id: name
+        self.successors = []  # id: [ids], each edge once
+        self._edges = set()
+        self.cache_budget = cache_budget  # reachable ids held by the memo, over all sources
+        self._reach = OrderedDict()  # source id: set of reachable ids (LRU)
+        self._cached = 0
+        self._condensation = None
+
+    def _intern(self, name):
+        node = self.ids.get(name)
+        if node is None:
+            node = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.successors.append([])
+        return node
 
     def add_condition_statement(self, arg1, arg2):
         """
         Add a condition statement to the graph.
         """
         self.graph[arg1].append(arg2)
+        u, v = self._intern(arg1), self._intern(arg2)
+        if (u, v) in self._edges:
+            return
+        self._edges.add((u, v))
+        self.successors[u].append(v)
+        self._condensation = None
+        # keep memoized reach sets current: a source that reaches u now reaches
+        # everything v reaches; the others can't see the new edge
+        for reach in self._reach.values():
+            if u in reach and v not in reach:
+                size = len(reach)
+                self._cached += len(self._extend(reach, v)) - size
+        self._evict()
+
+    def _evict(self):
+        while self._cached > self.cache_budget and len(self._reach) > 1:
+            self._cached -= len(self._reach.popitem(last=False)[1])
+
+    def _extend(self, reach, node):
+        """Add node and everything reachable from it to reach (BFS)."""
+        reach.add(node)
+        queue = deque((node,))
+        successors = self.successors
+        while queue:
+            for w in successors[queue.popleft()]:
+                if w not in reach:
+                    reach.add(w)
+                    queue.append(w)
+        return reach
+
+    def reach(self, name):
+        """Ids reachable from name (itself included), memoized."""
+        node = self.ids.get(name)
+        if node is None:
+            return set()
+        reach = self._reach.get(node)
+        if reach is None:
+            reach = self._reach[node] = self._extend(set(), node)
+            self._cached += len(reach)
+            self._evict()
+        else:
+            self._reach.move_to_end(node)
+        return reach
+
+    def condensation(self):
+        """The Condensation of the current statements, rebuilt after changes."""
+        if self._condensation is None:
+            self._condensation = Condensation(self.successors)
+        return self._condensation
+
+    def reachable(self, start, dest):
+        """True when dest follows from start by a chain of statements."""
+        if start == dest:
+            return True
+        u, v = self.ids.get(start), self.ids.get(dest)
+        if u is None or v is None:
+            return False
+        if self._condensation is None and u in self._reach:
+            return v in self.reach(start)
+        return self.condensation().reaches(u, v)
+
+    def reachable_many(self, pairs):
+        """
+        Answer a batch of (start, dest) queries from one Condensation.
+
+        Returns:
+            list: one bool per pair, in order.
+        """
+        condensation, ids = self.condensation(), self.ids
+        answers = []
+        for start, dest in pairs:
+            u, v = ids.get(start), ids.get(dest)
+            answers.append(start == dest or (u is not None and v is not None
+                                             and condensation.reaches(u, v)))
+        return answers
+
+    def proof(self, start, dest):
+        """
+        The shortest chain of statements leading from start to dest.
+
+        A bidirectional breadth-first search (successors from start,
+        predecessors from dest, a full level of the cheaper side at a time)
+        that skips the nodes the Condensation's labels rule out.
+
+        Returns:
+            list: the names [start, ..., dest], or None when dest doesn't follow.
+        """
+        if start == dest:  # trivially follows, known or not, as in reachable
+            return [start]
+        if not self.reachable(start, dest):
+            return None
+        u, v = self.ids[start], self.ids[dest]
+        condensation = self.condensation()
+        component, may_reach = condensation.component, condensation.may_reach
+        source, target = component[u], component[v]
+        successors, predecessors = self.successors, condensation.predecessors()
+        ahead, behind = {u: (None, 0)}, {v: (None, 0)}  # node: (neighbour toward the end, distance)
+        forward, backward = [u], [v]
+        while forward and backward:
+            best = None
+            if sum(len(successors[x]) for x in forward) <= sum(len(predecessors[x]) for x in backward):
+                level, frontier = ahead[forward[0]][1] + 1, []
+                for x in forward:
+                    for w in successors[x]:
+                        if w in ahead or not may_reach(component[w], target):
+                            continue
+                        ahead[w] = (x, level)
+                        frontier.append(w)
+                        if w in behind and (best is None or behind[w][1] < behind[best][1]):
+                            best = w
+                forward = frontier
+            else:
+                level, frontier = behind[backward[0]][1] + 1, []
+                for x in backward:
+                    for w in predecessors[x]:
+                        if w in behind or not may_reach(source, component[w]):
+                            continue
+                        behind[w] = (x, level)
+                        frontier.append(w)
+                        if w in ahead and (best is None or ahead[w][1] < ahead[best][1]):
+                            best = w
+                backward = frontier
+            if best is not None:
+                chain, node = [], best
+                while node is not None:
+                    chain.append(node)
+                    node = ahead[node][0]
+                chain.reverse()
+                node = behind[best][0]
+                while node is not None:
+                    chain.append(node)
+                    node = behind[node][0]
+                return [self.names[i] for i in chain]
+        return None
 
     def print_graph(self):
         """
@@ -57,46 +406,62 @@ def law_of_syllogism(graph, start, dest):
     2. Q -> R
     3. Therefore: P -> R
 
-    Using Breadth First Search algorithm to perform Law of syllogism.
+    graph is a Graph, the dict from Graph.get_graph() (answered from the
+    Graph's condensation) or any {name: [consequents]} dict (one
+    breadth-first search).
     """
-
-    queue = []
-    tree = {}
-
-    # Flag to check if there is a path from start to dest
-    flag = None
-
-    # List for vertices visited
-    visited = []
-
-    # Create BFS tree
-    tree[start] = Node(start)
-
-    # Mark the start node as visited and enqueue it
-    queue.append(start)
-    visited.append(start)
-
+    owner = graph if isinstance(graph, Graph) else getattr(graph, "owner", None)
+    if owner is not None:
+        return owner.reachable(start, dest)
+    if start == dest:
+        return True
+    visited = {start}
+    queue = deque((start,))
     while queue:
-        # Dequeue a vertex from queue
-        s = queue.pop(0)
-
-        # Get all adjacent vertices of the dequeue vertex s.
-        # If an adjacent has not been visited, then mark it visited and enqueue it
-        for i in graph[s]:
+        for i in graph.get(queue.popleft(), ()):
+            if i == dest:
+                return True
             if i not in visited:
+                visited.add(i)
                 queue.append(i)
-                visited.append(i)
-                # Add adjacent to Tree BFS
-                tree[i] = Node(i)
-                tree[i].parent = tree[s]
+    return False
+
+def proof_chain(graph, start, dest):
+    """
+    The shortest chain of statements from start to dest.
 
-    # Check the path to destination
-    if dest not in tree.keys():
-        flag = False
-    else:
-        flag = True
+    graph is a Graph, the dict from Graph.get_graph() (Graph.proof) or any
+    {name: [consequents]} dict (one breadth-first search).
 
-    return flag
+    Returns:
+        list: the names [start, ..., dest], or None when dest doesn't follow.
+    """
+    owner = graph if isinstance(graph, Graph) else getattr(graph, "owner", None)
+    if owner is not None:
+        return owner.proof(start, dest)
+    if start == dest:
+        return [start]
+    parent = {start: None}
+    queue = deque((start,))
+    while queue:
+        node = queue.popleft()
+        for i in graph.get(node, ()):
+            if i in parent:
+                continue
+            parent[i] = node
+            if i == dest:
+                chain = [dest]
+                while parent[chain[-1]] is not None:
+                    chain.append(parent[chain[-1]])
+                return chain[::-1]
+            queue.append(i)
+    return None
+
+def _premises(chain, minor):
+    """Numbered proof lines: one per statement of the chain, then the minor premise."""
+    lines = [f'{n}. {a} -> {b}' for n, (a, b) in enumerate(zip(chain, chain[1:]), 1)]
+    lines.append(f'{len(lines) + 1}. {minor}')
+    return '\n'.join(lines) + '\n' + '-' * 20 + '\n' + f'{len(lines) + 1}. '
 
 def modus_ponens(graph, arg1, arg2, antecedent_list):
     """
@@ -105,18 +470,18 @@ def modus_ponens(graph, arg1, arg2, antecedent_list):
     1. arg1 -> arg2 (First premise is a conditional statement)
     2. arg1 (Second premise is the antecedent)
     3. arg2 (Conclusion deduced is the consequent)
-    """
-
-    # String for first and second premise
-    premise = '1. ' + arg1 + ' -> ' + arg2 + '\n' + '2. ' + arg1 + '\n' + '-' * 20 + '\n' + '3. '
 
-    if not law_of_syllogism(graph, arg1, arg2):
+    When arg2 follows from arg1 through intermediate statements, the first
+    premise is written out as the shortest chain (1. P -> Q, 2. Q -> R, ...).
+    """
+    if arg1 not in antecedent_list:
         return "Don't exist the conclusion"
-    else:
-        if arg1 not in antecedent_list:
-            return "Don't exist the conclusion"
-        else:
-            return premise + arg2
+    chain = proof_chain(graph, arg1, arg2)
+    if chain is None:
+        return "Don't exist the conclusion"
+    if len(chain) == 1:
+        chain = [arg1, arg2]
+    return _premises(chain, arg1) + arg2
 
 def modus_tollens(graph, arg1, arg2, negative_consequent_list):
     """
@@ -125,49 +490,56 @@ def modus_tollens(graph, arg1, arg2, negative_consequent_list):
     1. arg1 -> arg2 (First premise is a conditional statement)
     2. ¬arg2 (Second premise is the negation of the consequent)
     3. ¬arg1 (Conclusion deduced is the negation of the antecedent)
-    """
-
-    # String for first and second premise
-    premise = '1. ' + arg1 + ' -> ' + arg2 + '\n' + '2. ¬' + arg2 + '\n' + '-' * 20 + '\n' + '3. '
 
-    if not law_of_syllogism(graph, arg1, arg2):
+    When arg2 follows from arg1 through intermediate statements, the first
+    premise is written out as the shortest chain (1. P -> Q, 2. Q -> R, ...).
+    """
+    if arg2 not in negative_consequent_list:
         return "Don't exist the conclusion"
-    else:
-        if arg2 not in negative_consequent_list:
-            return "Don't exist the conclusion"
-        else:
-            return premise + '¬' + arg1
+    chain = proof_chain(graph, arg1, arg2)
+    if chain is None:
+        return "Don't exist the conclusion"
+    if len(chain) == 1:
+        chain = [arg1, arg2]
+    return _premises(chain, '¬' + arg2) + '¬' + arg1
+
+def _legacy_unify(expr1, expr2, substitution):
+    """Unify legacy list expressions with the iterative engine, updating substitution."""
+    variables = {}
+    left = unification.from_list(expr1, variables)
+    right = unification.from_list(expr2, variables)
+    bindings = unification.Bindings()
+    for name, value in substitution.items():
+        if unification.unify(unification.from_list(name, variables),
+                             unification.from_list(value, variables), bindings) is None:
+            return None
+    if unification.unify(left, right, bindings) is None:
+        return None
+    for var, value in bindings.as_dict().items():
+        if value is not var:
+            substitution[var.name] = unification.to_list(value)
+    return substitution
 
 def unify(var, term, substitution):
     """
     Unify a variable with a term.
+
+    Lowercase strings are variables. Returns substitution extended with the
+    bindings, or None when they conflict (substitution is then unchanged).
+    For first-order terms, occurs checks and fact retrieval see
+    automindx.unification.
     """
-    if var == term:
-        return substitution
-    elif var in substitution:
-        return unify(substitution[var], term, substitution)
-    elif isinstance(term, str) and term in substitution:
-        return unify(var, substitution[term], substitution)
-    else:
-        substitution[var] = term
-        return substitution
+    return _legacy_unify(var, term, substitution)
 
 def unify_expressions(expr1, expr2, substitution):
     """
     Unify two expressions.
+
+    Expressions are strings (lowercase ones are variables) and nested lists of
+    expressions. Returns substitution extended with the bindings, or None when
+    the expressions don't unify (substitution is then unchanged).
     """
-    if expr1 == expr2:
-        return substitution
-    elif isinstance(expr1, str) and expr1.islower():
-        return unify(expr1, expr2, substitution)
-    elif isinstance(expr2, str) and expr2.islower():
-        return unify(expr2, expr1, substitution)
-    elif isinstance(expr1, list) and isinstance(expr2, list) and len(expr1) == len(expr2):
-        for e1, e2 in zip(expr1, expr2):
-            substitution = unify_expressions(e1, e2, substitution)
-        return substitution
-    else:
-        return None
+    return _legacy_unify(expr1, expr2, substitution)
 
 # Integration with logic.py for logging and memory management
 def log_belief(belief):
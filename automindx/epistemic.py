@@ -20,45 +20,168 @@ logging.basicConfig(
 logger = logging.getLogger('AutoepistemicAgent')
 
 class AutoepistemicAgent:
-    def __init__(self, initial_beliefs, default_rules):
+    """
+    Beliefs under default rules, kept by a justification-based truth maintenance system.
+
+    A belief is held when it was told (initial beliefs, add_information) or one
+    of its justifications (add_justification) has every antecedent held, and
+    no contradiction of a default rule for it is held. default_rules are
+    indexed by contradiction term and justifications by antecedent, so a
+    change relabels only the beliefs that depend on it: new information
+    retracts exactly the defaults it contradicts and what was justified by
+    them, and retract_information brings them back.
+
+    With a journal_path every change (told and retracted beliefs, rules,
+    justifications, priorities) is appended to a JSON Lines journal as it
+    happens; load_journal replays it and compact_journal rewrites it as one
+    snapshot.
+    """
+    MAX_FLIPS = 8  # label changes per belief per revision; ends odd cycles of defeat
+
+    def __init__(self, initial_beliefs, default_rules, journal_path=None):
         # Initialize beliefs and default rules
-        self.beliefs = set(initial_beliefs)
-        self.default_rules = default_rules
+        self.told = set(initial_beliefs)
+        self.beliefs = set()
+        self.default_rules = list(default_rules)
+        self.justifications = {}  # belief: [frozenset of antecedents, ...]
         self.logic = LogicTables()  # Initialize logic tables for reasoning
-        self.belief_priority = {belief: 1 for belief in self.beliefs}  # Default priority for each belief
+        self.belief_priority = {belief: 1 for belief in self.told}  # Default priority for each belief
+        self.journal_path = journal_path
 
         # Initialize logic variables and expressions
-        for belief in self.beliefs:
+        for belief in self.told:
             self.logic.add_variable(belief)
             self.logic.add_expression(belief)
+        self.revise_beliefs()
+
+    def _index(self):
+        """Rebuild the contradiction and antecedent indexes from the rules and justifications."""
+        self._defeaters = {}  # default: {contradictions}
+        self._defeats = {}  # contradiction: {defaults}
+        for rule in self.default_rules:
+            self._defeaters.setdefault(rule['default'], set()).add(rule['contradiction'])
+            self._defeats.setdefault(rule['contradiction'], set()).add(rule['default'])
+        self._consumers = {}  # antecedent: {justified beliefs}
+        for belief, justifications in self.justifications.items():
+            for antecedents in justifications:
+                for antecedent in antecedents:
+                    self._consumers.setdefault(antecedent, set()).add(belief)
+
+    def _holds(self, belief):
+        supported = belief in self.told or any(
+            all(a in self.beliefs for a in antecedents) for antecedents in self.justifications.get(belief, ()))
+        return supported and not self.contradicts_new_information(belief)
+
+    def _relabel(self, changed):
+        """Relabel the changed beliefs and, through the indexes, everything depending on them."""
+        pending = list(changed)
+        flips = {}
+        while pending:
+            belief = pending.pop()
+            holds = self._holds(belief)
+            if holds == (belief in self.beliefs):
+                continue
+            flips[belief] = flips.get(belief, 0) + 1
+            if flips[belief] > self.MAX_FLIPS:
+                logger.warning(f"Belief '{belief}' keeps changing: its defaults defeat each other in a cycle")
+                continue
+            if holds:
+                self.beliefs.add(belief)
+                logger.debug(f"Holding belief: {belief}")
+                pending.extend(self._consumers.get(belief, ()))
+                pending.extend(self._defeats.get(belief, ()))
+            else:
+                pending.extend(self._take_out(belief))
+
+    def _take_out(self, belief):
+        """
+        Stop holding belief and everything held through it, so those come back only on
+        well-founded support and beliefs justifying each other cannot prop a cycle up.
+
+        Returns:
+            list: the beliefs to relabel.
+        """
+        self.beliefs.discard(belief)
+        logger.info(f"Retracting belief: {belief}")
+        recheck = list(self._consumers.get(belief, ())) + list(self._defeats.get(belief, ()))
+        for dependent in self._downstream(belief):
+            self.beliefs.remove(dependent)
+            recheck.append(dependent)
+            recheck.extend(self._defeats.get(dependent, ()))
+        return recheck
+
+    def _downstream(self, belief):
+        """Held, untold beliefs reachable from belief through justifications."""
+        found, pending = set(), [belief]
+        while pending:
+            for consumer in self._consumers.get(pending.pop(), ()):
+                if consumer not in found and consumer in self.beliefs and consumer not in self.told:
+                    found.add(consumer)
+                    pending.append(consumer)
+        return found
+
+    def _journal(self, entry):
+        if self.journal_path is None:
+            return
+        with open(self.journal_path, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
 
     def add_information(self, new_information):
         # Add new information to beliefs
         logger.info(f"Adding new information: {new_information}")
-        self.beliefs.update(new_information)
-        self.revise_beliefs()
+        new_information = [i for i in new_information if i not in self.told]
+        if not new_information:
+            return
+        self.told.update(new_information)
+        self._journal({'op': 'tell', 'beliefs': new_information})
+        self._relabel(new_information)
+
+    def retract_information(self, information):
+        """
+        Stop holding told beliefs; defaults they contradicted are held again.
+        """
+        information = [i for i in information if i in self.told]
+        if not information:
+            return
+        self.told.difference_update(information)
+        self._journal({'op': 'retract', 'beliefs': information})
+        recheck = list(information)
+        for belief in information:  # out first: their own consequences must not re-justify them
+            if belief in self.beliefs:
+                recheck.extend(self._take_out(belief))
+        self._relabel(recheck)
+
+    def add_default_rule(self, default, contradiction):
+        """
+        Add a default rule: default is held unless contradiction is.
+        """
+        self.default_rules.append({'default': default, 'contradiction': contradiction})
+        self._defeaters.setdefault(default, set()).add(contradiction)
+        self._defeats.setdefault(contradiction, set()).add(default)
+        self._journal({'op': 'rule', 'default': default, 'contradiction': contradiction})
+        self._relabel((default,))
+
+    def add_justification(self, belief, antecedents):
+        """
+        Hold belief while every antecedent is held (one of possibly several justifications).
+        """
+        antecedents = frozenset(antecedents)
+        self.justifications.setdefault(belief, []).append(antecedents)
+        for antecedent in antecedents:
+            self._consumers.setdefault(antecedent, set()).add(belief)
+        self._journal({'op': 'justify', 'belief': belief, 'antecedents': sorted(antecedents)})
+        self._relabel((belief,))
 
     def revise_beliefs(self):
-        # Revise beliefs based on new information
-        logger.info(f"Revising beliefs with current knowledge: {self.beliefs}")
-        initial_beliefs = self.beliefs.copy()
-        revised = True
-        while revised:
-            revised = False
-            for belief in list(initial_beliefs):
-                if self.contradicts_new_information(belief):
-                    self.beliefs.remove(belief)
-                    logger.info(f"Retracting belief: {belief}")
-                    revised = True
-            initial_beliefs = self.beliefs.copy()
-        logger.info(f"Beliefs after revision: {self.beliefs}")
+        # Revise beliefs from scratch, e.g. after default_rules were edited directly
+        self._index()
+        self.beliefs = set()
+        self._relabel(list(self.told) + list(self.justifications))
+        logger.info(f"Beliefs after revision: {len(self.beliefs)} held of {len(self.told)} told")
 
     def contradicts_new_information(self, belief):
         # Check if a belief contradicts new information
-        for rule in self.default_rules:
-            if rule['default'] == belief and rule['contradiction'] in self.beliefs:
-                return True
-        return False
+        return any(c in self.beliefs for c in self._defeaters.get(belief, ()))
 
     def validate_belief(self, belief):
         # Validate a belief using logic tables
@@ -68,33 +191,87 @@ class AutoepistemicAgent:
         # Set the priority of a belief
         if belief in self.beliefs:
             self.belief_priority[belief] = priority
+            self._journal({'op': 'priority', 'belief': belief, 'priority': priority})
             logger.info(f"Set priority of belief '{belief}' to {priority}")
         else:
             logger.warning(f"Belief '{belief}' not found to set priority")
 
-    def save_configuration(self, filepath):
-        # Save the current configuration to a file
-        config = {
-            'initial_beliefs': list(self.beliefs),
+    def _snapshot(self):
+        return {
+            'initial_beliefs': sorted(self.told),
             'default_rules': self.default_rules,
-            'belief_priority': self.belief_priority
+            'belief_priority': self.belief_priority,
+            'justifications': {b: [sorted(a) for a in js] for b, js in self.justifications.items()},
         }
+
+    def save_configuration(self, filepath):
+        # Save the current configuration to a file
         with open(filepath, 'w') as f:
-            json.dump(config, f, indent=4)
+            json.dump(self._snapshot(), f, indent=4)
         logger.info(f"Configuration saved to {filepath}")
 
+    def _restore(self, config):
+        self.told = set(config['initial_beliefs'])
+        self.default_rules = config['default_rules']
+        self.belief_priority = config['belief_priority']
+        self.justifications = {b: [frozenset(a) for a in js]
+                               for b, js in config.get('justifications', {}).items()}
+        self.revise_beliefs()
+
     def load_configuration(self, filepath):
         # Load configuration from a file
         if not os.path.exists(filepath):
             logger.error(f"Configuration file {filepath} does not exist")
             return
         with open(filepath, 'r') as f:
-            config = json.load(f)
-            self.beliefs = set(config['initial_beliefs'])
-            self.default_rules = config['default_rules']
-            self.belief_priority = config['belief_priority']
+            self._restore(json.load(f))
         logger.info(f"Configuration loaded from {filepath}")
 
+    def load_journal(self, filepath):
+        """
+        Replay a journal written by this agent class, then keep appending to it.
+        A torn last line (a crash mid-write) is skipped.
+        """
+        self.journal_path = None  # replaying must not append the entries again
+        if os.path.exists(filepath):
+            with open(filepath, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Skipping unreadable journal line in {filepath}")
+                        continue
+                    self._replay(entry)
+        self.journal_path = filepath
+        logger.info(f"Journal loaded from {filepath}")
+
+    def _replay(self, entry):
+        op = entry['op']
+        if op == 'snapshot':
+            self._restore(entry['config'])
+        elif op == 'tell':
+            self.add_information(entry['beliefs'])
+        elif op == 'retract':
+            self.retract_information(entry['beliefs'])
+        elif op == 'rule':
+            self.add_default_rule(entry['default'], entry['contradiction'])
+        elif op == 'justify':
+            self.add_justification(entry['belief'], entry['antecedents'])
+        elif op == 'priority':
+            self.belief_priority[entry['belief']] = entry['priority']
+
+    def compact_journal(self):
+        """
+        Rewrite the journal as one snapshot of the current state (atomically).
+        """
+        if self.journal_path is None:
+            return
+        temporary = f"{self.journal_path}.tmp"
+        with open(temporary, 'w') as f:
+            f.write(json.dumps({'op': 'snapshot', 'config': self._snapshot()}) + "\n")
+        os.replace(temporary, self.journal_path)
+        logger.info(f"Journal compacted to {self.journal_path}")
+
 # Example default rules
 default_rules = [
     {"default": "Birds can fly", "contradiction": "Penguins can't fly"},
@@ -0,0 +1,1930 @@
+# fuzzy.py: A Comprehensive Guide to Fuzzy Logic Functions and Operations
+# Author: Professor Codephreak
+# License: MIT License, 2024
+
+# every membership factory and combinator returns a scalar closure f(x) with an
+# array-native variant attached as f.vector (ndarray -> ndarray); Set.array,
+# center_of_gravity, cardinality and Domain.__call__ take the vector path through
+# evaluate_array(), so a 1e6-point domain is one numpy pass instead of 1e6 calls
+# hedges, combinators and Set operators also attach f.expr, a node of a small
+# expression DAG (Expr): Sets are evaluated from the simplified DAG in one
+# vectorized pass, with results cached per (node, domain grid)
+# Set.tabulate()/precompile() swap an expensive function for a LookupTable with a
+# checked error bound (LookupTable.max_deviation)
+# bounded factories record where they can be non-zero (f.support), Expr.support()
+# propagates it through the DAG, and sets with a narrow support switch to a
+# SparseSet: comparisons, cardinality, normalized() and alpha cuts then touch only
+# the union of supports, never the full grid
+
+# Import necessary modules
+import hashlib
+import re
+from collections import OrderedDict
+from math import sqrt, exp, isinf, isnan, log
+from typing import Any, Optional, Callable
+from collections.abc import Callable
+from functools import reduce, wraps
+import importlib
+
+from automind.metrics import record_cache
+
+# numpy and matplotlib are optional "[learn]" extras; guard the imports so that
+# plain `import automindx.fuzzy` succeeds without them installed. pyplot is only
+# imported by Set.plot: the reasoning stack imports this module for its confidence
+# engine and shouldn't pay matplotlib's start-up cost
+try:
+    from numpy import multiply
+    import numpy as np
+except ImportError:  # optional dependency: pip install "ezagi[learn]"
+    multiply = None
+    np = None
+
+def _require_learn():
+    """Raise a helpful error when the optional [learn] extras are missing."""
+    if np is None:
+        raise ImportError(
+            'fuzzy logic Domain/Set operations require numpy and matplotlib. '
+            'Install the optional extras with: pip install "ezagi[learn]"'
+        )
+
+# Functions that transform a given membership value to a truth value
+def true(m):
+    """The membership-value is its own truth-value."""
+    return m
+
+def false(m):
+    """The opposite of TRUE."""
+    return 1 - m
+
+def fairly_false(m):
+    """Part of a circle in quadrant I."""
+    return sqrt(1 - m ** 2)
+
+def fairly_true(m):
+    """Part of a circle in quadrant II."""
+    return sqrt(1 - (1 - m) ** 2)
+
+def very_false(m):
+    """Part of a circle in quadrant III."""
+    return -sqrt(1 - (1 - m) ** 2)
+
+def very_true(m):
+    """Part of a circle in quadrant IV."""
+    return -sqrt(1 - m ** 2)
+
+def _vector(f, vf):
+    """Attach the array-native variant vf (ndarray -> ndarray) to the scalar function f."""
+    f.vector = vf
+    return f
+
+def _supported(f, low, high):
+    """Record on f that it is exactly 0 outside [low, high] (see Expr.support)."""
+    f.support = ((low, high),)
+    return f
+
+SPECS = {}  # factory name: factory, the functions function_spec()/from_spec() may rebuild
+
+def _specced(factory):
+    """Register factory and record each function it returns as f.spec = (name, args, kwargs)."""
+    @wraps(factory)
+    def make(*args, **kwargs):
+        f = factory(*args, **kwargs)
+        f.spec = (factory.__name__, args, kwargs)
+        return f
+    SPECS[factory.__name__] = make
+    return make
+
+def evaluate_array(func, xs):
+    """
+    Evaluate a membership function over an ndarray of values.
+
+    Uses the function's vector variant when it has one (every factory and
+    combinator below does), else falls back to one scalar call per value.
+    """
+    _require_learn()
+    xs = np.asarray(xs, dtype=float)
+    vector = getattr(func, "vector", None)
+    if vector is not None:
+        result = np.asarray(vector(xs), dtype=float)
+        return result if result.shape == xs.shape else np.broadcast_to(result, xs.shape).copy()
+    return np.fromiter((func(x) for x in xs.flat), float, count=xs.size).reshape(xs.shape)
+
+# Functions to evaluate, infer, and defuzzify
+def round_partial(value, res):
+    """Round any value to any arbitrary precision."""
+    return value if res == 0 or isinf(res) else round(value / res) * res
+
+@_specced
+def rescale(out_min, out_max, *, in_min=0, in_max=1):
+    """Scale from one domain to another."""
+    assert in_min < in_max
+    a = out_min
+    b = out_max
+    c = in_min
+    d = in_max
+    m = d - c
+    n = a * d
+    o = b * c
+    def f(x):
+        return (n - a * x - o + b * x) / m
+    return _vector(f, f)
+
+def weighted_sum(*, weights: dict, target_d: 'Domain'):
+    """Used for weighted decision trees and such."""
+    assert sum(weights.values()) == 1
+    rsc = rescale(target_d._low, target_d._high)
+    def f(memberships):
+        result = sum(r * weights[n] for n, r in memberships.items())
+        return round_partial(rsc(result), target_d._res)
+    return f
+
+# Lingual hedges modify curves of membership values
+def _combine(F, expr):
+    """Attach expr to the scalar combinator F; the vector path evaluates expr."""
+    F.expr = expr
+    F.vector = expr
+    return F
+
+def _power_hedge(power):
+    def hedge(g):
+        def f(x):
+            return g(x) ** power
+        return _combine(f, Expr("pow", (Expr.of(g),), param=power))
+    return hedge
+
+def very(g):
+    """Sharpen memberships so that only the values close to 1 stay at the top."""
+    if isinstance(g, Set):
+        return Set(_power_hedge(2)(g.func), domain=g.domain, name=f"very_{g.name}")
+    else:
+        return _power_hedge(2)(g)
+
+def plus(g):
+    """Sharpen memberships like 'very' but not as strongly."""
+    if isinstance(g, Set):
+        return Set(_power_hedge(1.25)(g.func), domain=g.domain, name=f"plus_{g.name}")
+    else:
+        return _power_hedge(1.25)(g)
+
+def minus(g):
+    """Increase membership support so that more values hit the top."""
+    if isinstance(g, Set):
+        return Set(_power_hedge(0.75)(g.func), domain=g.domain, name=f"minus_{g.name}")
+    else:
+        return _power_hedge(0.75)(g)
+
+# General-purpose functions that map R -> [0,1]
+def inv(g: Callable[[float], float]) -> Callable:
+    """Invert the given function within the unit-interval."""
+    def f(x: float) -> float:
+        return 1 - g(x)
+    return _combine(f, Expr("inv", (Expr.of(g),)))
+
+@_specced
+def noop() -> Callable:
+    """Do nothing and return the value as is."""
+    def f(x: float) -> float:
+        return x
+    return _vector(f, f)
+
+@_specced
+def constant(c: float) -> Callable:
+    """Return always the same value, no matter the input."""
+    def f(_: Any) -> float:
+        return c
+    def vf(x):
+        return np.full(np.shape(x), c, dtype=float)
+    return _vector(f, vf)
+
+@_specced
+def alpha(*, floor: float = 0, ceiling: float = 1, func: Callable, floor_clip: Optional[float] = None, ceiling_clip: Optional[float] = None):
+    """Clip a function's values."""
+    assert floor <= ceiling
+    assert 0 <= floor
+    assert ceiling <= 1
+    floor_clip = floor if floor_clip is None else floor_clip
+    ceiling_clip = ceiling if ceiling_clip is None else ceiling_clip
+    def f(x: float) -> float:
+        m = func(x)
+        if m >= ceiling:
+            return ceiling_clip
+        elif m <= floor:
+            return floor_clip
+        else:
+            return m
+    def vf(x):
+        m = evaluate_array(func, x)
+        return np.where(m >= ceiling, ceiling_clip, np.where(m <= floor, floor_clip, m))
+    return _vector(f, vf)
+
+def normalize(height: float, func: Callable) -> Callable:
+    """Map [0,1] to [0,1] so that max(array) == 1."""
+    assert 0 < height <= 1
+    def f(x: float) -> float:
+        return func(x) / height
+    return _combine(f, Expr("scale", (Expr.of(func),), param=1 / height))
+
+@_specced
+def moderate(func: Callable) -> Callable:
+    """Map [0,1] -> [0,1] with bias towards 0.5."""
+    def f(x: float) -> float:
+        return 1 / 2 + 4 * (func(x) - 1 / 2) ** 3
+    def vf(x):
+        return 1 / 2 + 4 * (evaluate_array(func, x) - 1 / 2) ** 3
+    return _vector(f, vf)
+
+# Membership Functions
+@_specced
+def singleton(p: float, *, no_m: float = 0, c_m: float = 1):
+    """A single spike."""
+    assert 0 <= no_m < c_m <= 1
+    def f(x: float) -> float:
+        return c_m if x == p else no_m
+    def vf(x):
+        return np.where(x == p, c_m, no_m)
+    f = _vector(f, vf)
+    return _supported(f, p, p) if no_m == 0 else f
+
+@_specced
+def linear(m: float = 0, b: float = 0) -> Callable:
+    """A textbook linear function with y-axis section and gradient."""
+    def f(x: float) -> float:
+        y = m * x + b
+        if y <= 0:
+            return 0
+        elif y >= 1:
+            return 1
+        else:
+            return y
+    def vf(x):
+        y = m * x + b
+        return np.where(y <= 0, 0.0, np.where(y >= 1, 1.0, y))
+    return _vector(f, vf)
+
+@_specced
+def step(limit: float, /, *, left: float = 0, right: float = 1, at_lmt: Optional[float] = None) -> Callable:
+    """A step function."""
+    assert 0 <= left <= 1 and 0 <= right <= 1
+    at = at_lmt if at_lmt is not None else (left + right) / 2
+    def f(x: float) -> float:
+        if x < limit:
+            return left
+        elif x > limit:
+            return right
+        else:
+            return at
+    def vf(x):
+        return np.where(x < limit, left, np.where(x > limit, right, at))
+    f = _vector(f, vf)
+    if left == 0:
+        return _supported(f, limit, float("inf"))
+    return _supported(f, -float("inf"), limit) if right == 0 else f
+
+@_specced
+def bounded_linear(low: float, high: float, *, c_m: float = 1, no_m: float = 0, inverse=False) -> Callable:
+    """Variant of the linear function with gradient being determined by bounds."""
+    assert low < high
+    assert c_m > no_m
+    if inverse:
+        c_m, no_m = no_m, c_m
+    gradient = (c_m - no_m) / (high - low)
+    def g_0(_: Any) -> float:
+        return (c_m + no_m) / 2
+    if gradient == 0:
+        return _vector(g_0, lambda x: np.full(np.shape(x), (c_m + no_m) / 2, dtype=float))
+    asymptode = (high + low) / 2
+    def g_inf(x: float) -> float:
+        if x < asymptode:
+            return no_m
+        elif x > asymptode:
+            return c_m
+        else:
+            return (c_m + no_m) / 2
+    if isinf(gradient):
+        return _vector(g_inf, lambda x: np.where(x < asymptode, no_m,
+                                                 np.where(x > asymptode, c_m, (c_m + no_m) / 2)))
+    def f(x: float) -> float:
+        y = gradient * (x - low) + no_m
+        if y < 0:
+            return 0.0
+        return 1.0 if y > 1 else y
+    def vf(x):
+        y = gradient * (x - low) + no_m
+        return np.where(y < 0, 0.0, np.where(y > 1, 1.0, y))
+    return _vector(f, vf)
+
+@_specced
+def R(low: float, high: float) -> Callable:
+    """Simple alternative for bounded_linear()."""
+    assert low < high
+    def f(x: float) -> float:
+        if x < low or isinf(high - low):
+            return 0
+        elif low <= x <= high:
+            return (x - low) / (high - low)
+        else:
+            return 1
+    def vf(x):
+        if isinf(high - low):
+            return np.zeros(np.shape(x))
+        with np.errstate(invalid='ignore'):
+            return np.where(x < low, 0.0, np.where(x <= high, (x - low) / (high - low), 1.0))
+    return _supported(_vector(f, vf), low, float("inf"))
+
+@_specced
+def S(low: float, high: float) -> Callable:
+    """Simple alternative for bounded_linear."""
+    assert low < high
+    def f(x: float) -> float:
+        if x <= low:
+            return 1
+        elif low < x < high:
+            return high / (high - low) - x / (high - low)
+        else:
+            return 0
+    def vf(x):
+        with np.errstate(invalid='ignore'):
+            return np.where(x <= low, 1.0, np.where(x < high, high / (high - low) - x / (high - low), 0.0))
+    return _supported(_vector(f, vf), -float("inf"), high)
+
+@_specced
+def rectangular(low: float, high: float, *, c_m: float = 1, no_m: float = 0) -> Callable:
+    """Basic rectangular function that returns the core_y for the core else 0."""
+    assert low < high
+    def f(x: float) -> float:
+        return no_m if x < low or high < x else c_m
+    def vf(x):
+        return np.where((x < low) | (high < x), no_m, c_m)
+    f = _vector(f, vf)
+    return _supported(f, low, high) if no_m == 0 else f
+
+@_specced
+def triangular(low: float, high: float, *, c: Optional[float] = None, c_m: float = 1, no_m: float = 0):
+    """Basic triangular norm as combination of two linear functions."""
+    assert low < high
+    assert no_m < c_m
+    c = c if c is not None else (low + high) / 2.0
+    assert low < c < high
+    left_slope = bounded_linear(low, c, no_m=0, c_m=c_m)
+    right_slope = inv(bounded_linear(c, high, no_m=0, c_m=c_m))
+    def f(x: float) -> float:
+        return left_slope(x) if x <= c else right_slope(x)
+    def vf(x):
+        return np.where(x <= c, left_slope.vector(x), right_slope.vector(x))
+    f = _vector(f, vf)
+    return _supported(f, low, high) if c_m == 1 else f  # below 1 the right slope never returns to 0
+
+@_specced
+def trapezoid(low: float, c_low: float, c_high: float, high: float, *, c_m: float = 1, no_m: float = 0):
+    """Combination of rectangular and triangular, for convenience."""
+    assert low < c_low <= c_high < high
+    assert 0 <= no_m < c_m <= 1
+    left_slope = bounded_linear(low, c_low, c_m=c_m, no_m=no_m)
+    right_slope = bounded_linear(c_high, high, c_m=c_m, no_m=no_m, inverse=True)
+    def f(x: float) -> float:
+        if x < low or high < x:
+            return no_m
+        elif x < c_low:
+            return left_slope(x)
+        elif x > c_high:
+            return right_slope(x)
+        else:
+            return c_m
+    def vf(x):
+        return np.where((x < low) | (high < x), no_m,
+                        np.where(x < c_low, left_slope.vector(x),
+                                 np.where(x > c_high, right_slope.vector(x), c_m)))
+    f = _vector(f, vf)
+    return _supported(f, low, high) if no_m == 0 else f
+
+@_specced
+def sigmoid(L: float, k: float, x0: float = 0):
+    """Special logistic function."""
+    assert 0 < L <= 1
+    def f(x: float) -> float:
+        if isnan(k * x):
+            o = 1.0
+        else:
+            try:
+                o = exp(-k * (x - x0))
+            except OverflowError:
+                o = float("inf")
+        return L / (1 + o)
+    def vf(x):
+        with np.errstate(over='ignore', invalid='ignore'):
+            o = np.where(np.isnan(k * x), 1.0, np.exp(-k * (x - x0)))
+            return L / (1 + o)
+    return _vector(f, vf)
+
+@_specced
+def bounded_sigmoid(low: float, high: float, inverse=False):
+    """Calculate a weight based on the sigmoid function."""
+    assert low < high
+    if inverse:
+        low, high = high, low
+    k = (4.0 * log(3)) / (low - high)
+    try:
+        if isinf(k):
+            p = 0.0
+        elif isnan(-k * low):
+            p = 1.0
+        else:
+            p = exp(-k * low)
+    except OverflowError:
+        p = float("inf")
+    def f(x: float) -> float:
+        try:
+            q = 1.0 if (isinf(k) and x == 0) or (k == 0 and isinf(x)) else exp(x * k)
+        except OverflowError:
+            q = float("inf")
+        r = p * q
+        if isnan(r):
+            r = 1
+        return 1 / (1 + 9 * r)
+    def vf(x):
+        with np.errstate(over='ignore', invalid='ignore'):
+            special = (isinf(k) & (x == 0)) | ((k == 0) & np.isinf(x))
+            q = np.where(special, 1.0, np.exp(x * k))
+            r = p * q
+            r = np.where(np.isnan(r), 1.0, r)
+            return 1 / (1 + 9 * r)
+    return _vector(f, vf)
+
+@_specced
+def bounded_exponential(k: float = 0.1, limit: float = 1):
+    """Function that goes through the origin and approaches a limit."""
+    assert limit > 0
+    assert k > 0
+    def f(x: float) -> float:
+        try:
+            return limit - limit / exp(k * x)
+        except OverflowError:
+            return float(limit)
+    def vf(x):
+        with np.errstate(over='ignore', divide='ignore'):
+            return limit - limit / np.exp(k * x)
+    return _vector(f, vf)
+
+@_specced
+def simple_sigmoid(k: float = 0.229756):
+    """Sigmoid variant with only one parameter (steepness)."""
+    def f(x: float) -> float:
+        if isinf(x) and k == 0:
+            return 1 / 2
+        try:
+            return 1 / (1 + exp(x * -k))
+        except OverflowError:
+            return 0.0
+    def vf(x):
+        with np.errstate(over='ignore', invalid='ignore'):
+            return np.where(np.isinf(x) & (k == 0), 1 / 2, 1 / (1 + np.exp(x * -k)))
+    return _vector(f, vf)
+
+@_specced
+def triangular_sigmoid(low: float, high: float, c: Optional[float] = None):
+    """Version of triangular using sigmoids instead of linear."""
+    assert low < high
+    c = c if c is not None else (low + high) / 2.0
+    assert low < c < high
+    left_slope = bounded_sigmoid(low, c)
+    right_slope = inv(bounded_sigmoid(c, high))
+    def f(x: float) -> float:
+        return left_slope(x) if x <= c else right_slope(x)
+    def vf(x):
+        return np.where(x <= c, left_slope.vector(x), right_slope.vector(x))
+    return _vector(f, vf)
+
+@_specced
+def gauss(c: float, b: float, *, c_m: float = 1) -> Callable:
+    """Defined by ae^(-b(x-x0)^2), a gaussian distribution."""
+    assert 0 < c_m <= 1
+    assert 0 < b
+    def f(x: float) -> float:
+        try:
+            o = (x - c) ** 2
+        except OverflowError:
+            return 0
+        return c_m * exp(-b * o)
+    def vf(x):
+        with np.errstate(over='ignore'):
+            return c_m * np.exp(-b * (x - c) ** 2)
+    return _vector(f, vf)
+
+# Combinators for Fuzzy Sets
+# each F carries an Expr node whose vector evaluation folds the operands' arrays
+# with the array form of the same operator
+def _fold(funcs, op, vop, kind, param=None):
+    def F(z):
+        return reduce(op, (f(z) for f in funcs))
+    return _combine(F, Expr(kind, tuple(Expr.of(f) for f in funcs), param=param, op=vop))
+
+def MIN(*guncs) -> Callable:
+    """Classic AND variant."""
+    funcs = list(guncs)
+    def F(z):
+        return min(f(z) for f in funcs)
+    return _combine(F, Expr("min", tuple(Expr.of(f) for f in funcs)))
+
+def MAX(*guncs):
+    """Classic OR variant."""
+    funcs = list(guncs)
+    def F(z):
+        return max((f(z) for f in funcs), default=1)
+    return _combine(F, Expr("max", tuple(Expr.of(f) for f in funcs)))
+
+def _multiply(x, y):
+    return x * y
+
+def product(*guncs):
+    """AND variant."""
+    return _fold(list(guncs), multiply, _multiply, "product")
+
+def bounded_sum(*guncs):
+    """OR variant."""
+    def op(x, y):
+        return x + y - x * y
+    return _fold(list(guncs), op, op, "bounded_sum")
+
+def lukasiewicz_AND(*guncs):
+    """AND variant."""
+    def op(x, y):
+        return min(1, x + y)
+    def vop(x, y):
+        return np.minimum(1, x + y)
+    return _fold(list(guncs), op, vop, "lukasiewicz_AND")
+
+def lukasiewicz_OR(*guncs):
+    """OR variant."""
+    def op(x, y):
+        return max(0, x + y - 1)
+    def vop(x, y):
+        return np.maximum(0, x + y - 1)
+    return _fold(list(guncs), op, vop, "lukasiewicz_OR")
+
+def einstein_product(*guncs):
+    """AND variant."""
+    def op(x, y):
+        return (x * y) / (2 - (x + y - x * y))
+    return _fold(list(guncs), op, op, "einstein_product")
+
+def einstein_sum(*guncs):
+    """OR variant."""
+    def op(x, y):
+        return (x + y) / (1 + x * y)
+    return _fold(list(guncs), op, op, "einstein_sum")
+
+def hamacher_product(*guncs):
+    """AND variant."""
+    def op(x, y):
+        return (x * y) / (x + y - x * y) if x != 0 and y != 0 else 0
+    def vop(x, y):
+        return np.where((x != 0) & (y != 0), (x * y) / (x + y - x * y), 0.0)
+    return _fold(list(guncs), op, vop, "hamacher_product")
+
+def hamacher_sum(*guncs):
+    """OR variant."""
+    def op(x, y):
+        return (x + y - 2 * x * y) / (1 - x * y) if x != 1 or y != 1 else 1
+    def vop(x, y):
+        return np.where((x != 1) | (y != 1), (x + y - 2 * x * y) / (1 - x * y), 1.0)
+    return _fold(list(guncs), op, vop, "hamacher_sum")
+
+def lambda_op(h):
+    """A 'compensatoric' operator, combining AND with OR by a weighing factor l."""
+    assert 0 <= h <= 1
+    def E(*guncs):
+        def op(x, y):
+            return h * (x * y) + (1 - h) * (x + y - x * y)
+        return _fold(list(guncs), op, op, "lambda_op", param=h)
+    return E
+
+def gamma_op(g):
+    """Combine AND with OR by a weighing factor g."""
+    assert 0 <= g <= 1
+    def E(*guncs):
+        def op(x, y):
+            return (x * y) ** (1 - g) * ((1 - x) * (1 - y)) ** g
+        return _fold(list(guncs), op, op, "gamma_op", param=g)
+    return E
+
+def simple_disjoint_sum(*funcs):
+    """Simple fuzzy XOR operation."""
+    def F(z):
+        M = {f(z) for f in funcs}
+        return max(min((x, *({1 - y for y in M - set([x])} or (1 - x,)))) for x in M)
+    if len(funcs) != 2:
+        return F  # evaluate_array falls back to scalar calls
+    def op(a, b):
+        return np.where(a == b, np.minimum(a, 1 - a), np.maximum(np.minimum(a, 1 - b), np.minimum(b, 1 - a)))
+    return _combine(F, Expr("xor", tuple(Expr.of(f) for f in funcs), op=op))
+
+# Expression DAG behind composed sets
+# kinds: leaf (a membership function), inv, pow (hedges), scale, min, max, xor and
+# the folded t-norms/t-conorms above; FLATTEN lists the associative ones
+FLATTEN = {"min", "max", "product", "bounded_sum", "lukasiewicz_AND", "lukasiewicz_OR",
+           "einstein_product", "einstein_sum", "hamacher_product", "hamacher_sum"}
+# support propagation: an AND-like node is 0 wherever any operand is 0, an OR-like
+# node wherever all operands are (gamma_op joins AND_LIKE for g < 1)
+AND_LIKE = {"min", "product", "lukasiewicz_OR", "einstein_product", "hamacher_product"}
+OR_LIKE = {"max", "bounded_sum", "lukasiewicz_AND", "einstein_sum", "hamacher_sum", "lambda_op", "xor"}
+_CACHED_GRIDS = 4  # domain grids remembered per node
+SPARSE_FRACTION = 0.25  # Sets whose support spans at most this share of the grid stay sparse
+
+def _merge_intervals(intervals):
+    """Sorted union of (low, high) intervals, overlapping or touching ones joined."""
+    merged = []
+    for low, high in sorted(intervals):
+        if merged and low <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], high))
+        else:
+            merged.append((low, high))
+    return tuple(merged)
+
+def _intersect_intervals(a, b):
+    """Intersection of two sorted, disjoint interval tuples."""
+    result, i, j = [], 0, 0
+    while i < len(a) and j < len(b):
+        low, high = max(a[i][0], b[j][0]), min(a[i][1], b[j][1])
+        if low <= high:
+            result.append((low, high))
+        if a[i][1] < b[j][1]:
+            i += 1
+        else:
+            j += 1
+    return tuple(result)
+
+class Expr:
+    """
+    Node of a fuzzy set's expression DAG. Nodes are immutable; simplified()
+    fuses hedges (very(plus(f)) -> f ** 2.5), cancels double inversion and
+    flattens nested associative operators, and calling a node evaluates the
+    simplified DAG over an ndarray in one pass, shared subexpressions once.
+    """
+    __slots__ = ("kind", "children", "param", "op", "_simplified", "_cache", "_support")
+
+    def __init__(self, kind, children=(), *, param=None, op=None):
+        self.kind = kind
+        self.children = tuple(children)
+        self.param = param
+        self.op = op
+        self._simplified = None
+        self._cache = {}
+        self._support = False  # not computed yet; None is a valid (unknown) support
+
+    @staticmethod
+    def of(func):
+        """The expression of func: its own DAG, or a leaf remembered on the function."""
+        expr = getattr(func, "expr", None)
+        if expr is None:
+            expr = Expr("leaf", param=func)
+            try:
+                func.expr = expr
+            except (AttributeError, TypeError):
+                pass
+        return expr
+
+    def __repr__(self):
+        if self.kind == "leaf":
+            return getattr(self.param, "__qualname__", repr(self.param)).split(".<locals>")[0]
+        param = "" if self.param is None else f"; {self.param:g}"
+        return f"{self.kind}({', '.join(map(repr, self.children))}{param})"
+
+    def size(self):
+        """Number of distinct nodes in the DAG."""
+        seen = {}
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if id(node) not in seen:
+                seen[id(node)] = node
+                stack.extend(node.children)
+        return len(seen)
+
+    def support(self):
+        """
+        Where the node can be non-zero: a sorted tuple of (low, high) intervals
+        outside which it is exactly 0, () when it is 0 everywhere, or None when
+        that is unknown (a leaf without f.support, inversion, ...).
+        """
+        if self._support is False:
+            self._support = self._find_support()
+        return self._support
+
+    def _find_support(self):
+        if self.kind == "leaf":
+            support = getattr(self.param, "support", None)
+            return None if support is None else _merge_intervals(support)
+        if self.kind == "scale" or (self.kind == "pow" and self.param > 0):
+            return self.children[0].support()
+        supports = [c.support() for c in self.children]
+        if self.kind in AND_LIKE or (self.kind == "gamma_op" and self.param < 1):
+            known = [s for s in supports if s is not None]
+            return reduce(_intersect_intervals, known) if known else None
+        if self.kind in OR_LIKE and supports and None not in supports:
+            return _merge_intervals(i for s in supports for i in s)
+        return None
+
+    def simplified(self):
+        if self._simplified is None:
+            self._simplified = self._simplify()
+        return self._simplified
+
+    def _simplify(self):
+        if self.kind == "leaf":
+            return self
+        children = [c.simplified() for c in self.children]
+        if self.kind == "inv" and children[0].kind == "inv":
+            return children[0].children[0]
+        if self.kind in ("pow", "scale"):
+            child, param = children[0], self.param
+            while child.kind == self.kind:  # (m ** a) ** b == m ** (a * b) for m >= 0
+                param *= child.param
+                child = child.children[0]
+            return child if param == 1 else Expr(self.kind, (child,), param=param)
+        if self.kind in FLATTEN:
+            flat = []
+            for c in children:
+                flat.extend(c.children if c.kind == self.kind else (c,))
+            if self.kind in ("min", "max"):  # idempotent: min(a, a) == a
+                flat = list({id(c): c for c in flat}.values())
+                if len(flat) == 1:
+                    return flat[0]
+            children = flat
+        if len(children) == len(self.children) and all(a is b for a, b in zip(children, self.children)):
+            return self
+        return Expr(self.kind, children, param=self.param, op=self.op)
+
+    def __call__(self, xs):
+        """Evaluate the simplified expression over an ndarray."""
+        _require_learn()
+        return self.simplified()._evaluate(np.asarray(xs, dtype=float), {}, None)
+
+    def on(self, domain):
+        """
+        Values over the domain's grid, cached per (node, grid): a second call
+        for the same node and domain bounds returns the same read-only array.
+        """
+        node = self.simplified()
+        key = (domain._low, domain._high, domain._res)
+        values = node._cache.get(key)
+        record_cache("fuzzy.grid", values is not None)
+        if values is None:
+            grid = domain.range
+            values = node._evaluate(np.asarray(grid, dtype=float), {}, key)
+            if np.may_share_memory(values, grid):
+                values = values.copy()
+            values.flags.writeable = False
+            node._remember(key, values)
+        return values
+
+    def _remember(self, key, values):
+        if len(self._cache) >= _CACHED_GRIDS:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = values
+
+    def _evaluate(self, xs, memo, key):
+        result = memo.get(id(self))
+        if result is not None:
+            return result
+        if self.kind == "leaf":
+            result = self._cache.get(key) if key is not None else None
+            if result is None:
+                result = evaluate_array(self.param, xs)
+                if key is not None:  # leaves hold the expensive membership functions
+                    self._remember(key, result)
+        else:
+            args = [c._evaluate(xs, memo, key) for c in self.children]
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                if self.kind == "inv":
+                    result = 1 - args[0]
+                elif self.kind == "pow":
+                    result = args[0] ** self.param
+                elif self.kind == "scale":
+                    result = args[0] * self.param
+                elif self.kind == "min":
+                    result = np.minimum.reduce(args)
+                elif self.kind == "max":
+                    result = np.maximum.reduce(args) if args else np.ones(xs.shape)
+                else:
+                    result = reduce(self.op, args)
+        memo[id(self)] = result
+        return result
+
+# Domain, Set and Rule classes for fuzzy logic
+class FuzzyWarning(UserWarning):
+    """Extra Exception so that user code can filter exceptions specific to this lib."""
+    pass
+
+class Domain:
+    """A domain is a 'measurable' dimension of 'real' values like temperature."""
+    __slots__ = ["_name", "_low", "_high", "_res", "_sets", "_grid"]
+    def __init__(self, name: str, low: float, high: float, res: float = 1, sets: dict = None):
+        _require_learn()
+        assert low < high
+        assert res > 0
+        self._grid = None  # cached read-only range, see Domain.range
+        self._name = name
+        self._high = high
+        self._low = low
+        self._res = res
+        self._sets = {} if sets is None else sets  # Name: Set(Function())
+
+    def __call__(self, x):
+        """
+        Pass a value to all sets of the domain and return a dict with results.
+        An ndarray of values is evaluated through each set's vector path.
+        """
+        if isinstance(x, np.ndarray):
+            if not np.all((self._low <= x) & (x <= self._high)):
+                raise FuzzyWarning(f"values outside of domain {self._name}!")
+            return {name: s.expr(x) for name, s in self._sets.items()}
+        if not (self._low <= x <= self._high):
+            raise FuzzyWarning(f"{x} is outside of domain!")
+        return {name: s.func(x) for name, s in self._sets.items()}
+
+    def __str__(self):
+        """Return a string to print()."""
+        return self._name
+
+    def __repr__(self):
+        """Return a string so that eval(repr(Domain)) == Domain."""
+        return f"Domain('{self._name}', {self._low}, {self._high}, res={self._res}, sets={self._sets})"
+
+    def __eq__(self, other):
+        """Test equality of two domains."""
+        return all([self._name == other._name, self._low == other._low, self._high == other._high, self._res == other._res, self._sets == other._sets])
+
+    def __hash__(self):
+        return id(self)
+
+    def __getattr__(self, name):
+        """Get the value of an attribute. Called after __getattribute__ is called with an AttributeError."""
+        if name in self._sets:
+            return self._sets[name]
+        else:
+            raise AttributeError(f"{name} is not a set or attribute")
+
+    def __setattr__(self, name, value):
+        """Define a set within a domain or assign a value to a domain attribute."""
+        if name in self.__slots__:
+            if name in ("_low", "_high", "_res"):
+                object.__setattr__(self, "_grid", None)  # the grid is rebuilt on next access
+            object.__setattr__(self, name, value)
+        else:
+            assert str.isidentifier(name)
+            if not isinstance(value, Set):
+                value = Set(value)
+            self._sets[name] = value
+            value.domain = self
+            value.name = name
+
+    def __delattr__(self, name):
+        """Delete a fuzzy set from the domain."""
+        if name in self._sets:
+            del self._sets[name]
+        else:
+            raise FuzzyWarning("Trying to delete a regular attr, this needs extra care.")
+
+    @property
+    def range(self):
+        """
+        Return the domain's grid (arange or linspace by resolution). Built once
+        and cached read-only until _low, _high or _res change.
+        """
+        grid = self._grid
+        if grid is None:
+            if int(self._res) == self._res:
+                grid = np.arange(self._low, self._high + self._res, int(self._res))
+            else:
+                grid = np.linspace(self._low, self._high, int((self._high - self._low) / self._res) + 1)
+            grid.flags.writeable = False
+            self._grid = grid
+        return grid
+
+    # grid arithmetic for sparse sets: sizes, slices and index spans of the grid
+    # computed the way arange/linspace compute them, without building the grid
+    def _size(self):
+        """Number of points in the grid."""
+        if self._grid is not None:
+            return len(self._grid)
+        if int(self._res) == self._res:
+            return max(0, int(np.ceil((self._high + self._res - self._low) / int(self._res))))
+        return int((self._high - self._low) / self._res) + 1
+
+    def _spacing(self):
+        if int(self._res) == self._res:
+            return int(self._res)
+        return (self._high - self._low) / (self._size() - 1)
+
+    def _points(self, start, stop):
+        """The grid values range[start:stop]."""
+        if self._grid is not None:
+            return np.asarray(self._grid[start:stop], dtype=float)
+        points = self._low + np.arange(start, stop) * self._spacing()
+        if int(self._res) != self._res and stop == self._size() and stop > start:
+            points[-1] = self._high  # linspace pins the endpoint
+        return points
+
+    def _span(self, low, high):
+        """
+        Index span [start, stop) of the grid points within [low, high], with a
+        point of slack on each side against rounding; empty when outside.
+        """
+        low, high = max(low, self._low), min(high, self._high)
+        if low > high:
+            return 0, 0
+        size, spacing = self._size(), self._spacing()
+        start = max(0, int(np.floor((low - self._low) / spacing)) - 1)
+        stop = min(size, int(np.floor((high - self._low) / spacing)) + 2)
+        return start, stop
+
+    def min(self, x):
+        """Standard way to get the min over all membership funcs."""
+        return min((f(x) for f in self._sets.values()), default=0)
+
+    def max(self, x):
+        """Standard way to get the max over all membership funcs."""
+        return max((f(x) for f in self._sets.values()), default=0)
+
+class Set:
+    """A fuzzy set defines a 'region' within a domain."""
+    name = None
+
+    def __init__(self, func: Callable, *, name: str = None, domain: Domain = None):
+        _require_learn()
+        self._memo = None  # [grid, sampled array, center of gravity] for the current grid
+        self._sparse_memo = None  # (grid key, SparseSet or None when dense pays off)
+        self.func = func
+        self.domain = domain
+        self.name = name
+
+    @property
+    def func(self):
+        return self._func
+
+    @func.setter
+    def func(self, func):
+        self._func = func
+        self.expr = Expr.of(func)  # the set's expression DAG
+        self._memo = self._sparse_memo = None
+
+    @property
+    def domain(self):
+        return self._domain
+
+    @domain.setter
+    def domain(self, domain):
+        self._domain = domain
+        self._memo = self._sparse_memo = None
+
+    def __call__(self, x):
+        if isinstance(x, np.ndarray):
+            return self.expr(x)
+        return self.func(x)
+
+    def __invert__(self):
+        """Return a new set with 1 - function."""
+        return Set(inv(self.func), domain=self.domain)
+
+    def __neg__(self):
+        """Synonym for invert."""
+        return Set(inv(self.func), domain=self.domain)
+
+    def __and__(self, other):
+        """Return a new set with modified function."""
+        assert self.domain == other.domain
+        return Set(MIN(self.func, other.func), domain=self.domain)
+
+    def __or__(self, other):
+        """Return a new set with modified function."""
+        assert self.domain == other.domain
+        return Set(MAX(self.func, other.func), domain=self.domain)
+
+    def __mul__(self, other):
+        """Return a new set with modified function."""
+        assert self.domain == other.domain
+        return Set(product(self.func, other.func), domain=self.domain)
+
+    def __add__(self, other):
+        """Return a new set with modified function."""
+        assert self.domain == other.domain
+        return Set(bounded_sum(self.func, other.func), domain=self.domain)
+
+    def __xor__(self, other):
+        """Return a new set with modified function."""
+        assert self.domain == other.domain
+        return Set(simple_disjoint_sum(self.func, other.func), domain=self.domain)
+
+    def __pow__(self, power):
+        """Return a new set with modified function."""
+        return Set(_power_hedge(power)(self.func), domain=self.domain)
+
+    def __eq__(self, other):
+        """A set is equal with another if both return the same values over the same range."""
+        if self.domain is None or other.domain is None:
+            raise FuzzyWarning("Impossible to determine.")
+        else:
+            return self._compare(other, np.equal)
+
+    def __le__(self, other):
+        """If this <= other, it means this is a subset of the other."""
+        assert self.domain == other.domain
+        if self.domain is None or other.domain is None:
+            raise FuzzyWarning("Can't compare without Domains.")
+        return self._compare(other, np.less_equal)
+
+    def __lt__(self, other):
+        """If this < other, it means this is a proper subset of the other."""
+        assert self.domain == other.domain
+        if self.domain is None or other.domain is None:
+            raise FuzzyWarning("Can't compare without Domains.")
+        return self._compare(other, np.less)
+
+    def __ge__(self, other):
+        """If this >= other, it means this is a superset of the other."""
+        assert self.domain == other.domain
+        if self.domain is None or other.domain is None:
+            raise FuzzyWarning("Can't compare without Domains.")
+        return self._compare(other, np.greater_equal)
+
+    def __gt__(self, other):
+        """If this > other, it means this is a proper superset of the other."""
+        assert self.domain == other.domain
+        if self.domain is None or other.domain is None:
+            raise FuzzyWarning("Can't compare without Domains.")
+        return self._compare(other, np.greater)
+
+    def _compare(self, other, op):
+        """op holds at every grid point; over the union of supports when both sets are sparse."""
+        a, b = self._sparse(), other._sparse()
+        if a is not None and b is not None and a.key == b.key:
+            return a.compare(b, op)
+        x, y = self.array(), other.array()
+        return x.shape == y.shape and bool(np.all(op(x, y)))
+
+    def __len__(self):
+        """Number of membership values in the set, defined by bounds and resolution of domain."""
+        if self.domain is None:
+            raise FuzzyWarning("No domain.")
+        return self.domain._size()
+
+    @property
+    def cardinality(self):
+        """The sum of all values in the set."""
+        if self.domain is None:
+            raise FuzzyWarning("No domain.")
+        sparse = self._sparse()
+        return np.sum(self.array()) if sparse is None else sparse.cardinality()
+
+    @property
+    def relative_cardinality(self):
+        """Relative cardinality is the sum of all membership values by number of all values."""
+        if self.domain is None:
+            raise FuzzyWarning("No domain.")
+        if len(self) == 0:
+            raise FuzzyWarning("The domain has no element.")
+        return self.cardinality / len(self)
+
+    def concentrated(self):
+        """Alternative to hedge 'very'."""
+        return Set(_power_hedge(2)(self.func), domain=self.domain)
+
+    def intensified(self):
+        """Alternative to hedges."""
+        func = self.func
+        def f(x):
+            return 2 * func(x) ** 2 if x < 0.5 else 1 - 2 * (1 - func(x) ** 2)
+        def vf(x):
+            m = evaluate_array(func, x)
+            return np.where(x < 0.5, 2 * m ** 2, 1 - 2 * (1 - m ** 2))
+        return Set(_vector(f, vf), domain=self.domain)
+
+    def dilated(self):
+        """Expand the set with more values and already included values are enhanced."""
+        func = self.func
+        return Set(_combine(lambda x: func(x) ** 1.0 / 2.0, Expr("scale", (self.expr,), param=0.5)),
+                   domain=self.domain)
+
+    def multiplied(self, n):
+        """Multiply with a constant factor, changing all membership values."""
+        func = self.func
+        return Set(_combine(lambda x: func(x) * n, Expr("scale", (self.expr,), param=n)),
+                   domain=self.domain)
+
+    def plot(self):
+        """Graph the set in the given domain."""
+        if self.domain is None:
+            raise FuzzyWarning("No domain assigned, cannot plot.")
+        import matplotlib.pyplot as plt
+        plt.plot(self.domain.range, self.array())
+
+    def array(self):
+        """
+        Return an array of all values for this set within the given domain,
+        evaluated from the compiled expression and cached per domain grid
+        (read-only; copy it before modifying).
+        """
+        if self.domain is None:
+            raise FuzzyWarning("No domain assigned.")
+        grid = self.domain.range
+        memo = self._memo
+        if memo is None or memo[0] is not grid:
+            memo = self._memo = [grid, self.expr.on(self.domain), None]
+        return memo[1]
+
+    def sparse(self):
+        """
+        This set as a SparseSet over the domain's grid: sampled over its support
+        when that is known, else converted from the dense array.
+        """
+        if self.domain is None:
+            raise FuzzyWarning("No domain assigned.")
+        sparse = self._sparse()
+        if sparse is None:
+            sparse = SparseSet.from_array(self.domain, self.array())
+        return sparse
+
+    def _sparse(self):
+        """
+        The automatic dense/sparse switch: a SparseSet when the support is known
+        and covers at most SPARSE_FRACTION of the grid and no dense array has
+        been sampled yet, else None (use array()).
+        """
+        domain = self.domain
+        memo = self._memo
+        if memo is not None and memo[0] is domain._grid:
+            return None
+        key = (domain._low, domain._high, domain._res)
+        if self._sparse_memo is None or self._sparse_memo[0] != key:
+            sparse = None
+            support = self.expr.support()
+            if support is not None:
+                spans = _merge_intervals(domain._span(low, high) for low, high in support)
+                spans = tuple((start, stop) for start, stop in spans if stop > start)
+                if sum(stop - start for start, stop in spans) <= SPARSE_FRACTION * domain._size():
+                    sparse = SparseSet(domain, [(start, self.expr(domain._points(start, stop)))
+                                                for start, stop in spans])
+            self._sparse_memo = (key, sparse)
+        return self._sparse_memo[1]
+
+    def alpha_cut(self, alpha, *, strong=False):
+        """
+        The alpha-cut: grid intervals where membership >= alpha (> alpha when
+        strong), as [(low, high), ...] in domain units.
+        """
+        return self.sparse().alpha_cut(alpha, strong=strong)
+
+    def center_of_gravity(self):
+        """Return the center of gravity for this distribution, within the given domain."""
+        assert self.domain is not None
+        sparse = self._sparse()
+        if sparse is not None:
+            return sparse.center_of_gravity()
+        weights = self.array()
+        memo = self._memo
+        if memo[2] is None:
+            total = weights.sum()
+            memo[2] = 0 if total == 0 else float(np.dot(memo[0], weights) / total)
+        return memo[2]
+
+    def __repr__(self):
+        """Return a string representation of the Set that reconstructs the set with eval()."""
+        return f"Set({self.func})"
+
+    def __str__(self):
+        """Return a string for print()."""
+        if self.domain is not None:
+            return f"{self.domain._name}.{self.name}"
+        if self.name is None:
+            return f"dangling Set({self.func})"
+        else:
+            return f"dangling Set({self.name}"
+
+    def normalized(self):
+        """Return a set that is normalized *for this domain* with 1 as max."""
+        if self.domain is None:
+            raise FuzzyWarning("Can't normalize without domain.")
+        sparse = self._sparse()
+        height = max(self.array()) if sparse is None else sparse.max()
+        return Set(normalize(height, self.func), domain=self.domain)
+
+    def tabulate(self, resolution=None, *, mode="linear", tolerance=None, max_points=1 << 22):
+        """
+        Return a set answering from a lookup table sampled once over the domain.
+
+        Args:
+            resolution: table spacing (default: the domain's resolution).
+            mode: "linear" interpolation or "nearest" sample.
+            tolerance: when given, the spacing is halved until the table's
+                max_deviation() is within it (FuzzyWarning past max_points).
+            max_points: upper bound on the table size.
+
+        Returns:
+            Set: same domain and name; its func answers from the table, with
+            func.table (the LookupTable) and func.exact attached.
+        """
+        if self.domain is None:
+            raise FuzzyWarning("Can't tabulate without domain.")
+        step = resolution if resolution is not None else self.domain._res
+        while True:
+            table = LookupTable(self.func, self.domain._low, self.domain._high, step, mode=mode)
+            if tolerance is None:
+                break
+            deviation = table.max_deviation()
+            if deviation <= tolerance:
+                break
+            if len(table.values) * 2 > max_points:
+                raise FuzzyWarning(f"{self} can't be tabulated within {tolerance} in {max_points} points "
+                                   f"(max deviation {deviation:.3g} at {len(table.values)} points)")
+            step /= 2
+        return Set(table.function, domain=self.domain, name=self.name)
+
+    def precompile(self, tolerance=1e-6, *, mode="linear", max_points=1 << 22):
+        """Replace this set's function by a lookup table within tolerance; the exact one stays on func.exact."""
+        self.func = self.tabulate(mode=mode, tolerance=tolerance, max_points=max_points).func
+        return self
+
+    def __hash__(self):
+        return id(self)
+
+class SparseSet:
+    """
+    A set sampled only over its support: runs of consecutive grid points
+    (start index, values) on a domain's grid, every other point being 0.
+    Memory and work follow the support rather than the domain, so a singleton
+    or a narrow triangular on a 1e7-point domain keeps a handful of samples
+    instead of the 80 MB grid and 80 MB array the dense path builds.
+    Set picks this representation by itself (Set._sparse); to_dense() and
+    from_array() convert in either direction.
+
+    Args:
+        domain: the Domain whose grid the runs index.
+        runs: [(start, values), ...] sorted and non-overlapping.
+    """
+    def __init__(self, domain, runs):
+        self.domain = domain
+        self.key = (domain._low, domain._high, domain._res)
+        self.size = domain._size()
+        self.runs = []
+        for start, values in runs:
+            values = np.asarray(values, dtype=float)
+            if len(values):
+                values.flags.writeable = False
+                self.runs.append((start, values))
+        self._cog = None
+
+    @classmethod
+    def from_array(cls, domain, values):
+        """Keep the non-zero runs of a dense array over domain's grid."""
+        nonzero = np.flatnonzero(np.diff(np.concatenate(([0], (values != 0).view(np.int8), [0]))))
+        return cls(domain, [(start, values[start:stop]) for start, stop in zip(nonzero[::2], nonzero[1::2])])
+
+    def __repr__(self):
+        return f"SparseSet({self.stored} of {self.size} points in {len(self.runs)} runs)"
+
+    @property
+    def stored(self):
+        """Number of stored samples."""
+        return sum(len(values) for _, values in self.runs)
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for _, values in self.runs)
+
+    def spans(self):
+        """Index spans [start, stop) of the runs."""
+        return [(start, start + len(values)) for start, values in self.runs]
+
+    def values(self, start, stop):
+        """Membership values for grid points [start, stop)."""
+        result = np.zeros(stop - start)
+        for first, values in self.runs:
+            low, high = max(start, first), min(stop, first + len(values))
+            if low < high:
+                result[low - start:high - start] = values[low - first:high - first]
+        return result
+
+    def to_dense(self):
+        return self.values(0, self.size)
+
+    def cardinality(self):
+        return np.sum([values.sum() for _, values in self.runs])
+
+    def max(self):
+        """Height of the set (0 when empty)."""
+        return max((values.max() for _, values in self.runs), default=0.0)
+
+    def center_of_gravity(self):
+        if self._cog is None:
+            total = self.cardinality()
+            if total == 0:
+                self._cog = 0
+            else:  # moments about the first sample keep the large grid offsets out of the sums
+                origin = self.domain._points(self.runs[0][0], self.runs[0][0] + 1)[0]
+                moment = sum(np.dot(self.domain._points(start, start + len(values)) - origin, values)
+                             for start, values in self.runs)
+                self._cog = float(origin + moment / total)
+        return self._cog
+
+    def compare(self, other, op):
+        """
+        op holds at every grid point. Only the union of both supports is
+        evaluated; everywhere else both sets are 0, so op(0, 0) decides.
+        """
+        spans = _merge_intervals(self.spans() + other.spans())
+        for start, stop in spans:
+            if not np.all(op(self.values(start, stop), other.values(start, stop))):
+                return False
+        return sum(stop - start for start, stop in spans) == self.size or bool(op(0.0, 0.0))
+
+    def alpha_cut(self, alpha, *, strong=False):
+        """
+        Grid intervals where membership >= alpha (> alpha when strong), as
+        [(low, high), ...] in domain units.
+        """
+        if alpha <= 0 and not strong:
+            return [(self.domain._low, self.domain._high)]
+        cut = []
+        for start, values in self.runs:
+            inside = values > alpha if strong else values >= alpha
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], inside.view(np.int8), [0]))))
+            for first, last in zip(edges[::2], edges[1::2]):
+                low, high = self.domain._points(start + first, start + last)[[0, -1]]
+                if cut and start + first == cut[-1][2]:  # runs that touch stay one interval
+                    cut[-1] = (cut[-1][0], float(high), start + last)
+                else:
+                    cut.append((float(low), float(high), start + last))
+        return [(low, high) for low, high, _ in cut]
+
+class LookupTable:
+    """
+    A membership function sampled once on an even grid over [low, high].
+    Point queries are an index (nearest) or a linear interpolation between the
+    two neighbouring samples; values outside the grid use the exact function.
+    table.function is the plain closure (with .vector, .table and .exact) that
+    sets use, so a lookup costs no more call overhead than the exact function.
+
+    Args:
+        func: the exact membership function.
+        low, high: the tabulated interval.
+        step: requested spacing; adjusted so the grid ends exactly at high.
+        mode: "linear" or "nearest".
+    """
+    def __init__(self, func, low, high, step, *, mode="linear"):
+        _require_learn()
+        if mode not in ("linear", "nearest"):
+            raise ValueError(f"Invalid mode: {mode}")
+        assert low < high and step > 0
+        self.exact = func
+        self.mode = mode
+        self.low = low
+        self.high = high
+        points = int(np.ceil((high - low) / step - 1e-9)) + 1  # a rebuilt table's step divides exactly
+        self.step = (high - low) / (points - 1)
+        self.grid = np.linspace(low, high, points)
+        self.values = evaluate_array(func, self.grid)
+        self.values.flags.writeable = False
+        self.function = self._scalar()
+        self.function.vector = self.vector
+        self.function.table = self
+        self.function.exact = func
+        support = getattr(func, "support", None)
+        if support is not None:  # interpolation reaches one step past the exact support
+            self.function.support = tuple((low - self.step, high + self.step) for low, high in support)
+
+    def _scalar(self):
+        # python floats for the scalar path, padded so values[i + 1] exists at x == high
+        values = self.values.tolist() + [float(self.values[-1])]
+        low, high, exact = self.low, self.high, self.exact
+        scale = 1 / self.step
+        if self.mode == "nearest":
+            def f(x):
+                if low <= x <= high:
+                    return values[int((x - low) * scale + 0.5)]
+                return exact(x)
+            return f
+        def f(x):
+            if low <= x <= high:
+                position = (x - low) * scale
+                i = int(position)
+                a = values[i]
+                return a + (values[i + 1] - a) * (position - i)
+            return exact(x)
+        return f
+
+    def __repr__(self):
+        return f"LookupTable({getattr(self.exact, '__qualname__', self.exact)}, {len(self.values)} points, {self.mode})"
+
+    def __call__(self, x):
+        return self.function(x)
+
+    def vector(self, xs):
+        xs = np.asarray(xs, dtype=float)
+        inside = (self.low <= xs) & (xs <= self.high)
+        last = len(self.values) - 1
+        with np.errstate(invalid='ignore'):
+            position = np.clip((xs - self.low) / self.step, 0, last)
+        position = np.where(np.isnan(position), 0, position)
+        if self.mode == "nearest":
+            result = self.values[np.rint(position).astype(np.intp)]
+        else:  # index arithmetic instead of np.interp's binary search
+            index = np.minimum(position.astype(np.intp), last - 1)
+            a = self.values[index]
+            result = a + (self.values[index + 1] - a) * (position - index)
+        if not inside.all():
+            result = np.where(inside, result, evaluate_array(self.exact, xs))
+        return result
+
+    def max_deviation(self, xs=None):
+        """
+        Largest |table - exact| over xs. By default: the grid nodes, every
+        midpoint (where interpolation error peaks on smooth curves) and a
+        golden-section point per interval, which never lines up with a halved
+        grid and so still lands beside jumps that the midpoints straddle.
+        """
+        if xs is None:
+            left, width = self.grid[:-1], self.step
+            xs = np.concatenate([self.grid, left + width / 2, left + width * 0.6180339887498949])
+        xs = np.asarray(xs, dtype=float)
+        with np.errstate(invalid='ignore'):
+            return float(np.nanmax(np.abs(self.vector(xs) - evaluate_array(self.exact, xs))))
+
+# Picklable specs of membership functions
+# closures can't be pickled, so a function travels as the recipe that built it:
+#   {"call": factory, "args": [...], "kwargs": {...}}   a @_specced factory call
+#   {"expr": kind, "param": p, "children": [...]}       a node of the simplified DAG
+#   {"table": exact, "low": l, "high": h, "step": s, "mode": m}   a LookupTable
+#   {"ref": "module:qualname"}                          a module-level function
+# arguments that are functions become specs themselves; shared subexpressions are
+# the same dict, so pickle stores them once and from_spec() rebuilds them once
+_REBUILD = {
+    "inv": lambda children, param: inv(*children),
+    "pow": lambda children, param: _power_hedge(param)(*children),
+    "scale": lambda children, param: _scale(*children, param),
+    "min": lambda children, param: MIN(*children),
+    "max": lambda children, param: MAX(*children),
+    "xor": lambda children, param: simple_disjoint_sum(*children),
+    "lambda_op": lambda children, param: lambda_op(param)(*children),
+    "gamma_op": lambda children, param: gamma_op(param)(*children),
+}
+
+def _scale(g, factor):
+    def f(x):
+        return g(x) * factor
+    return _combine(f, Expr("scale", (Expr.of(g),), param=factor))
+
+def function_spec(func, _memo=None):
+    """
+    A picklable description of a membership function (or Set), rebuilt by
+    from_spec(). Raises FuzzyWarning for functions that aren't built from
+    factories, combinators or module-level functions (lambdas, local closures).
+    """
+    func = func.func if isinstance(func, Set) else func
+    memo = {} if _memo is None else _memo
+    spec = getattr(func, "spec", None)
+    table = getattr(func, "table", None)
+    if spec is not None:
+        name, args, kwargs = spec
+        return {"call": name, "args": [_arg_spec(a, memo) for a in args],
+                "kwargs": {k: _arg_spec(v, memo) for k, v in kwargs.items()}}
+    if isinstance(table, LookupTable):
+        return {"table": function_spec(table.exact, memo), "low": table.low, "high": table.high,
+                "step": table.step, "mode": table.mode}
+    expr = getattr(func, "expr", None)
+    if isinstance(expr, Expr) and expr.kind != "leaf":
+        return _expr_spec(expr.simplified(), memo)
+    qualname = getattr(func, "__qualname__", "")
+    if getattr(func, "__module__", None) and qualname and "<" not in qualname:
+        return {"ref": f"{func.__module__}:{qualname}"}
+    raise FuzzyWarning(f"{func} has no picklable spec: build it from the factories in automindx.fuzzy")
+
+def _arg_spec(arg, memo):
+    return function_spec(arg, memo) if callable(arg) else arg
+
+def _expr_spec(node, memo):
+    spec = memo.get(id(node))
+    if spec is None:
+        if node.kind == "leaf":
+            spec = function_spec(node.param, memo)
+        elif node.kind in _REBUILD or node.kind in FLATTEN:
+            spec = {"expr": node.kind, "param": node.param,
+                    "children": [_expr_spec(c, memo) for c in node.children]}
+        else:
+            raise FuzzyWarning(f"can't describe a {node.kind} node")
+        memo[id(node)] = spec
+    return spec
+
+def from_spec(spec, _memo=None):
+    """Rebuild the membership function described by function_spec()."""
+    memo = {} if _memo is None else _memo
+    func = memo.get(id(spec))
+    if func is not None:
+        return func
+    if "call" in spec:
+        args = [from_spec(a, memo) if isinstance(a, dict) else a for a in spec["args"]]
+        kwargs = {k: from_spec(v, memo) if isinstance(v, dict) else v for k, v in spec["kwargs"].items()}
+        func = SPECS[spec["call"]](*args, **kwargs)
+    elif "expr" in spec:
+        children = [from_spec(c, memo) for c in spec["children"]]
+        kind = spec["expr"]
+        if kind in _REBUILD:
+            func = _REBUILD[kind](children, spec["param"])
+        else:  # the folded operators are the module functions of the same name
+            func = globals()[kind](*children)
+    elif "table" in spec:
+        func = LookupTable(from_spec(spec["table"], memo), spec["low"], spec["high"], spec["step"],
+                           mode=spec["mode"]).function
+    elif "ref" in spec:
+        module, qualname = spec["ref"].split(":")
+        func = importlib.import_module(module)
+        for name in qualname.split("."):
+            func = getattr(func, name)
+    else:
+        raise FuzzyWarning(f"not a function spec: {spec}")
+    memo[id(spec)] = func
+    return func
+
+class Rule:
+    """A collection of bound sets that span a multi-dimensional space of their respective domains."""
+    def __init__(self, conditions, func=None):
+        self.conditions = {frozenset(C): oth for C, oth in conditions.items()}
+        self.func = func
+
+    def __add__(self, other):
+        assert isinstance(other, Rule)
+        return Rule({**self.conditions, **other.conditions})
+
+    def __radd__(self, other):
+        assert isinstance(other, (Rule, int))
+        if isinstance(other, int):
+            return self
+        return Rule({**self.conditions, **other.conditions})
+
+    def __or__(self, other):
+        assert isinstance(other, Rule)
+        return Rule({**self.conditions, **other.conditions})
+
+    def __eq__(self, other):
+        return self.conditions == other.conditions
+
+    def __getitem__(self, key):
+        return self.conditions[frozenset(key)]
+
+    def __call__(self, args: dict[Domain, float], method="cog"):
+        """
+        Calculate the inferred value based on different methods. Default is center of gravity (cog).
+        Arrays of crisp inputs are inferred row-wise through RuleBase.infer_batch.
+        """
+        assert len(args) == max(len(c) for c in self.conditions.keys())
+        assert isinstance(args, dict)
+        if any(isinstance(v, np.ndarray) for v in args.values()):
+            if method != "cog":
+                raise ValueError("Invalid method.")
+            return RuleBase(self, mode="sugeno").infer_batch(args)
+        if method == "cog":
+            assert len({C.domain for C in self.conditions.values()}) == 1
+            actual_values = {f: f(args[f.domain]) for S in self.conditions.keys() for f in S}
+            weights = []
+            for K, v in self.conditions.items():
+                x = min((actual_values[k] for k in K if k in actual_values), default=0)
+                if x > 0:
+                    weights.append((v, x))
+            if not weights:
+                return None
+            # each target set's center of gravity is memoized in domain units,
+            # so inference costs O(rules) after the first call
+            return sum(v.center_of_gravity() * x for v, x in weights) / sum(x for v, x in weights)
+        else:
+            raise ValueError("Invalid method.")
+
+def _mean_of_max(aggregated, grid):
+    peak = aggregated.max(axis=1)
+    top = (aggregated == peak[:, None]) & (peak[:, None] > 0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (top @ grid) / top.sum(axis=1)
+
+def _bisector(aggregated, grid):
+    area = np.cumsum(aggregated, axis=1)
+    total = area[:, -1]
+    index = (area < total[:, None] / 2).sum(axis=1)
+    return np.where(total > 0, grid[np.minimum(index, len(grid) - 1)], np.nan)
+
+def _center_of_gravity(aggregated, grid):
+    total = aggregated.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(total > 0, (aggregated @ grid) / total, np.nan)
+
+class RuleBase:
+    """
+    Batch fuzzy inference: a set of rules evaluated over arrays of crisp inputs,
+    every row at once.
+
+    Args:
+        rules: a Rule, or a {antecedent Set or tuple of Sets: consequent} dict.
+            Mamdani consequents are Sets of one target domain; Sugeno consequents
+            are numbers, callables(inputs) -> array (first order) or Sets (their
+            center of gravity).
+        mode: "mamdani" or "sugeno".
+        and_op: t-norm over a rule's antecedents, "min" or "product".
+        implication: Mamdani consequent shaping, "min" (clip) or "product" (scale).
+        aggregation: Mamdani rule combination, "max", "bounded_sum" or "sum".
+        defuzzify: Mamdani defuzzification, "cog", "mom" (mean of max) or "bisector".
+    """
+    DEFUZZIFY = {"cog": _center_of_gravity, "mom": _mean_of_max, "bisector": _bisector}
+    CHUNK = 1 << 21  # rows x grid points aggregated at once
+
+    def __init__(self, rules, *, mode="mamdani", and_op="min", implication="min",
+                 aggregation="max", defuzzify="cog"):
+        _require_learn()
+        conditions = rules.conditions if isinstance(rules, Rule) else rules
+        self.rules = [(tuple(a) if isinstance(a, (tuple, list, frozenset, set)) else (a,), c)
+                      for a, c in conditions.items()]
+        if mode not in ("mamdani", "sugeno"):
+            raise ValueError(f"Invalid mode: {mode}")
+        if and_op not in ("min", "product"):
+            raise ValueError(f"Invalid t-norm: {and_op}")
+        if implication not in ("min", "product"):
+            raise ValueError(f"Invalid implication: {implication}")
+        if aggregation not in ("max", "bounded_sum", "sum"):
+            raise ValueError(f"Invalid aggregation: {aggregation}")
+        if defuzzify not in self.DEFUZZIFY:
+            raise ValueError(f"Invalid method: {defuzzify}")
+        self.mode = mode
+        self.and_op = and_op
+        self.implication = implication
+        self.aggregation = aggregation
+        self.defuzzify = defuzzify
+        self.target = None
+        if mode == "mamdani":
+            targets = {c.domain for _, c in self.rules}
+            if len(targets) != 1 or not all(isinstance(c, Set) for _, c in self.rules):
+                raise FuzzyWarning("Mamdani rules need Set consequents in a single target domain.")
+            self.target = targets.pop()
+
+    def firing(self, inputs):
+        """
+        Firing strength of every rule for every row.
+
+        Returns:
+            ndarray: shape (rules, rows); non-positive strengths are 0.
+        """
+        columns = {d: np.asarray(v, dtype=float) for d, v in inputs.items()}
+        memberships = {}
+        strengths = []
+        for antecedents, _ in self.rules:
+            values = []
+            for a in antecedents:
+                if id(a) not in memberships:
+                    if a.domain not in columns:
+                        raise KeyError(f"no inputs for domain {a.domain}")
+                    memberships[id(a)] = a.expr(columns[a.domain])
+                values.append(memberships[id(a)])
+            w = np.minimum.reduce(values) if self.and_op == "min" else np.multiply.reduce(values)
+            strengths.append(np.where(w > 0, w, 0.0))
+        return np.array(strengths)
+
+    def infer_batch(self, inputs, method=None):
+        """
+        Infer the crisp output of every row.
+
+        Args:
+            inputs: {Domain: 1-d array of crisp values}, all the same length.
+            method: defuzzification override for Mamdani mode.
+
+        Returns:
+            ndarray: one output per row, nan where no rule fires.
+        """
+        method = method or self.defuzzify
+        if method not in self.DEFUZZIFY:
+            raise ValueError(f"Invalid method: {method}")
+        strengths = self.firing(inputs)
+        if self.mode == "sugeno":
+            return self._sugeno(strengths, inputs)
+        return self._mamdani(strengths, method)
+
+    def _sugeno(self, strengths, inputs):
+        outputs = []
+        for _, consequent in self.rules:
+            if isinstance(consequent, Set):
+                outputs.append(consequent.center_of_gravity())
+            elif callable(consequent):
+                outputs.append(np.asarray(consequent(inputs), dtype=float))
+            else:
+                outputs.append(float(consequent))
+        total = strengths.sum(axis=0)
+        weighted = sum(w * z for w, z in zip(strengths, outputs))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(total > 0, weighted / total, np.nan)
+
+    def _mamdani(self, strengths, method):
+        consequents = [c for _, c in self.rules]
+        grid = np.asarray(self.target.range, dtype=float)
+        if self.implication == "product" and self.aggregation == "sum" and method == "cog":
+            # closed form: sum_r w_r * c_r has moments w_r * |c_r| and w_r * |c_r| * cog_r
+            areas = np.array([c.array().sum() for c in consequents])
+            cogs = np.array([c.center_of_gravity() for c in consequents])
+            total = (strengths * areas[:, None]).sum(axis=0)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return np.where(total > 0, (strengths * (areas * cogs)[:, None]).sum(axis=0) / total, np.nan)
+        # rules sharing a consequent collapse first: max_r min(w_r, c) == min(max_r w_r, c)
+        groups = {}
+        for w, c in zip(strengths, consequents):
+            if id(c) in groups and self.aggregation == "max":
+                groups[id(c)][0] = np.maximum(groups[id(c)][0], w)
+            elif id(c) in groups and self.aggregation == "sum" and self.implication == "product":
+                groups[id(c)][0] = groups[id(c)][0] + w
+            else:
+                groups[(id(c), len(groups)) if id(c) in groups else id(c)] = [w, c.array()]
+        rows = strengths.shape[1]
+        step = max(1, self.CHUNK // len(grid))
+        out = np.empty(rows)
+        for start in range(0, rows, step):
+            stop = min(rows, start + step)
+            aggregated = None
+            for w, values in groups.values():
+                w = w[start:stop, None]
+                shaped = np.minimum(w, values) if self.implication == "min" else w * values
+                if aggregated is None:
+                    aggregated = shaped
+                elif self.aggregation == "max":
+                    np.maximum(aggregated, shaped, out=aggregated)
+                elif self.aggregation == "sum":
+                    aggregated += shaped
+                else:
+                    aggregated = aggregated + shaped - aggregated * shaped
+            out[start:stop] = self.DEFUZZIFY[method](aggregated, grid)
+        return out
+
+# Rule tables: a small tokenizer and recursive-descent parser replace pandas + eval
+# names resolve only through the references symbol table (and a domain's sets);
+# operators follow python precedence: ** > ~ - > * > + > & > ^ > |
+_TOKEN = re.compile(r"\s*(?:(\d+(?:\.\d*)?|\.\d+)|([A-Za-z_]\w*)|(\*\*|[~\-&|^*+().]))")
+_HEDGES = {"very": very, "plus": plus, "minus": minus}
+_BINARY = [("|", lambda a, b: a | b), ("^", lambda a, b: a ^ b), ("&", lambda a, b: a & b),
+           ("+", lambda a, b: a + b), ("*", lambda a, b: a * b)]
+_RULE_CACHE = OrderedDict()  # (table hash, reference and set ids) -> (references, Rule)
+_RULE_CACHE_SIZE = 64
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text.strip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise FuzzyWarning(f"unexpected {text[position:]!r} in rule table cell {text!r}")
+        number, name, op = match.groups()
+        tokens.append(("num", float(number)) if number else ("name", name) if name else ("op", op))
+        position = match.end()
+    return tokens
+
+class _CellParser:
+    """Parse one rule-table cell into a Set, resolving names through symbols."""
+    def __init__(self, text, symbols):
+        self.text = text
+        self.symbols = symbols
+        self.tokens = _tokenize(text)
+        self.i = 0
+
+    def parse(self):
+        result = self.binary(0)
+        if self.i != len(self.tokens):
+            self.fail("trailing input")
+        return result
+
+    def fail(self, why):
+        raise FuzzyWarning(f"{why} in rule table cell {self.text!r}")
+
+    def peek(self):
+        return self.tokens[self.i] if self.i < len(self.tokens) else (None, None)
+
+    def expect(self, op):
+        if self.peek() != ("op", op):
+            self.fail(f"expected {op!r}")
+        self.i += 1
+
+    def binary(self, level):
+        if level == len(_BINARY):
+            return self.unary()
+        symbol, combine = _BINARY[level]
+        left = self.binary(level + 1)
+        while self.peek() == ("op", symbol):
+            self.i += 1
+            left = combine(left, self.binary(level + 1))
+        return left
+
+    def unary(self):
+        if self.peek() in (("op", "~"), ("op", "-")):
+            self.i += 1
+            return ~self.unary()
+        base = self.atom()
+        if self.peek() == ("op", "**"):
+            self.i += 1
+            kind, value = self.peek()
+            if kind != "num":
+                self.fail("expected a number after **")
+            self.i += 1
+            return base ** value
+        return base
+
+    def atom(self):
+        kind, value = self.peek()
+        if (kind, value) == ("op", "("):
+            self.i += 1
+            inner = self.binary(0)
+            self.expect(")")
+            return inner
+        if kind != "name":
+            self.fail("expected a set name")
+        self.i += 1
+        if value in _HEDGES and self.peek() == ("op", "("):
+            self.i += 1
+            inner = self.binary(0)
+            self.expect(")")
+            return _HEDGES[value](inner)
+        return self.resolve(value)
+
+    def resolve(self, name):
+        if name not in self.symbols:
+            self.fail(f"unknown name {name!r}")
+        obj = self.symbols[name]
+        path = name
+        while self.peek() == ("op", "."):
+            self.i += 1
+            kind, attr = self.peek()
+            if kind != "name":
+                self.fail("expected a name after '.'")
+            self.i += 1
+            path = f"{path}.{attr}"
+            if isinstance(obj, Domain):
+                if attr not in obj._sets:
+                    self.fail(f"domain {obj} has no set {attr!r}")
+                obj = obj._sets[attr]
+            elif isinstance(obj, dict) and attr in obj:
+                obj = obj[attr]
+            else:
+                self.fail(f"can't resolve {path!r}")
+        if not isinstance(obj, Set):
+            self.fail(f"{path!r} is not a fuzzy set")
+        return obj
+
+def parse_rule_table(table: str, references: dict) -> dict:
+    """
+    Parse a whitespace-separated rule table into {antecedent tuple: consequent}.
+
+    The first line labels the columns; each following line starts with one or
+    more row labels (more than one makes an N-D table) followed by one cell per
+    column. Labels and cells are set expressions such as temp.cold,
+    very(hum.wet), ~temp.hot or (a.x|a.y)&b.z; a cell of "-" has no rule.
+    Names resolve through references (and a domain's sets) only.
+    """
+    lines = [line.split() for line in table.splitlines() if line.strip()]
+    if len(lines) < 2:
+        raise FuzzyWarning("a rule table needs a header line and at least one row")
+    parsed = {}
+    def cell(text):
+        if text not in parsed:
+            parsed[text] = _CellParser(text, references).parse()
+        return parsed[text]
+    columns = [cell(text) for text in lines[0]]
+    conditions = {}
+    for row in lines[1:]:
+        labels = len(row) - len(columns)
+        if labels < 1:
+            raise FuzzyWarning(f"rule table row {' '.join(row)!r} has no row label")
+        antecedents = tuple(cell(text) for text in row[:labels])
+        for column, text in zip(columns, row[labels:]):
+            if text != "-":
+                conditions[antecedents + (column,)] = cell(text)
+    return conditions
+
+def _set_ids(reference):
+    """Identities of the sets a domain (or a dict of sets) holds, by name."""
+    sets = reference._sets if isinstance(reference, Domain) else reference if isinstance(reference, dict) else {}
+    return tuple(sorted((name, id(s)) for name, s in sets.items()))
+
+def rule_from_table(table: str, references: dict):
+    """
+    Turn a (2D or N-D) string table into a Rule of fuzzy sets, see parse_rule_table.
+    Compiled rules are cached by the table's hash, the referenced objects and
+    the sets they hold, so loading the same table again is a dictionary lookup
+    and assigning a new set to a referenced domain compiles the table afresh.
+    """
+    key = (hashlib.sha1(table.encode()).hexdigest(),
+           tuple(sorted((k, id(v), _set_ids(v)) for k, v in references.items())))
+    cached = _RULE_CACHE.get(key)
+    record_cache("fuzzy.rule_table", cached is not None)
+    if cached is not None:
+        _RULE_CACHE.move_to_end(key)
+        return cached[1]
+    rule = Rule(parse_rule_table(table, references))
+    _RULE_CACHE[key] = (dict(references), rule)  # holding the references keeps their ids unique
+    if len(_RULE_CACHE) > _RULE_CACHE_SIZE:
+        _RULE_CACHE.popitem(last=False)
+    return rule
+
+from automindx.fuzzy import parallel  # noqa: E402  fuzzy.parallel.evaluate_sets
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
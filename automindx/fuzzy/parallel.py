@@ -0,0 +1,85 @@
+# parallel.py (c) 2024 Gregory L. Magnusson MIT license
+# process-parallel evaluation of many fuzzy sets over one large domain
+# the domain grid is copied into multiprocessing.shared_memory once; sets travel to
+# the worker processes as picklable specs (fuzzy.function_spec), never as closures,
+# and each worker writes its rows straight into a shared (sets x points) output
+# matrix, so neither the grid nor the results are pickled between processes, and the
+# matrix is returned in place rather than copied out
+# usage:
+#   from automindx import fuzzy
+#   values = fuzzy.parallel.evaluate_sets(sets, domain, workers=8)
+
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from automindx.fuzzy import Expr, Set, _require_learn, from_spec, function_spec, np
+
+
+def evaluate_sets(sets, domain, workers=None, chunk=None):
+    """
+    Membership values of every set over the domain's grid.
+
+    Args:
+        sets: Sets or membership functions built from the fuzzy factories,
+            hedges and combinators (see fuzzy.function_spec).
+        domain: the Domain whose grid is evaluated.
+        workers: worker processes (default os.cpu_count()); 1 evaluates in
+            this process without shared memory.
+        chunk: sets per task (default: about four tasks per worker).
+
+    Returns:
+        ndarray: shape (len(sets), len(domain.range)); row i holds sets[i]. With
+        several workers it is the shared output matrix itself, not a copy: the
+        segment is unmapped once the array and every view of it are collected.
+    """
+    _require_learn()
+    sets = list(sets)
+    grid = np.asarray(domain.range, dtype=float)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(sets) <= 1:
+        out = np.empty((len(sets), len(grid)))
+        for i, s in enumerate(sets):
+            out[i] = (s.expr if isinstance(s, Set) else Expr.of(s))(grid)
+        return out
+    shared = {}  # subexpressions common to several sets become one spec, pickled once per task
+    specs = [function_spec(s, shared) for s in sets]  # unpicklable sets fail here, before any process starts
+    chunk = chunk or max(1, -(-len(specs) // (workers * 4)))
+    grid_memory = shared_memory.SharedMemory(create=True, size=grid.nbytes)
+    out_memory = shared_memory.SharedMemory(create=True, size=len(specs) * grid.nbytes)
+    try:
+        np.ndarray(grid.shape, dtype=float, buffer=grid_memory.buf)[:] = grid
+        with ProcessPoolExecutor(min(workers, -(-len(specs) // chunk))) as pool:
+            tasks = [pool.submit(_evaluate_rows, grid_memory.name, out_memory.name, len(grid),
+                                 len(specs), start, specs[start:start + chunk])
+                     for start in range(0, len(specs), chunk)]
+            for task in tasks:
+                task.result()
+    except BaseException:
+        out_memory.close()
+        out_memory.unlink()
+        raise
+    finally:
+        grid_memory.close()
+        grid_memory.unlink()
+    out_memory.unlink()  # the name goes now; the mapping lives until the result is collected
+    out = np.ndarray((len(specs), len(grid)), dtype=float, buffer=out_memory.buf)
+    weakref.finalize(out, out_memory.close).atexit = False  # views keep out (their base) alive
+    return out
+
+
+def _evaluate_rows(grid_name, out_name, points, rows, start, specs):
+    """Worker: rebuild each spec and write its values into rows start.. of the shared output."""
+    grid_memory = shared_memory.SharedMemory(name=grid_name)
+    out_memory = shared_memory.SharedMemory(name=out_name)
+    try:
+        grid = np.ndarray((points,), dtype=float, buffer=grid_memory.buf)
+        out = np.ndarray((rows, points), dtype=float, buffer=out_memory.buf)
+        built = {}  # specs shared within the task are rebuilt, and evaluated, once
+        for row, spec in enumerate(specs, start):
+            out[row] = Expr.of(from_spec(spec, built))(grid)
+        del grid, out  # release the exported buffers before closing
+    finally:
+        grid_memory.close()
+        out_memory.close()
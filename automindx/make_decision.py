@@ -2,32 +2,153 @@
 # from draw_conclusion boolean controls make_decision autonomous challenge of SocraticReasoning conclusion
 # decision orchestration on top of the canonical reasoning stack:
 #   LogicTables and SocraticReasoning from automind, THOT from automindx.reasoning
+# make_decision runs under a DecisionBudget (LLM calls, tokens, wall clock): the chatter is
+# metered for the call, validation verdicts are memoized per (premises hash, conclusion),
+# the loops stop once the conclusion stops changing, and the spend is saved with the decision
+import hashlib
 import logging
 import pathlib
+import time
 import ujson
+from collections import OrderedDict
 from datetime import datetime
 
 from automind.logic import LogicTables
+from automind.metrics import record_cache
 from automind.SocraticReasoning import SocraticReasoning
+from automind.tracing import tracer
 from automindx.reasoning import THOT
 from automindx.bdi import Belief, Desire, Intention, Goal, Reward  # Importing BDI classes
 from webmind.chatter import GPT4o, GroqModel, OllamaModel
 from webmind.api import APIManager
 
+UNDECIDED = "Unable to make a decision based on the current premises."
+
+
+class BudgetExhausted(Exception):
+    """Raised by the metered chatter once a DecisionBudget is spent."""
+
+
+class DecisionBudget:
+    """
+    What one make_decision may spend.
+
+    Args:
+        max_calls: LLM calls allowed (None: unlimited).
+        max_tokens: input plus output tokens allowed, from chatter.last_usage or estimated
+            at four characters per token when a chatter reports none (None: unlimited).
+        deadline: wall-clock seconds allowed (None: unlimited).
+    """
+    def __init__(self, max_calls=50, max_tokens=None, deadline=300.0):
+        self.max_calls = max_calls
+        self.max_tokens = max_tokens
+        self.deadline = deadline
+        self.start()
+
+    def start(self):
+        """Reset the spend for a new decision."""
+        self.calls = 0
+        self.tokens = 0
+        self.started = time.monotonic()
+        self.stop = None  # why the decision loop ended
+
+    def exhausted(self):
+        """The limit reached, or None while there is budget left."""
+        if self.max_calls is not None and self.calls >= self.max_calls:
+            return "max_calls"
+        if self.max_tokens is not None and self.tokens >= self.max_tokens:
+            return "max_tokens"
+        if self.deadline is not None and time.monotonic() - self.started >= self.deadline:
+            return "deadline"
+        return None
+
+    def charge(self, prompt, response, usage=None):
+        self.calls += 1
+        if usage:
+            self.tokens += (usage.get("input_tokens") or 0) + (usage.get("output_tokens") or 0)
+        else:
+            self.tokens += (len(prompt) + len(response)) // 4
+
+    def spent(self):
+        return {
+            "llm_calls": self.calls,
+            "tokens": self.tokens,
+            "seconds": round(time.monotonic() - self.started, 3),
+            "max_calls": self.max_calls,
+            "max_tokens": self.max_tokens,
+            "deadline": self.deadline,
+            "stop": self.stop,
+        }
+
+
+class _MeteredChatter:
+    """Charges each generate_response to a budget and refuses calls once it is spent."""
+    def __init__(self, chatter, budget):
+        self._chatter = chatter
+        self._budget = budget
+        self.refused = 0
+
+    def generate_response(self, knowledge):
+        reason = self._budget.exhausted()
+        if reason is not None:
+            self.refused += 1
+            self._budget.stop = reason
+            raise BudgetExhausted(reason)
+        self._chatter.last_usage = None
+        response = self._chatter.generate_response(knowledge)
+        self._budget.charge(knowledge, response, getattr(self._chatter, "last_usage", None))
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._chatter, name)
+
+
+def _same(a, b):
+    return a is not None and b is not None and " ".join(a.lower().split()) == " ".join(b.lower().split())
+
 
 # DecisionMaker extends the canonical SocraticReasoning with autonomous
 # decision making, additional-premise generation and decision logging
 class DecisionMaker(SocraticReasoning):
-    def __init__(self, chatter):
+    VERDICT_CACHE_SIZE = 1024
+
+    def __init__(self, chatter, budget=None):
         super().__init__(chatter)
         self.max_premises = 5  # Default maximum number of additional premises to generate
         self.limit_premises = False  # Toggle to cap additional premise generation
+        self.budget = budget if budget is not None else DecisionBudget()
+        self.verdicts = OrderedDict()  # (premises hash, conclusion) -> (valid, confidence)
+        self.validated_conclusion = None  # the last conclusion validated in this decision
         self.decisions_dir = './mindx/decisions'
         pathlib.Path(self.decisions_dir).mkdir(parents=True, exist_ok=True)
 
+    def validate_conclusion(self, retries=1):
+        """
+        SocraticReasoning.validate_conclusion, memoized per (premises, conclusion), so the
+        decision loop never asks the LLM twice about the same conclusion.
+        """
+        premises_hash = hashlib.blake2b("\n".join(self.premises).encode("utf-8"), digest_size=8).hexdigest()
+        key = (premises_hash, self.logical_conclusion)
+        cached = self.verdicts.get(key)
+        record_cache("decision.validation", cached is not None)
+        if cached is not None:
+            self.verdicts.move_to_end(key)
+            valid, self.last_confidence = cached
+        else:
+            refused = getattr(self.chatter, "refused", 0)
+            valid = super().validate_conclusion(retries)
+            if getattr(self.chatter, "refused", 0) == refused:  # a verdict, not a refused call
+                self.verdicts[key] = (valid, self.last_confidence)
+                if len(self.verdicts) > self.VERDICT_CACHE_SIZE:
+                    self.verdicts.popitem(last=False)
+        if valid:
+            self.validated_conclusion = self.logical_conclusion
+        return valid
+
     def generate_premises_and_conclusion(self, enable_additional_premises=True):
         current_premise = self.premises[0]
         additional_premises_count = 0
+        previous = None
         while enable_additional_premises and (not self.limit_premises or additional_premises_count < self.max_premises):
             new_premise = self.generate_new_premise(current_premise)
             if not self.parse_statement(new_premise):
@@ -45,19 +166,20 @@ class DecisionMaker(SocraticReasoning):
                 if inferred_fact and inferred_fact['relation'][0] == self.logical_conclusion:
                     self.socraticlogs(f"Inferred conclusion using modus ponens: {self.logical_conclusion}")
                     return self.logical_conclusion
-            if self.validate_conclusion():
+            if self.validate_conclusion() or self._converged(previous):
                 break
-            else:
-                self.log_not_premise('Invalid conclusion. Generating more premises.', level='error')
+            previous = conclusion
+            self.log_not_premise('Invalid conclusion. Generating more premises.', level='error')
         return self.logical_conclusion
 
-    def make_decision(self, enable_additional_premises=True, autonomous=True):
+    def make_decision(self, enable_additional_premises=True, autonomous=True, budget=None):
         """
         Make a decision based on the logical conclusion of reasoned facts from the truth tables.
 
         Args:
             enable_additional_premises (bool): Whether to enable the generation of additional premises.
             autonomous (bool): Whether the decision-making process should be autonomous.
+            budget (DecisionBudget): limits for this decision; defaults to self.budget.
 
         Returns:
             str: The decision derived from the logical reasoning process.
@@ -65,33 +187,22 @@ class DecisionMaker(SocraticReasoning):
         if not self.premises:
             return "No premises available to make a decision."
 
-        conclusion = self.generate_premises_and_conclusion(enable_additional_premises)
-
-        while True:
-            if self.validate_conclusion():
-                decision = self.logical_conclusion
-            else:
-                # Additional logic and reasoning methods if initial validation fails
-                additional_premises = self.generate_additional_premises(self.max_premises)
-                for premise in additional_premises:
-                    self.premises.append(premise)
-                    conclusion = self.generate_premises_and_conclusion(enable_additional_premises)
-                    if self.validate_conclusion():
-                        decision = self.logical_conclusion
-                        break
-                else:
-                    self.socraticlogs('Failed to validate the conclusion using existing and additional premises.', level='error')
-                    decision = "Unable to make a decision based on the current premises."
-
-            if autonomous:
-                # Autonomous challenge of decision
-                if not self.validate_conclusion():
-                    new_premise = self.generate_new_premise(self.logical_conclusion)
-                    self.add_premise(new_premise)
-                else:
-                    break
-            else:
-                break
+        budget = budget if budget is not None else self.budget
+        budget.start()
+        self.budget, saved_budget = budget, self.budget
+        self.chatter, chatter = _MeteredChatter(self.chatter, budget), self.chatter
+        self.validated_conclusion = None
+        with tracer.span("decision", autonomous=autonomous) as span:
+            try:
+                decision = self._decide(enable_additional_premises, autonomous)
+            except BudgetExhausted as e:
+                self.socraticlogs(f"Decision budget exhausted ({e}); deciding on what was validated.", level='error')
+                decision = self.validated_conclusion or UNDECIDED
+            finally:
+                self.chatter, self.budget = chatter, saved_budget
+            if budget.stop is None:
+                budget.stop = "unvalidated" if decision == UNDECIDED else "decided"
+            span.set(llm_calls=budget.calls, tokens=budget.tokens, stop=budget.stop)
 
         self.socraticlogs(f"Decision made: {decision}", level='info')
 
@@ -105,6 +216,7 @@ class DecisionMaker(SocraticReasoning):
             "variables": self.logic_tables.variables,
             "expressions": self.logic_tables.expressions,
             "valid_truths": self.logic_tables.valid_truths,
+            "budget": budget.spent(),
             "timestamp": timestamp
         }
         pathlib.Path(decision_file).parent.mkdir(parents=True, exist_ok=True)
@@ -113,6 +225,48 @@ class DecisionMaker(SocraticReasoning):
 
         return decision
 
+    def _converged(self, previous):
+        """True, with the budget marked, when the conclusion is the same as previous."""
+        if not _same(self.logical_conclusion, previous):
+            return False
+        self.socraticlogs(f"Conclusion converged without validating: {self.logical_conclusion}")
+        self.budget.stop = "converged"
+        return True
+
+    def _decide(self, enable_additional_premises, autonomous):
+        self.generate_premises_and_conclusion(enable_additional_premises)
+        previous = None
+        while True:
+            decision = None
+            if self.validate_conclusion():
+                decision = self.logical_conclusion
+                self.budget.stop = None  # decided, even if an earlier round converged
+            else:
+                # Additional logic and reasoning methods if initial validation fails
+                additional_premises = self.generate_additional_premises(self.max_premises)
+                for premise in additional_premises:
+                    before = self.logical_conclusion
+                    self.premises.append(premise)
+                    self.generate_premises_and_conclusion(enable_additional_premises)
+                    if self.validate_conclusion():
+                        decision = self.logical_conclusion
+                        self.budget.stop = None
+                        break
+                    if self._converged(before):
+                        break
+                if decision is None:
+                    self.socraticlogs('Failed to validate the conclusion using existing and additional premises.', level='error')
+                    decision = UNDECIDED
+
+            # Autonomous challenge of decision until it validates or stops changing
+            if not autonomous or self.budget.stop == "converged" or self.validate_conclusion():
+                return decision
+            if self._converged(previous):
+                return decision
+            previous = self.logical_conclusion
+            new_premise = self.generate_new_premise(self.logical_conclusion)
+            self.add_premise(new_premise)
+
     def generate_additional_premises(self, max_premises):
         """
         Generate additional premises based on existing premises and reasoning methods.
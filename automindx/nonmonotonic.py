@@ -1,3 +1,13 @@
+# nonmonotonic.py (c) 2024 Gregory L. Magnusson MIT license
+# default logic: rules (conditions -> conclusions) and defaults, whose conclusions are
+# believed unless one of the default's blocking conditions is a fact
+# DefaultLogic keeps its fixpoint and extends it by counter-based forward chaining: each
+# rule counts its conditions not yet believed, an index maps every atom to the rules
+# waiting on it, and a new belief only touches those rules. Queries are set lookups;
+# only a fact that blocks a default which already fired forces a rebuild
+
+from collections import defaultdict
+
 class Rule:
     def __init__(self, conditions, conclusions):
         if not isinstance(conditions, set) or not isinstance(conclusions, set):
@@ -21,9 +31,20 @@ class Default:
 
 
 class DefaultLogic:
+    """
+    Rules, defaults and facts with an incrementally maintained fixpoint.
+
+    The beliefs are the facts, the conclusions of every default none of whose
+    conditions is a fact, and everything the rules derive from those.
+    """
     def __init__(self):
         self.rules = []
         self.defaults = []
+        self.facts = set()
+        self._watchers = defaultdict(list)  # atom: indices of the rules with it as a condition
+        self._blocked_by = defaultdict(list)  # atom: defaults it blocks
+        self._missing = []  # rule index: conditions not yet believed
+        self._beliefs = None  # the cached fixpoint, None when it must be rebuilt
 
     def add_rule(self, rule):
         """
@@ -31,7 +52,15 @@ class DefaultLogic:
         """
         if not isinstance(rule, Rule):
             raise ValueError("Rule must be an instance of Rule.")
+        index = len(self.rules)
         self.rules.append(rule)
+        for atom in rule.conditions:
+            self._watchers[atom].append(index)
+        if self._beliefs is not None:
+            missing = sum(1 for atom in rule.conditions if atom not in self._beliefs)
+            self._missing.append(missing)
+            if not missing:
+                self._propagate(rule.conclusions)
 
     def add_default(self, default):
         """
@@ -40,33 +69,71 @@ class DefaultLogic:
         if not isinstance(default, Default):
             raise ValueError("Default must be an instance of Default.")
         self.defaults.append(default)
+        for atom in default.conditions:
+            self._blocked_by[atom].append(default)
+        if self._beliefs is not None and default.applies(self.facts):
+            self._propagate(default.conclusions)
+
+    def add_fact(self, fact):
+        """
+        Add a fact to the beliefs.
+        """
+        if fact in self.facts:
+            return
+        # a default that fired so far stops firing: beliefs derived from it may go
+        retracts = any(d.applies(self.facts) for d in self._blocked_by.get(fact, ()))
+        self.facts.add(fact)
+        if retracts:
+            self._beliefs = None
+        elif self._beliefs is not None:
+            self._propagate((fact,))
+
+    def add_facts(self, facts):
+        """
+        Add several facts to the beliefs.
+        """
+        for fact in facts:
+            self.add_fact(fact)
+
+    def _rebuild(self):
+        self._beliefs = set()
+        self._missing = [len(rule.conditions) for rule in self.rules]
+        agenda = list(self.facts)
+        for default in self.defaults:
+            if default.applies(self.facts):
+                agenda.extend(default.conclusions)
+        for rule in self.rules:
+            if not rule.conditions:
+                agenda.extend(rule.conclusions)
+        self._propagate(agenda)
+
+    def _propagate(self, agenda):
+        """Believe the agenda's atoms and fire every rule whose last condition they satisfy."""
+        agenda = list(agenda)
+        beliefs, missing, rules, watchers = self._beliefs, self._missing, self.rules, self._watchers
+        while agenda:
+            atom = agenda.pop()
+            if atom in beliefs:
+                continue
+            beliefs.add(atom)
+            for index in watchers.get(atom, ()):
+                missing[index] -= 1
+                if not missing[index]:
+                    agenda.extend(rules[index].conclusions)
+
+    def beliefs(self):
+        """
+        The fixpoint: every belief of the current theory (do not modify it).
+        """
+        if self._beliefs is None:
+            self._rebuild()
+        return self._beliefs
 
     def evaluate(self, query):
         """
         Evaluate a query using Default Logic.
         """
-        beliefs = set()
-        new_beliefs = set()
-
-        while True:
-            new_beliefs.clear()
-
-            # Apply rules to expand beliefs
-            for rule in self.rules:
-                if rule.applies(beliefs):
-                    new_beliefs.update(rule.conclusions)
-
-            # Apply defaults to fill gaps
-            for default in self.defaults:
-                if default.applies(beliefs):
-                    new_beliefs.update(default.conclusions)
-
-            if new_beliefs.issubset(beliefs):
-                break
-
-            beliefs.update(new_beliefs)
-
-        return query in beliefs
+        return query in self.beliefs()
 
 
 if __name__ == "__main__":
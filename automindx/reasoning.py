@@ -1,11 +1,20 @@
 # reasoning.py (c) Gregory L. Magnusson
 # a philosphical disertation in python
+# THOT runs the reasoning styles as a tapestry: with a chatter each style is an LLMReasoner
+# making its own LLM call with a style-specific prompt, and the calls run concurrently in a
+# bounded pool with a per-style timeout, so a full tapestry costs about one round trip;
+# think_stream yields each result as it lands and stops early once a quorum of styles agree
+# thoughts go to the rotated, indexed ./mindx/thots/ log (memory.thotlog) without blocking
 
-import json
 import logging
-import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 from automind.SocraticReasoning import SocraticReasoning
+from automind.confidence import premise_agreement
+from automind.tracing import tracer
+from memory.thotlog import LEGACY_LOG, ThotLog
 
 class Proposition:
     def __init__(self, statement):
@@ -262,10 +271,95 @@ if __name__ == "__main__":
     # Logical conclusion
     print(reasoning.logical_conclusion())
 
+# what each style asks of the LLM
+STYLE_PROMPTS = {
+    "deductive": "Draw the specific conclusion that necessarily follows from the general premises.",
+    "inductive": "Generalize from the specific observations to the broadest conclusion they support.",
+    "abductive": "Infer the most likely explanation for what the premises describe.",
+    "analogical": "Reason from the similarities between the cases the premises describe.",
+    "case_based": "Treat the premises as a new case and solve it from similar past cases.",
+    "nonmonotonic": "Draw a tentative conclusion and say what new information would retract it.",
+    "formal": "Derive the conclusion with explicit rules of formal logic.",
+    "informal": "Reach the conclusion with everyday language and common sense.",
+    "probabilistic": "Conclude with an estimate of how likely the conclusion is.",
+    "heuristic": "Reach a quick conclusion with rules of thumb.",
+    "causal": "Identify the causes and effects behind the premises.",
+    "counterfactual": "Consider what would follow if the premises were otherwise, then conclude.",
+    "fuzzy": "Conclude in degrees of truth rather than true or false.",
+    "modal": "Conclude what is possible and what is necessary given the premises.",
+    "deontic": "Conclude what is obligatory, permitted or forbidden given the premises.",
+}
+
+
+class LLMReasoner:
+    """
+    A reasoning style answered by its own LLM call.
+
+    Args:
+        chatter: any chatter with generate_response(prompt); calls run concurrently.
+        style: the style name, e.g. "causal".
+        instruction: what the style asks of the premises (STYLE_PROMPTS by default).
+    """
+    concurrent = True  # THOT runs these in its pool; template reasoners run inline
+
+    def __init__(self, chatter, style, instruction=None):
+        self.chatter = chatter
+        self.style = style
+        self.instruction = instruction or STYLE_PROMPTS[style]
+
+    def prompt(self, p, q=None):
+        # p may be a list, as THOT passes the inductive and nonmonotonic styles
+        premises = (list(p) if isinstance(p, list) else [p]) + ([] if q is None else [q])
+        premises = "\n".join(dict.fromkeys(str(premise) for premise in premises))
+        heading = self.style.replace("_", "-").capitalize()
+        return (f"{heading} reasoning. {self.instruction}\n"
+                f"Premises:\n{premises}\n"
+                "Answer in at most three sentences, ending with one line that starts with 'Conclusion:'.")
+
+    def reason(self, p, q=None):
+        return self.chatter.generate_response(self.prompt(p, q)).strip()
+
+
+def conclusion_of(result):
+    """The 'Conclusion:' line of a reasoning result, or its last line."""
+    lines = [line.strip() for line in str(result).splitlines() if line.strip()]
+    for line in reversed(lines):
+        if line.lower().startswith("conclusion:"):
+            return line[len("conclusion:"):].strip()
+    return lines[-1] if lines else ""
+
+
+def agree(a, b, threshold=0.6):
+    """True when two conclusions keep at least threshold of each other's content words."""
+    return min(premise_agreement(a, [b]), premise_agreement(b, [a])) >= threshold
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _style_pool():
+    """The process-wide pool LLM styles run in, so threads are reused across THOT calls."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=THOT.MAX_WORKERS, thread_name_prefix="thot-style")
+        return _pool
+
+
 class THOT:
     """
     Tapestry of thought. THOT dispatches an input across the reasoning styles
     defined above and gathers each perspective into a single tapestry of results.
+
+    Args:
+        chatter: LLM chatter; when given, every style is an LLMReasoner.
+        reasoners: {style name: reasoner} overriding the default styles.
+        workers: LLM calls one think keeps in flight (one per style, at most 16, by default);
+            every THOT shares one pool of MAX_WORKERS threads.
+        timeout: seconds from submitting a style until its result is given up on.
+        quorum: stop once this many styles reach agreeing conclusions (None: wait for all).
+        agreement: content word overlap for two conclusions to agree.
     """
 
     # reasoning-style classes defined above, keyed by style name
@@ -286,75 +380,158 @@ class THOT:
         "modal": ModalReasoning,
         "deontic": DeonticReasoning,
     }
+    MAX_WORKERS = 16
 
-    def __init__(self, chatter=None, reasoners=None):
+    def __init__(self, chatter=None, reasoners=None, workers=None, timeout=60.0, quorum=None, agreement=0.6):
         self.chatter = chatter
-        self.reasoners = dict(reasoners) if reasoners is not None else dict(self.STYLES)
+        if reasoners is not None:
+            self.reasoners = dict(reasoners)
+        elif chatter is not None:
+            self.reasoners = {name: LLMReasoner(chatter, name) for name in self.STYLES}
+        else:
+            self.reasoners = dict(self.STYLES)
+        self.workers = workers
+        self.timeout = timeout
+        self.quorum = quorum
+        self.agreement = agreement
+        self.consensus = []  # styles that agreed in the last finished think, when a quorum was reached
         # SocraticReasoning refinement is available only when a chatter is supplied
         self.socratic_reasoner = SocraticReasoning(self.chatter) if self.chatter is not None else None
-        self.thot_log_path = './mindx/thots.json'
-        self.initialize_thot_log()
-
-    def initialize_thot_log(self):
-        if not os.path.exists('./mindx'):
-            os.makedirs('./mindx')
-        if not os.path.exists(self.thot_log_path):
-            with open(self.thot_log_path, 'w') as file:
-                json.dump([], file)
+        self.thot_log = ThotLog.shared(legacy=LEGACY_LOG)  # nothing touches the disk until the first thought
 
     def log_thot(self, thot_data):
-        with open(self.thot_log_path, 'r') as file:
-            thots = json.load(file)
-        thots.append(thot_data)
-        with open(self.thot_log_path, 'w') as file:
-            json.dump(thots, file, indent=4)
+        """Queue thot_data for the rotated thots log; returns without waiting for the disk."""
+        self.thot_log.log(thot_data)
 
-    def think(self, input_text, styles=None):
+    @staticmethod
+    def _apply(name, reasoner, p, q):
+        try:
+            with tracer.span("thot.style", style=name):
+                if name == "inductive":
+                    return reasoner.reason([p] if p is q else [p, q])
+                if name == "nonmonotonic":
+                    return reasoner.reason([p], q)
+                return reasoner.reason(p, q)
+        except Exception as e:
+            logging.error(f"Error in {name} reasoning: {e}")
+            return f"Error: {e}"
+
+    def _dispatch(self, names, p, q, quorum=None, consensus=None):
+        """
+        Run the named styles on (p, q): template reasoners inline, LLM reasoners in the
+        shared pool, at most workers at a time. Yields (name, result) as results land,
+        stopping early at a quorum, whose agreeing styles are added to consensus.
+        """
+        concluded = []  # (name, conclusion) of the successful results so far
+
+        def settle(name, result):
+            if quorum is None or str(result).startswith("Error:"):
+                return False
+            conclusion = conclusion_of(result)
+            agreeing = [other for other, seen in concluded if agree(conclusion, seen, self.agreement)]
+            concluded.append((name, conclusion))
+            if len(agreeing) + 1 >= quorum:
+                if consensus is not None:
+                    consensus.extend(agreeing + [name])
+                return True
+            return False
+
+        pooled = [name for name in names if getattr(self.reasoners[name], "concurrent", False)]
+        for name in names:
+            if name not in pooled:
+                result = self._apply(name, self.reasoners[name], p, q)
+                yield name, result
+                if settle(name, result):
+                    return
+        if not pooled:
+            return
+        workers = min(self.workers or len(pooled), self.MAX_WORKERS)
+        executor = _style_pool()
+        queued = list(reversed(pooled))
+        futures = {}
+        deadlines = {}  # future: when it is given up on, counted from submission
+        pending = set()
+        try:
+            while pending or queued:
+                while queued and len(pending) < workers:
+                    name = queued.pop()
+                    future = executor.submit(self._apply, name, self.reasoners[name], p, q)
+                    futures[future] = name
+                    deadlines[future] = time.monotonic() + self.timeout
+                    pending.add(future)
+                remaining = max(min(deadlines[f] for f in pending) - time.monotonic(), 0)
+                done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: pooled.index(futures[f])):
+                    name = futures[future]
+                    result = future.result()
+                    yield name, result
+                    if settle(name, result):
+                        return
+                now = time.monotonic()
+                for future in [f for f in pending if deadlines[f] <= now]:
+                    pending.discard(future)
+                    future.cancel()  # still queued behind stragglers: never runs
+                    logging.warning(f"{futures[future]} reasoning timed out after {self.timeout}s")
+                    yield futures[future], f"Error: timed out after {self.timeout}s"
+        finally:
+            for future in pending:
+                future.cancel()  # running stragglers finish in the background
+
+    def _select(self, styles):
+        selected = []
+        for name in styles if styles is not None else list(self.reasoners):
+            if name in self.reasoners:
+                selected.append(name)
+            else:
+                logging.warning(f"Unknown reasoning style: {name}")
+        return selected
+
+    def think_stream(self, input_text, styles=None, quorum=None, consensus=None):
         """
-        Dispatch input_text across the selected reasoning styles.
+        Dispatch input_text across the selected reasoning styles, yielding each result
+        as soon as it is ready.
 
         Args:
             input_text: the statement to reason about.
             styles: optional list of style names; defaults to every reasoner.
+            quorum: agreeing styles to stop at; defaults to the THOT quorum.
+            consensus: optional list the agreeing styles are added to when the quorum is reached.
 
-        Returns:
-            dict: {style_name: result} for each reasoning style applied.
+        Yields:
+            tuple: (style_name, result) in completion order.
         """
         proposition = Proposition(input_text)
-        selected = styles if styles is not None else list(self.reasoners)
-        results = {}
-        for name in selected:
-            reasoner = self.reasoners.get(name)
-            if reasoner is None:
-                logging.warning(f"Unknown reasoning style: {name}")
-                continue
-            try:
-                if name == "inductive":
-                    results[name] = reasoner.reason([proposition])
-                elif name == "nonmonotonic":
-                    results[name] = reasoner.reason([proposition], proposition)
-                else:
-                    results[name] = reasoner.reason(proposition, proposition)
-            except Exception as e:
-                logging.error(f"Error in {name} reasoning: {e}")
-                results[name] = f"Error: {e}"
-        self.log_thot({"input": input_text, "results": results})
+        quorum = self.quorum if quorum is None else quorum
+        yield from self._dispatch(self._select(styles), proposition, proposition, quorum, consensus)
+
+    def think(self, input_text, styles=None, quorum=None):
+        """
+        Dispatch input_text across the selected reasoning styles.
+
+        Args:
+            input_text: the statement to reason about.
+            styles: optional list of style names; defaults to every reasoner.
+            quorum: agreeing styles to stop at; defaults to the THOT quorum.
+
+        Returns:
+            dict: {style_name: result} for each reasoning style applied, in style order.
+        """
+        selected = self._select(styles)
+        consensus = []
+        with tracer.span("thot.think", styles=len(selected)):
+            landed = dict(self.think_stream(input_text, selected, quorum, consensus))
+        results = {name: landed[name] for name in selected if name in landed}
+        self.consensus = consensus
+        entry = {"input": input_text, "results": results}
+        if consensus:
+            entry["consensus"] = consensus
+        self.log_thot(entry)
         return results
 
     def combine_results(self, proposition_p, proposition_q):
-        combined_results = []
-        for name, reasoner in self.reasoners.items():
-            try:
-                if name == "inductive":
-                    result = reasoner.reason([proposition_p, proposition_q])
-                elif name == "nonmonotonic":
-                    result = reasoner.reason([proposition_p], proposition_q)
-                else:
-                    result = reasoner.reason(proposition_p, proposition_q)
-                combined_results.append(result)
-            except Exception as e:
-                logging.error(f"Error in {name} reasoning: {e}")
-        return combined_results
+        names = list(self.reasoners)
+        landed = dict(self._dispatch(names, proposition_p, proposition_q))
+        return [landed[name] for name in names if not str(landed[name]).startswith("Error:")]
 
     def make_decision(self, combined_results):
         if self.chatter is None:
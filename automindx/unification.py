@@ -0,0 +1,473 @@
+# unification.py (c) 2024 Gregory L. Magnusson MIT license
+# first-order terms, an iterative occurs-checked unifier and a discrimination-tree fact index
+# terms:
+#   variable   a Var; variables are compared by identity, so two parses never share one
+#   constant   an interned string (atom) or a number
+#   compound   a tuple (functor, arg, ...) whose functor is an interned string
+# unify() works on an explicit stack over a union-find of variables (Bindings) with a
+# trail, so deep terms never hit the recursion limit and a failed unification undoes
+# its own bindings instead of leaving a half-updated substitution behind
+# FactIndex files stored terms in a discrimination tree keyed by their preorder
+# symbols; candidates(query) walks only the branches that could unify with the query
+# usage:
+#   index = FactIndex()
+#   index.add(parse("likes(socrates, wisdom)"))
+#   for fact, bindings in index.unifiable(parse("likes(socrates, X)")): ...
+
+import re
+import sys
+
+__all__ = ["Var", "Bindings", "FactIndex", "compound", "parse", "from_list", "to_list",
+           "format_term", "rename", "unify"]
+
+LIST = "[]"  # functor of the bracketed lists used by the legacy list expressions
+
+
+class Var:
+    """A logic variable; the name is only for display."""
+    __slots__ = ("name",)
+
+    def __init__(self, name="_"):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+def compound(functor, *args):
+    """The compound term functor(args...) with an interned functor."""
+    return (sys.intern(functor),) + args
+
+
+_TOKEN = re.compile(r"\s*(?:(-?\d+\.\d+)|(-?\d+)|([A-Za-z_][A-Za-z0-9_]*)|'((?:[^'\\]|\\.)*)'|(.))")
+
+
+def parse(text, variables=None):
+    """
+    Parse a Prolog-style term: f(X, g(a, 1), [b, Y]).
+
+    Names starting with an uppercase letter or _ are variables, other names
+    atoms, '...' quoted atoms. The same name is the same Var within one parse
+    (or across parses sharing the variables dict); _ is always a fresh one.
+
+    Returns:
+        the term.
+
+    Raises:
+        ValueError: on malformed input.
+    """
+    variables = {} if variables is None else variables
+    tokens = []
+    for match in _TOKEN.finditer(text):
+        real, integer, name, quoted, symbol = match.groups()
+        if real is not None:
+            tokens.append(("const", float(real)))
+        elif integer is not None:
+            tokens.append(("const", int(integer)))
+        elif name is not None:
+            tokens.append(("name", name))
+        elif quoted is not None:
+            tokens.append(("const", sys.intern(quoted.replace("\\'", "'"))))
+        elif not symbol.isspace():
+            tokens.append(("symbol", symbol))
+    stack = [[None, None, []]]  # open compounds: [functor, closing symbol, args]
+    expect_term = True
+    i = 0
+    while i < len(tokens):
+        kind, value = tokens[i]
+        if expect_term:
+            if kind == "symbol" and value == "[":
+                stack.append([LIST, "]", []])
+                if i + 1 < len(tokens) and tokens[i + 1] == ("symbol", "]"):
+                    i += 1
+                    stack.pop()
+                    stack[-1][2].append((LIST,))
+                    expect_term = False
+                i += 1
+                continue
+            if kind == "symbol":
+                raise ValueError(f"unexpected {value!r} in {text!r}")
+            if kind == "name" and i + 1 < len(tokens) and tokens[i + 1] == ("symbol", "("):
+                stack.append([sys.intern(value), ")", []])
+                i += 2
+                continue
+            if kind == "name":
+                if value[0].isupper() or value[0] == "_":
+                    if value == "_":
+                        term = Var("_")
+                    else:
+                        term = variables.get(value)
+                        if term is None:
+                            term = variables[value] = Var(value)
+                else:
+                    term = sys.intern(value)
+            else:
+                term = value
+            stack[-1][2].append(term)
+            expect_term = False
+        elif kind == "symbol" and value == "," and len(stack) > 1:
+            expect_term = True
+        elif kind == "symbol" and value == stack[-1][1]:
+            functor, _, args = stack.pop()
+            stack[-1][2].append((functor,) + tuple(args))
+        else:
+            raise ValueError(f"unexpected {value!r} in {text!r}")
+        i += 1
+    if len(stack) > 1 or expect_term or len(stack[0][2]) != 1:
+        raise ValueError(f"incomplete term {text!r}")
+    return stack[0][2][0]
+
+
+def from_list(expression, variables=None, is_variable=str.islower):
+    """
+    Convert a legacy nested-list expression (['f', 'x', ['g', 'y']]) to a term:
+    lists become LIST compounds, strings passing is_variable become Vars
+    (shared through the variables dict) and other strings interned atoms.
+    """
+    variables = {} if variables is None else variables
+    built = []
+    stack = [(expression, False)]
+    while stack:
+        item, done = stack.pop()
+        if done:
+            args = tuple(built[len(built) - len(item):])
+            del built[len(built) - len(item):]
+            built.append((LIST,) + args)
+        elif isinstance(item, list):
+            stack.append((item, True))
+            stack.extend((x, False) for x in reversed(item))
+        elif isinstance(item, str) and is_variable(item):
+            term = variables.get(item)
+            if term is None:
+                term = variables[item] = Var(item)
+            built.append(term)
+        else:
+            built.append(sys.intern(item) if isinstance(item, str) else item)
+    return built[0]
+
+
+def _fold(term, leaf, build, step=None):
+    """
+    Rebuild term bottom-up without recursion: leaf(item) for every
+    non-compound, build(functor, [built args]) for every compound, after
+    step(item) (when given) replaced each subterm.
+    """
+    built = []
+    stack = [(term, False)]
+    while stack:
+        item, done = stack.pop()
+        if done:
+            arity = len(item) - 1
+            args = built[len(built) - arity:] if arity else []
+            if arity:
+                del built[-arity:]
+            built.append(build(item[0], args))
+            continue
+        if step is not None:
+            item = step(item)
+        if type(item) is tuple:
+            stack.append((item, True))
+            stack.extend((arg, False) for arg in reversed(item[1:]))
+        else:
+            built.append(leaf(item))
+    return built[0]
+
+
+def _same(item):
+    return item
+
+
+def _compound(functor, args):
+    return (functor,) + tuple(args)
+
+
+def to_list(term):
+    """A term back in the legacy nested-list form: compounds as lists, variables by name."""
+    return _fold(term, lambda item: item.name if type(item) is Var else item,
+                 lambda functor, args: args if functor == LIST else [functor] + args)
+
+
+def rename(term):
+    """A copy of term with fresh variables (standardizing a stored clause apart)."""
+    fresh = {}
+
+    def leaf(item):
+        if type(item) is Var:
+            if item not in fresh:
+                fresh[item] = Var(item.name)
+            return fresh[item]
+        return item
+    return _fold(term, leaf, _compound)
+
+
+def format_term(term):
+    """Prolog-style text for a term: f(X, [a, b])."""
+    out = []
+    stack = [(False, term)]  # (is literal text, item)
+    while stack:
+        text, item = stack.pop()
+        if text:
+            out.append(item)
+        elif type(item) is tuple:
+            functor, args = item[0], item[1:]
+            if functor == LIST:
+                opening, closing = "[", "]"
+            elif args:
+                opening, closing = functor + "(", ")"
+            else:
+                out.append(functor)
+                continue
+            out.append(opening)
+            stack.append((True, closing))
+            for k in range(len(args) - 1, -1, -1):
+                stack.append((False, args[k]))
+                if k:
+                    stack.append((True, ", "))
+        elif type(item) is Var:
+            out.append(item.name)
+        elif type(item) is str and not (item[:1].islower() and item.isidentifier()):
+            out.append("'" + item.replace("'", "\\'") + "'")
+        else:
+            out.append(str(item))
+    return "".join(out)
+
+
+_MISSING = object()
+
+
+class Bindings:
+    """
+    A substitution as a union-find over variables.
+
+    Each variable links to another variable of its class or, at the root, to
+    the term the class is bound to. Union by rank keeps the chains short, and
+    every change is trailed so undo(mark) restores an earlier state.
+    """
+    __slots__ = ("_ref", "_rank", "_trail")
+
+    def __init__(self):
+        self._ref = {}  # Var: Var or term
+        self._rank = {}
+        self._trail = []
+
+    def _set(self, table, key, value):
+        self._trail.append((table, key, table.get(key, _MISSING)))
+        table[key] = value
+
+    def mark(self):
+        """A point to undo back to."""
+        return len(self._trail)
+
+    def undo(self, mark):
+        """Forget every binding made since mark."""
+        trail = self._trail
+        while len(trail) > mark:
+            table, key, old = trail.pop()
+            if old is _MISSING:
+                del table[key]
+            else:
+                table[key] = old
+
+    def find(self, term):
+        """The representative of term: its class's bound term, or its root variable."""
+        ref = self._ref
+        while type(term) is Var:
+            bound = ref.get(term)
+            if bound is None:
+                return term
+            term = bound
+        return term
+
+    def bind(self, var, term):
+        """Bind the root variable var to a non-variable term."""
+        self._set(self._ref, var, term)
+
+    def union(self, a, b):
+        """Merge the classes of root variables a and b (a joins b on equal rank)."""
+        rank_a, rank_b = self._rank.get(a, 0), self._rank.get(b, 0)
+        if rank_a > rank_b:
+            a, b = b, a
+        self._set(self._ref, a, b)
+        if rank_a == rank_b:
+            self._set(self._rank, b, rank_b + 1)
+
+    def occurs(self, var, term):
+        """True when the root variable var appears in term under these bindings."""
+        seen = set()
+        stack = [term]
+        while stack:
+            item = self.find(stack.pop())
+            if item is var:
+                return True
+            if type(item) is tuple and id(item) not in seen:
+                seen.add(id(item))
+                stack.extend(item[1:])
+        return False
+
+    def resolve(self, term):
+        """term with every bound variable replaced by its value."""
+        return _fold(term, _same, _compound, self.find)
+
+    def as_dict(self):
+        """{Var: resolved value} for every variable bound to something other than itself."""
+        return {var: self.resolve(var) for var in self._ref}
+
+    def __repr__(self):
+        return "{" + ", ".join(f"{v.name}: {format_term(t)}" for v, t in self.as_dict().items()) + "}"
+
+
+def unify(a, b, bindings=None, occurs_check=True):
+    """
+    Unify two terms.
+
+    Args:
+        a, b: terms.
+        bindings: Bindings to extend (default: new ones).
+        occurs_check: refuse to bind a variable to a term containing it.
+
+    Returns:
+        Bindings: the extended bindings, or None when the terms don't unify
+        (bindings passed in are then left as they were).
+    """
+    bindings = Bindings() if bindings is None else bindings
+    mark = bindings.mark()
+    find = bindings.find
+    stack = [(a, b)]
+    while stack:
+        x, y = stack.pop()
+        x, y = find(x), find(y)
+        if x is y:
+            continue
+        if type(x) is Var:
+            if type(y) is Var:
+                bindings.union(x, y)
+                continue
+            if occurs_check and type(y) is tuple and bindings.occurs(x, y):
+                break
+            bindings.bind(x, y)
+        elif type(y) is Var:
+            if occurs_check and type(x) is tuple and bindings.occurs(y, x):
+                break
+            bindings.bind(y, x)
+        elif type(x) is tuple and type(y) is tuple:
+            if len(x) != len(y) or x[0] != y[0]:
+                break
+            stack.extend(zip(reversed(x[1:]), reversed(y[1:])))
+        elif type(x) is tuple or type(y) is tuple or x != y:
+            break
+    else:
+        return bindings
+    bindings.undo(mark)
+    return None
+
+
+_VARIABLE = object()  # discrimination-tree symbol of a variable
+_FACTS = object()  # key of the facts stored at a leaf
+
+
+def _symbols(term):
+    """Preorder symbols of term and, per position, the position after its subterm."""
+    symbols = []
+    stack = [term]
+    while stack:
+        item = stack.pop()
+        if type(item) is tuple:
+            symbols.append((item[0], len(item) - 1))
+            stack.extend(reversed(item[1:]))
+        else:
+            symbols.append(_VARIABLE if type(item) is Var else item)
+    ends = [0] * len(symbols)
+    for position in range(len(symbols) - 1, -1, -1):  # later subterms are measured first
+        end = position + 1
+        if type(symbols[position]) is tuple:
+            for _ in range(symbols[position][1]):
+                end = ends[end]
+        ends[position] = end
+    return symbols, ends
+
+
+class FactIndex:
+    """
+    Stored terms in a discrimination tree: a trie over each term's preorder
+    symbols (functor/arity, constant, or * for any variable).
+
+    candidates(query) follows the query's symbols down the trie; a variable
+    in the query skips one whole stored subterm and a stored variable skips
+    one whole query subterm, so only facts that may unify are reached. The
+    tree ignores repeated variables, so unifiable() still unifies each
+    candidate.
+    """
+    def __init__(self):
+        self._root = {}
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, fact):
+        """Store a term."""
+        node = self._root
+        for symbol in _symbols(fact)[0]:
+            node = node.setdefault(symbol, {})
+        node.setdefault(_FACTS, []).append(fact)
+        self._size += 1
+
+    def remove(self, fact):
+        """Remove a stored term; ValueError when it isn't stored."""
+        path, node = [], self._root
+        for symbol in _symbols(fact)[0]:
+            if symbol not in node:
+                raise ValueError("fact not in index")
+            path.append((node, symbol))
+            node = node[symbol]
+        facts = node.get(_FACTS)
+        if not facts:
+            raise ValueError("fact not in index")
+        facts.remove(fact)
+        self._size -= 1
+        if not facts:
+            del node[_FACTS]
+            for parent, symbol in reversed(path):  # prune the emptied branch
+                if parent[symbol]:
+                    break
+                del parent[symbol]
+
+    def candidates(self, query):
+        """Stored terms that may unify with query (a superset of the unifiable ones)."""
+        symbols, ends = _symbols(query)
+        size = len(symbols)
+        stack = [(self._root, 0, 0)]  # node, query position, stored subterms still to skip
+        while stack:
+            node, i, skip = stack.pop()
+            if skip:
+                for symbol, child in node.items():
+                    if symbol is not _FACTS:
+                        arity = symbol[1] if type(symbol) is tuple else 0
+                        stack.append((child, i, skip - 1 + arity))
+                continue
+            if i == size:
+                yield from node.get(_FACTS, ())
+                continue
+            symbol = symbols[i]
+            if symbol is _VARIABLE:
+                stack.append((node, i + 1, 1))
+                continue
+            child = node.get(symbol)
+            if child is not None:
+                stack.append((child, i + 1, 0))
+            child = node.get(_VARIABLE)
+            if child is not None:
+                stack.append((child, ends[i], 0))
+
+    def unifiable(self, query, occurs_check=True):
+        """
+        Stored terms unifying with query.
+
+        Yields:
+            (fact, Bindings) pairs; stored terms should not share variables
+            with the query (see rename).
+        """
+        for fact in self.candidates(query):
+            bindings = unify(query, fact, occurs_check=occurs_check)
+            if bindings is not None:
+                yield fact, bindings
@@ -0,0 +1,8 @@
+# benchmarks (c) 2024 Gregory L. Magnusson MIT license
+# offline performance suite for the reasoning stack: no API keys, no network
+#   python -m benchmarks run --out results/base.json
+#   python -m benchmarks compare results/base.json results/new.json
+# LLM latency is injected by a deterministic FakeChatter so runs are comparable
+from benchmarks.fake_chatter import FakeChatter
+from benchmarks.suite import BENCHMARKS, run_suite, write_results
+from benchmarks.compare import compare, load_results
@@ -0,0 +1,70 @@
+# __main__.py (c) 2024 Gregory L. Magnusson MIT license
+# python -m benchmarks run [--filter NAME] [--quick] [--repeat N] [--out FILE]
+# python -m benchmarks compare BASELINE CANDIDATE [--threshold 0.10]
+# compare exits 1 when any case regressed, so it can gate CI
+import argparse
+import sys
+
+from benchmarks.compare import compare, format_comparison, load_results
+from benchmarks.suite import BENCHMARKS, run_suite, write_results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="ezAGI offline benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the suite and write JSON results")
+    run.add_argument("--filter", action="append", help="only benchmarks whose name contains this")
+    run.add_argument("--quick", action="store_true", help="first parameter set of each benchmark only")
+    run.add_argument("--repeat", type=int, default=5)
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--out", default="./benchmarks/results/latest.json")
+    run.add_argument("--ttft", type=float, default=0.02, help="fake chatter time to first token (s)")
+    run.add_argument("--tokens-per-s", type=float, default=400.0)
+    run.add_argument("--jitter", type=float, default=0.0)
+    run.add_argument("--failure-rate", type=float, default=0.0)
+    run.add_argument("--seed", type=int, default=0)
+
+    cmp = commands.add_parser("compare", help="flag regressions between two result files")
+    cmp.add_argument("baseline")
+    cmp.add_argument("candidate")
+    cmp.add_argument("--threshold", type=float, default=0.10, help="relative slowdown that fails (0.10 = 10%%)")
+    cmp.add_argument("--metric", default="median_s")
+
+    commands.add_parser("list", help="list the registered benchmarks")
+
+    args = parser.parse_args(argv)
+    if args.command == "list":
+        for name, (_, param_sets, _) in BENCHMARKS.items():
+            print(f"{name}: {param_sets}")
+        return 0
+
+    if args.command == "run":
+        chatter_config = {"ttft": args.ttft, "tokens_per_s": args.tokens_per_s, "jitter": args.jitter,
+                          "failure_rate": args.failure_rate, "seed": args.seed}
+
+        def progress(key, stats):
+            if "skipped" in stats:
+                print(f"{key:<48} skipped ({stats['skipped']})")
+            else:
+                peak = f"  peak {stats['peak_bytes'] / 2 ** 20:8.1f} MiB" if "peak_bytes" in stats else ""
+                print(f"{key:<48} median {stats['median_s'] * 1000:10.3f} ms  p95 {stats['p95_s'] * 1000:10.3f} ms{peak}")
+
+        results = run_suite(args.filter, repeat=args.repeat, warmup=args.warmup, quick=args.quick,
+                            chatter_config=chatter_config, progress=progress)
+        write_results(results, args.out)
+        print(f"results written to {args.out}")
+        return 0
+
+    rows = compare(load_results(args.baseline), load_results(args.candidate),
+                   threshold=args.threshold, metric=args.metric)
+    print(format_comparison(rows))
+    regressions = [row["case"] for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
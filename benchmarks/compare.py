@@ -0,0 +1,63 @@
+# compare.py (c) 2024 Gregory L. Magnusson MIT license
+# compare two benchmark result files and flag regressions
+# a case regresses when its median time grows by more than the threshold
+# (default 10%); cases present in only one file are reported, never flagged
+
+import ujson
+
+
+def load_results(path):
+    with open(path, 'r') as file:
+        return ujson.load(file)
+
+
+def compare(baseline, candidate, threshold=0.10, metric="median_s"):
+    """
+    Compare two run_suite results case by case.
+
+    Args:
+        baseline: the reference results dict.
+        candidate: the results dict under test.
+        threshold: relative slowdown that counts as a regression (0.10 = 10%).
+        metric: the timing statistic compared.
+
+    Returns:
+        list: one dict per case with baseline, candidate, ratio and status
+        ("regression", "improvement", "ok", "new", "removed" or "skipped").
+    """
+    base = baseline.get("results", {})
+    cand = candidate.get("results", {})
+    rows = []
+    for key in sorted(set(base) | set(cand)):
+        before, after = base.get(key), cand.get(key)
+        row = {"case": key, "baseline": None, "candidate": None, "ratio": None}
+        if before is None:
+            row["status"] = "new"
+        elif after is None:
+            row["status"] = "removed"
+        elif metric not in before or metric not in after:
+            row["status"] = "skipped"
+        else:
+            row["baseline"], row["candidate"] = before[metric], after[metric]
+            row["ratio"] = after[metric] / before[metric] if before[metric] else None
+            if row["ratio"] is None:
+                row["status"] = "ok"
+            elif row["ratio"] > 1.0 + threshold:
+                row["status"] = "regression"
+            elif row["ratio"] < 1.0 - threshold:
+                row["status"] = "improvement"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows):
+    """Render compare() rows as a plain-text table."""
+    lines = [f"{'case':<48} {'baseline ms':>12} {'candidate ms':>12} {'ratio':>7}  status"]
+    for row in rows:
+        before = f"{row['baseline'] * 1000:.3f}" if row["baseline"] is not None else "-"
+        after = f"{row['candidate'] * 1000:.3f}" if row["candidate"] is not None else "-"
+        ratio = f"{row['ratio']:.2f}x" if row["ratio"] is not None else "-"
+        lines.append(f"{row['case']:<48} {before:>12} {after:>12} {ratio:>7}  {row['status']}")
+    return "\n".join(lines)
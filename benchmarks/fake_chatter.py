@@ -0,0 +1,74 @@
+# fake_chatter.py (c) 2024 Gregory L. Magnusson MIT license
+# latency-injecting chatter for benchmarks: a real BaseChatter (so the "llm" span,
+# usage folding and the sync-over-async bridge are all exercised) whose stream
+# sleeps for a configurable time to first token and tokens/sec, with seeded jitter
+# and failures so two runs with the same seed inject exactly the same latency
+
+import asyncio
+import random
+
+from webmind.chatter import BaseChatter
+
+
+class FakeChatter(BaseChatter):
+    """
+    Offline chatter with deterministic, configurable latency.
+
+    Args:
+        ttft: seconds before the first token.
+        tokens_per_s: streaming rate after the first token (0 = no delay).
+        jitter: relative jitter applied to every delay, e.g. 0.1 = ±10%.
+        failure_rate: probability that a call raises (generate_response then
+            returns the provider error string, like a real outage).
+        response: the canned answer; validation prompts are answered VALID.
+        seed: seed for jitter and failures.
+    """
+    provider = "fake"
+
+    def __init__(self, ttft=0.02, tokens_per_s=400.0, jitter=0.0, failure_rate=0.0,
+                 response="the premises hold therefore the conclusion follows", seed=0):
+        super().__init__()
+        self.current_model = "fake-model"
+        self.ttft = ttft
+        self.tokens_per_s = tokens_per_s
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.response = response
+        self.seed = seed
+        self.reset()
+
+    def reset(self):
+        """Rewind the random stream and the counters (call between benchmark runs)."""
+        self.rng = random.Random(self.seed)
+        self.calls = 0
+        self.failures = 0
+        self.injected_seconds = 0.0
+
+    def _delay(self, seconds):
+        if seconds <= 0:
+            return 0.0
+        if self.jitter:
+            seconds *= 1.0 + self.rng.uniform(-self.jitter, self.jitter)
+        self.injected_seconds += seconds
+        return seconds
+
+    def _answer(self, knowledge):
+        if "Answer exactly VALID or INVALID" in knowledge:
+            return "VALID"
+        return self.response
+
+    async def generate_response_stream(self, knowledge):
+        self.last_usage = None
+        self.calls += 1
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            self.failures += 1
+            await asyncio.sleep(self._delay(self.ttft))
+            raise ConnectionError("injected failure")
+        words = self._answer(knowledge).split(" ")
+        await asyncio.sleep(self._delay(self.ttft))
+        per_token = 1.0 / self.tokens_per_s if self.tokens_per_s else 0.0
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(self._delay(per_token))
+            yield word if i == len(words) - 1 else word + " "
+        self.last_usage = {"input_tokens": len(knowledge) // 4, "output_tokens": len(words)}
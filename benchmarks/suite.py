@@ -0,0 +1,473 @@
+# suite.py (c) 2024 Gregory L. Magnusson MIT license
+# the benchmark registry and timing harness
+# a benchmark is a setup function registered with @benchmark(name, params=[...]);
+# for each parameter set it builds its fixtures and returns (run, chatter) where
+# run() is the timed call and chatter is the FakeChatter it used (or None).
+# every run happens in a scratch working directory, because the reasoning stack
+# writes its memories and logs relative to the cwd
+# benchmarks registered with memory=True also record the tracemalloc peak of one
+# extra untimed call (numpy allocations included) as peak_bytes
+
+import contextlib
+import datetime
+import os
+import pathlib
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import ujson
+
+from automind.tracing import percentile
+from benchmarks.fake_chatter import FakeChatter
+
+RESULTS_VERSION = 1
+
+BENCHMARKS = {}  # name: (setup, [params, ...], memory)
+
+
+def benchmark(name, params=({},), memory=False):
+    """Register a benchmark setup function under name for each parameter set."""
+    def register(setup):
+        BENCHMARKS[name] = (setup, [dict(p) for p in params], memory)
+        return setup
+    return register
+
+
+def case_key(name, params):
+    """Stable result key, e.g. logic.tautology[variables=8]."""
+    if not params:
+        return name
+    return f"{name}[{','.join(f'{k}={v}' for k, v in sorted(params.items()))}]"
+
+
+@contextlib.contextmanager
+def scratch_cwd():
+    """Run inside a temporary working directory, restoring the cwd afterwards."""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="ezagi-bench-") as path:
+        os.chdir(path)
+        try:
+            yield path
+        finally:
+            os.chdir(previous)
+
+
+def peak_memory(run):
+    """Peak bytes allocated during one run() call, as traced by tracemalloc."""
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def time_case(run, chatter=None, repeat=5, warmup=1, memory=False):
+    """
+    Time run() repeat times after warmup calls.
+
+    Returns:
+        dict: seconds per call (min, median, mean, p95, max), ops_per_s, for
+        chatter-backed cases the injected LLM latency and the overhead on top of
+        it, and with memory=True the peak_bytes of one more call.
+    """
+    for _ in range(warmup):
+        run()
+    if chatter is not None:
+        chatter.reset()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - t0)
+    median = statistics.median(samples)
+    stats = {
+        "repeat": repeat,
+        "min_s": min(samples),
+        "median_s": median,
+        "mean_s": statistics.fmean(samples),
+        "p95_s": percentile(samples, 95),
+        "max_s": max(samples),
+        "ops_per_s": 1.0 / median if median > 0 else None,
+    }
+    if chatter is not None:
+        injected = chatter.injected_seconds / repeat
+        stats.update({
+            "llm_calls": chatter.calls / repeat,
+            "llm_failures": chatter.failures,
+            "injected_s": injected,
+            "overhead_s": stats["mean_s"] - injected,
+        })
+    if memory:
+        stats["peak_bytes"] = peak_memory(run)
+    return stats
+
+
+def run_suite(names=None, repeat=5, warmup=1, quick=False, chatter_config=None, progress=None):
+    """
+    Run the registered benchmarks.
+
+    Args:
+        names: substrings selecting benchmarks (None = all).
+        repeat: timed calls per case.
+        warmup: untimed calls per case.
+        quick: only the first parameter set of each benchmark.
+        chatter_config: FakeChatter keyword arguments for chatter-backed cases.
+        progress: optional callable(key, stats) called after each case.
+
+    Returns:
+        dict: {"meta": {...}, "results": {case_key: stats}}
+    """
+    chatter_config = dict(chatter_config or {})
+    results = {}
+    for name, (setup, param_sets, memory) in BENCHMARKS.items():
+        if names and not any(n in name for n in names):
+            continue
+        for params in param_sets[:1] if quick else param_sets:
+            key = case_key(name, params)
+            with scratch_cwd():
+                try:
+                    run, chatter = setup(chatter_config=chatter_config, **params)
+                except ImportError as e:  # optional extras (numpy for fuzzy)
+                    stats = {"skipped": str(e)}
+                else:
+                    stats = time_case(run, chatter, repeat=repeat, warmup=warmup, memory=memory)
+            results[key] = stats
+            if progress is not None:
+                progress(key, stats)
+    return {"meta": _meta(repeat, warmup, chatter_config), "results": results}
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, timeout=5, cwd=pathlib.Path(__file__).resolve().parents[1])
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _meta(repeat, warmup, chatter_config):
+    return {
+        "version": RESULTS_VERSION,
+        "timestamp": datetime.datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "git": _git_revision(),
+        "repeat": repeat,
+        "warmup": warmup,
+        "chatter": chatter_config,
+    }
+
+
+def write_results(results, path):
+    """Write a run_suite result to path as JSON."""
+    pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as file:
+        ujson.dump(results, file, indent=2)
+
+
+# benchmarks ------------------------------------------------------------------
+
+@benchmark("socratic.draw_conclusion", params=[{"premises": 1}, {"premises": 5}])
+def bench_draw_conclusion(chatter_config, premises):
+    from automind.SocraticReasoning import SocraticReasoning
+    chatter = FakeChatter(**chatter_config)
+    reasoning = SocraticReasoning(chatter)
+
+    def run():
+        for i in range(premises):
+            reasoning.add_premise(f"premise {i}: all humans are mortal")
+        reasoning.draw_conclusion()
+    return run, chatter
+
+
+@benchmark("decision.make_decision", params=[{"max_premises": 1}, {"max_premises": 3}])
+def bench_make_decision(chatter_config, max_premises):
+    from automindx.make_decision import DecisionMaker
+    chatter = FakeChatter(**chatter_config)
+    decision_maker = DecisionMaker(chatter)
+    decision_maker.set_max_premises(max_premises)
+    decision_maker.limit_premises = True
+
+    def run():
+        decision_maker.premises = []
+        decision_maker.add_premise("All humans are mortal.")
+        decision_maker.add_premise("Socrates is a human.")
+        decision_maker.make_decision(enable_additional_premises=True, autonomous=False)
+    return run, chatter
+
+
+@benchmark("thot.think", params=[{"log_entries": 0}, {"log_entries": 1000},
+                                 {"log_entries": 0, "styles": "llm"}])
+def bench_thot_think(chatter_config, log_entries, styles="template"):
+    from automindx.reasoning import THOT
+    chatter = FakeChatter(**chatter_config) if styles == "llm" else None
+    thot = THOT(chatter)  # llm: fifteen concurrent style calls, about one round trip
+    for i in range(log_entries):
+        thot.log_thot({"input": f"thought {i}", "results": {}})
+    thot.thot_log.flush()
+
+    def run():
+        thot.think("Socrates is a human")
+        thot.thot_log.flush()  # the write is off the caller's path; time it anyway
+    return run, chatter
+
+
+@benchmark("logic.tautology", params=[{"variables": 4}, {"variables": 8}, {"variables": 12}])
+def bench_tautology(chatter_config, variables):
+    from automind.logic import LogicTables
+    tables = LogicTables()
+    names = [f"p{i}" for i in range(variables)]
+    for name in names:
+        tables.add_variable(name)
+    expression = " or ".join(f"({name} or not {name})" for name in names)
+    tables.add_expression(expression)
+
+    def run():
+        tables.tautology(expression)
+    return run, None
+
+
+@benchmark("memory.append_json_log", params=[{"entries": 100}, {"entries": 1000}, {"entries": 10000}])
+def bench_append_json_log(chatter_config, entries):
+    from memory.memory import append_json_log
+    path = './memory/logs/bench.json'
+    pathlib.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as file:
+        ujson.dump([{"premise": f"premise {i}", "conclusion": "c", "confidence": 0.9}
+                    for i in range(entries)], file)
+
+    def run():
+        append_json_log(path, {"premise": "appended", "conclusion": "c", "confidence": 0.9})
+    return run, None
+
+
+@benchmark("fuzzy.set_array", params=[{"points": 1001}, {"points": 100001},
+                                      {"points": 1_000_001, "cached": False}])
+def bench_fuzzy_set_array(chatter_config, points, cached=True):
+    from automindx import fuzzy
+    domain = fuzzy.Domain("temperature", 0, 100, res=100 / (points - 1))
+    domain.warm = fuzzy.trapezoid(20, 40, 60, 80)
+
+    def run():  # cached=False: a new set each call, so the membership is computed on the warm grid
+        if not cached:
+            domain.warm = fuzzy.trapezoid(20, 40, 60, 80)
+        domain.warm.array()
+    return run, None
+
+
+@benchmark("fuzzy.infer_batch", params=[{"rows": 100000, "mode": "mamdani"},
+                                       {"rows": 100000, "mode": "sugeno"}])
+def bench_fuzzy_infer_batch(chatter_config, rows, mode):
+    from automindx import fuzzy
+    temp = fuzzy.Domain("temp", 0, 100)
+    temp.cold, temp.warm, temp.hot = fuzzy.S(0, 50), fuzzy.triangular(20, 80), fuzzy.R(50, 100)
+    fan = fuzzy.Domain("fan", 0, 10, res=0.05)
+    fan.slow, fan.medium, fan.fast = fuzzy.triangular(0, 5), fuzzy.triangular(2, 8), fuzzy.triangular(5, 10)
+    rules = fuzzy.RuleBase({temp.cold: fan.slow, temp.warm: fan.medium, temp.hot: fan.fast}, mode=mode)
+    readings = {temp: fuzzy.np.random.default_rng(0).uniform(0, 100, rows)}
+
+    def run():
+        rules.infer_batch(readings)
+    return run, None
+
+
+@benchmark("fuzzy.rule_table", params=[{"rows": 100, "columns": 100}])
+def bench_fuzzy_rule_table(chatter_config, rows, columns):
+    from automindx import fuzzy
+    temp = fuzzy.Domain("temp", 0, rows)
+    hum = fuzzy.Domain("hum", 0, columns)
+    fan = fuzzy.Domain("fan", 0, 10)
+    for i in range(rows):
+        setattr(temp, f"t{i}", fuzzy.triangular(i - 1, i + 1))
+    for j in range(columns):
+        setattr(hum, f"h{j}", fuzzy.triangular(j - 1, j + 1))
+    for name in ("slow", "medium", "fast"):
+        setattr(fan, name, fuzzy.triangular(0, 10))
+    speeds = ("fan.slow", "fan.medium", "very(fan.fast)")
+    header = " ".join(f"hum.h{j}" for j in range(columns))
+    table = "\n".join([header] + [f"temp.t{i} " + " ".join(speeds[(i + j) % 3] for j in range(columns))
+                                  for i in range(rows)])
+    references = {"temp": temp, "hum": hum, "fan": fan}
+
+    def run():  # parse_rule_table, not rule_from_table: every call parses, none hits the cache
+        fuzzy.parse_rule_table(table, references)
+    return run, None
+
+
+@benchmark("fuzzy.large_domain", params=[{"points": 10_000_001, "representation": "sparse"},
+                                        {"points": 10_000_001, "representation": "dense"}], memory=True)
+def bench_fuzzy_large_domain(chatter_config, points, representation):
+    from automindx import fuzzy
+    center = (points - 1) / 2
+
+    def run():  # fresh sets each call, so neither path answers from a cache
+        domain = fuzzy.Domain("x", 0, points - 1)
+        domain.spike = fuzzy.singleton(center)
+        domain.narrow = fuzzy.triangular(center - 50, center + 50)
+        if representation == "dense":
+            domain.spike.array(), domain.narrow.array()  # a sampled array keeps a set dense
+        domain.narrow.cardinality, domain.narrow.center_of_gravity()
+        domain.spike <= domain.narrow, (domain.spike | domain.narrow).cardinality
+    return run, None
+
+
+@benchmark("fuzzy.evaluate_sets", params=[{"sets": 64, "workers": 1}, {"sets": 64, "workers": 4}])
+def bench_fuzzy_evaluate_sets(chatter_config, sets, workers):
+    from automindx import fuzzy
+    domain = fuzzy.Domain("x", 0, 1000, res=0.005)
+    members = [fuzzy.very(fuzzy.gauss(i * 15, 0.001)) for i in range(sets)]
+
+    def run():
+        fuzzy.parallel.evaluate_sets(members, domain, workers=workers)
+    return run, None
+
+
+@benchmark("confidence.score", params=[{"calls": 10_000}])
+def bench_confidence_score(chatter_config, calls):
+    from automind.confidence import score
+    score(verdict=True)  # compile the lookup table once, outside the timing
+
+    def run():
+        for _ in range(calls):
+            score(verdict=True, retries=2, agreement=0.37, history=0.6)
+    return run, None
+
+
+@benchmark("deductive.law_of_syllogism", params=[{"nodes": 1000}, {"nodes": 4000}])
+def bench_law_of_syllogism(chatter_config, nodes):
+    from automindx.deductive import Graph, law_of_syllogism
+    rng = random.Random(nodes)
+    graph = Graph()
+    for i in range(nodes - 1):  # a chain guarantees the path, random forward edges widen the search
+        graph.add_condition_statement(f"n{i}", f"n{i + 1}")
+        for _ in range(2):
+            graph.add_condition_statement(f"n{i}", f"n{rng.randrange(i + 1, nodes)}")
+
+    def run():
+        law_of_syllogism(graph.get_graph(), "n0", f"n{nodes - 1}")
+    return run, None
+
+
+@benchmark("deductive.reachable_many", params=[{"edges": 100_000, "queries": 100_000}])
+def bench_reachable_many(chatter_config, edges, queries):
+    from automindx.deductive import Graph
+    rng = random.Random(edges)
+    names = [f"n{i}" for i in range(edges)]
+    statements = [(rng.choice(names), rng.choice(names)) for _ in range(edges)]
+    pairs = [(rng.choice(names), rng.choice(names)) for _ in range(queries)]
+
+    def run():  # a fresh graph each call: the memoized reach sets start empty
+        graph = Graph()
+        for premise, conclusion in statements:
+            graph.add_condition_statement(premise, conclusion)
+        graph.reachable_many(pairs)
+    return run, None
+
+
+@benchmark("deductive.condensed_queries", params=[{"edges": 100_000}, {"edges": 1_000_000}])
+def bench_condensed_queries(chatter_config, edges):
+    from automindx.deductive import Graph
+    rng = random.Random(edges)
+    names = [f"n{i}" for i in range(edges // 2)]  # supercritical: one giant cycle plus tails
+    graph = Graph()
+    for _ in range(edges):
+        graph.add_condition_statement(rng.choice(names), rng.choice(names))
+    graph.condensation()  # built once here; run() times the queries alone
+    pairs = [(rng.choice(names), rng.choice(names)) for _ in range(10_000)]
+
+    def run():
+        graph.reachable_many(pairs)
+        for start, dest in pairs[:100]:
+            graph.proof(start, dest)
+    return run, None
+
+
+@benchmark("unification.retrieve", params=[{"facts": 100_000, "lookup": "index"},
+                                          {"facts": 100_000, "lookup": "scan"}])
+def bench_unification_retrieve(chatter_config, facts, lookup):
+    from automindx.unification import FactIndex, compound, parse, unify
+    rng = random.Random(facts)
+    people = [f"p{i}" for i in range(facts // 10)]
+    stored = [compound(rng.choice(("parent", "teaches", "knows")), rng.choice(people), rng.choice(people))
+              for _ in range(facts)]
+    index = FactIndex()
+    for fact in stored:
+        index.add(fact)
+    queries = [parse(f"parent({rng.choice(people)}, X)") for _ in range(10)]
+
+    def run():
+        for query in queries:
+            if lookup == "index":
+                list(index.unifiable(query))
+            else:
+                [fact for fact in stored if unify(query, fact) is not None]
+    return run, None
+
+
+@benchmark("nonmonotonic.default_logic", params=[{"rules": 10_000, "facts": 100_000}])
+def bench_default_logic(chatter_config, rules, facts):
+    from automindx.nonmonotonic import Default, DefaultLogic, Rule
+    rng = random.Random(rules)
+    names = [f"a{i}" for i in range(2 * facts)]
+    theory = [Rule(set(rng.sample(names, rng.randint(1, 3))), {rng.choice(names)}) for _ in range(rules)]
+    defaults = [Default({rng.choice(names)}, {rng.choice(names)}) for _ in range(rules // 10)]
+    known = rng.sample(names, facts)
+    queries = [rng.choice(names) for _ in range(100_000)]
+
+    def run():  # build the fixpoint once, then 1e5 queries answered from it
+        logic = DefaultLogic()
+        for rule in theory:
+            logic.add_rule(rule)
+        for default in defaults:
+            logic.add_default(default)
+        logic.add_facts(known)
+        for query in queries:
+            logic.evaluate(query)
+    return run, None
+
+
+@benchmark("abduction.match", params=[{"facts": 1_000_000, "store": "memory"},
+                                      {"facts": 1_000_000, "store": "mapped"}])
+def bench_abduction_match(chatter_config, facts, store):
+    from automindx.abduction import AbductiveReasoning, KnowledgeBase, write_compact
+    rng = random.Random(facts)
+    vocabulary = [f"w{i}" for i in range(20_000)]
+    entries = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(2, 5))) for _ in range(facts)]
+    if store == "mapped":
+        write_compact("kb.ezkb", entries)
+        kb = KnowledgeBase.load("kb.ezkb")
+    else:
+        kb = KnowledgeBase(entries)
+    reasoner = AbductiveReasoning(kb)  # loaded once here; run() times the matching alone
+    observations = [" ".join(rng.choice(vocabulary) for _ in range(10)) + " " + rng.choice(entries)
+                    for _ in range(100)]
+
+    def run():
+        for observation in observations:
+            reasoner.rank(observation, k=3)
+    return run, None
+
+
+@benchmark("abduction.reload", params=[{"facts": 100_000, "appended": 1_000}])
+def bench_abduction_reload(chatter_config, facts, appended):
+    from automindx.abduction import KnowledgeBase, write_compact
+    rng = random.Random(facts)
+    vocabulary = [f"w{i}" for i in range(20_000)]
+
+    def sentences(count):
+        return [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(2, 5))) for _ in range(count)]
+    write_compact("kb.ezkb", sentences(facts))
+    kb = KnowledgeBase.load("kb.ezkb")
+
+    def run():  # index only the appended records
+        write_compact("kb.ezkb", sentences(appended))
+        kb.reload()
+    return run, None
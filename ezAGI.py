@@ -6,16 +6,25 @@
 # reasoning panel (premises, challenges, validation verdicts, conclusions)
 # conversation from send_message is saved to ./memory/stm/{timestamp}memory.json
 # internal conclusions are saved to ./memory/logs/thoughts.json
+# per-stage latencies (llm, validation, truth tables, file writes) are traced into an
+# in-process ring buffer and summarised as p50/p95 in the metrics tab
+# /metrics publishes the same spans plus tokens, queue depths and sessions for Prometheus
+# /v1/reason, /v1/reason/stream and /v1/batch drive reasoning headless (webmind/reasoning_api.py)
 
 from pathlib import Path
 import asyncio
 import logging
 
-from nicegui import ui, app  # handle UIUX
+from nicegui import ui, app, Client  # handle UIUX
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles  # integrate fastapi static folder and gfx folder
 
 from automind.openmind import OpenMind
+from automind.tracing import tracer, RingBufferExporter
+from automind.metrics import REGISTRY, CONTENT_TYPE, MetricsExporter
+from webmind.chatter import resolve_chatter
 from webmind.html_head import add_head_html  # handler for the html head imports and meta tags
+from webmind.reasoning_api import ReasoningAPI, create_router
 
 logging.basicConfig(level=logging.INFO)
 
@@ -26,6 +35,46 @@ app.mount('/gfx', StaticFiles(directory=str(ROOT / 'gfx')), name='gfx')
 
 openmind = OpenMind()  # initialize OpenMind instance
 
+# recent reasoning spans behind the metrics tab, and the same spans as /metrics observations
+trace_buffer = RingBufferExporter()
+tracer.enable(trace_buffer, MetricsExporter())
+
+REGISTRY.gauge("ezagi_queue_depth", "Pending items in the OpenMind queues.",
+               lambda: {("internal_queue",): openmind.internal_queue.qsize(),
+                        ("trace_queue",): openmind.trace_queue.qsize()},
+               labelnames=("queue",))
+REGISTRY.gauge("ezagi_active_sessions", "Browser sessions connected to the console.",
+               lambda: sum(1 for client in list(Client.instances.values()) if client.has_socket_connection))
+REGISTRY.gauge("ezagi_reasoning_thinking", "1 while a reasoning turn is in progress.",
+               lambda: 1 if openmind.reasoning_state == "thinking" else 0)
+
+
+# headless reasoning API: a fresh chatter per request from the console's stored keys
+reasoning_api = ReasoningAPI(
+    lambda provider, model: resolve_chatter(openmind.api_manager, provider=provider, model=model))
+app.include_router(create_router(reasoning_api))
+
+
+@app.get('/metrics', include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint (text exposition format)."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+METRIC_COLUMNS = [
+    {"name": "stage", "label": "stage", "field": "stage", "align": "left"},
+    {"name": "count", "label": "count", "field": "count"},
+    {"name": "p50", "label": "p50 ms", "field": "p50"},
+    {"name": "p95", "label": "p95 ms", "field": "p95"},
+]
+
+
+def _metric_rows():
+    """p50/p95 per pipeline stage from the trace ring buffer."""
+    return [
+        {"stage": stage, "count": s["count"], "p50": f"{s['p50_ms']:.1f}", "p95": f"{s['p95_ms']:.1f}"}
+        for stage, s in trace_buffer.stats().items()
+    ]
+
 # log files as the code actually writes them
 LOG_FILES = {
     "Premises Log": "./memory/logs/premises.json",
@@ -66,12 +115,16 @@ def _trace_row(container, event):
     with container:
         if kind == "conclusion":
             validated = event.get("validated")
+            confidence = event.get("confidence", 0)  # fuzzy confidence, automind/confidence.py
             verdict = "validated" if validated else "unvalidated"
-            badge_color = "green" if validated else "orange"
+            if validated and confidence >= 0.7:
+                badge_color = "green"
+            else:
+                badge_color = "orange" if confidence >= 0.4 else "red"
             with ui.card().classes('trace-conclusion w-full'):
                 with ui.row().classes('items-center w-full no-wrap'):
                     ui.label(f"{stamp}  conclusion").classes('text-bold')
-                    ui.badge(f"{verdict} · {event.get('confidence', 0):.1f}", color=badge_color)
+                    ui.badge(f"{verdict} · {confidence:.2f}", color=badge_color)
                 ui.markdown(event.get("conclusion", ""))
         else:  # internal_conclusion (autonomous reasoning loop)
             with ui.card().classes('trace-internal w-full'):
@@ -174,6 +227,7 @@ def main():
         chat_tab = ui.tab('chat').classes('tab-style')
         reasoning_tab = ui.tab('reasoning').classes('tab-style')
         logs_tab = ui.tab('logs').classes('tab-style')
+        metrics_tab = ui.tab('metrics').classes('tab-style')
         api_tab = ui.tab('APIk').classes('tab-style')
 
     with ui.tab_panels(tabs, value=chat_tab).classes('response-style w-full'):
@@ -213,6 +267,17 @@ def main():
             # buttons-only view, so the choices are visible after reading a log
             logs_tab.on('click', lambda: log_container.clear())
 
+        # metrics: per-stage latency of recent reasoning turns
+        with ui.tab_panel(metrics_tab):
+            ui.label('reasoning stages — latency over the most recent spans').classes('text-bold')
+            metrics_table = ui.table(columns=METRIC_COLUMNS, rows=_metric_rows(), row_key='stage').classes('w-full')
+
+            def refresh_metrics():
+                metrics_table.rows = _metric_rows()
+                metrics_table.update()
+
+            ui.timer(2.0, refresh_metrics)
+
         # API keys management
         with ui.tab_panel(api_tab):
             ui.label('Manage API Keys').classes('text-lg font-bold')
@@ -11,6 +11,8 @@ import time
 import ujson
 import logging
 
+from automind.tracing import tracer
+
 # Define the constants for memory folders
 MEMORY_FOLDER = "./memory/"
 STM_FOLDER = MEMORY_FOLDER + "stm/"
@@ -68,24 +70,27 @@ def store_episodic_memory(episode):
 def save_valid_truth(valid_truth):
     filename = f"{int(time.time())}.json"
     filepath = os.path.join(TRUTH_FOLDER, filename)
-    with open(filepath, "w") as file:
-        ujson.dump(valid_truth, file)
+    with tracer.span("file.write", path=filepath):
+        with open(filepath, "w") as file:
+            ujson.dump(valid_truth, file)
 
 # append an entry to a JSON-array log file with a safe read-modify-write
 # (tolerates a missing or corrupt file) — all logs are memories
 def append_json_log(filepath, entry):
     create_memory_folders()
     pathlib.Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-    try:
-        with open(filepath, "r") as file:
-            data = ujson.load(file)
-        if not isinstance(data, list):
-            data = [data]
-    except (FileNotFoundError, ValueError):
-        data = []
-    data.append(entry)
-    with open(filepath, "w") as file:
-        ujson.dump(data, file, indent=2)
+    with tracer.span("file.write", path=filepath) as span:
+        try:
+            with open(filepath, "r") as file:
+                data = ujson.load(file)
+            if not isinstance(data, list):
+                data = [data]
+        except (FileNotFoundError, ValueError):
+            data = []
+        data.append(entry)
+        with open(filepath, "w") as file:
+            ujson.dump(data, file, indent=2)
+        span.set(entries=len(data))
 
 # save conversation memory as input response in short term memory folder ./memory/stm{timestamp}memory.json
 def save_conversation_memory(memory):
@@ -0,0 +1,269 @@
+# thotlog.py (c) 2024 Gregory L. Magnusson MIT licence
+# append-only log of THOT thoughts, replacing the rewrite-everything ./mindx/thots.json
+# one JSON line per thought in ./mindx/thots/thots-<n>.jsonl; the active segment is rotated
+# once it passes max_bytes or its first thought is max_age seconds old, and the writer
+# gzips it to thots-<n>.jsonl.gz
+# index.tsv maps a hash of each input to (segment, offset), so lookup reads only the lines
+# logged for that input
+# log() only queues the entry: a background writer appends batches and exits when idle;
+# flush() waits for the queue, and pending entries are flushed at interpreter exit
+
+import atexit
+import gzip
+import hashlib
+import logging
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import weakref
+
+import ujson
+
+THOTS_FOLDER = "./mindx/thots/"
+LEGACY_LOG = "./mindx/thots.json"  # the JSON array THOT wrote before
+INDEX_FILE = "index.tsv"
+_SEGMENT = re.compile(r"^thots-(\d+)\.jsonl(\.gz)?$")
+
+_logs = weakref.WeakValueDictionary()  # absolute folder -> ThotLog
+_logs_lock = threading.Lock()
+
+
+def input_hash(text):
+    """Short stable hash of a THOT input, the index key."""
+    return hashlib.blake2b(str(text).encode("utf-8"), digest_size=8).hexdigest()
+
+
+class ThotLog:
+    """
+    Rotated, indexed JSONL log written by a background thread.
+
+    Args:
+        folder: where the segments and the index live.
+        max_bytes: rotate the active segment past this size.
+        max_age: rotate the active segment once its first thought is this many seconds old.
+        legacy: a JSON array log imported (then renamed to .migrated) on the first write.
+        idle: seconds the writer waits for more thoughts before exiting.
+    """
+    def __init__(self, folder=THOTS_FOLDER, max_bytes=8 << 20, max_age=86400.0, legacy=None, idle=1.0):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.legacy = legacy
+        self.idle = idle
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()  # the writer thread's lifecycle
+        self._index_lock = threading.Lock()
+        self._thread = None
+        self._index = None  # hash -> [(segment, offset)], loaded by the first lookup
+        self._file = None
+        self._segment = None
+        self._size = 0
+        self._started = None  # time of the active segment's first thought
+
+    @classmethod
+    def shared(cls, folder=THOTS_FOLDER, **options):
+        """The process-wide log for folder, so one writer owns its files."""
+        key = os.path.abspath(folder)
+        with _logs_lock:
+            log = _logs.get(key)
+            if log is None:
+                log = _logs[key] = cls(folder, **options)
+            return log
+
+    def _path(self, segment, compressed=False):
+        return os.path.join(self.folder, f"thots-{segment:06d}.jsonl" + (".gz" if compressed else ""))
+
+    def log(self, entry):
+        """Queue one thought (a dict with an "input") and return at once."""
+        self._queue.put(entry)
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, name="thot-log", daemon=True)
+                self._thread.start()
+
+    def flush(self):
+        """Block until every queued thought is on disk."""
+        self._queue.join()
+
+    def _write_loop(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.idle)]
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._close_segment()
+                        self._thread = None
+                        return
+                continue
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._append(batch)
+            except Exception as e:
+                logging.error(f"Error writing thot log: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _segments(self):
+        """{segment number: compressed} for the segment files on disk."""
+        found = {}
+        for name in os.listdir(self.folder):
+            match = _SEGMENT.match(name)
+            if match:
+                number = int(match.group(1))
+                found[number] = found.get(number, False) or bool(match.group(2))
+        return found
+
+    def _open_segment(self):
+        os.makedirs(self.folder, exist_ok=True)
+        segments = self._segments()
+        for number, compressed in segments.items():
+            if not compressed and number != max(segments):
+                self._compress(number)  # left plain by an interrupted rotation
+        self._segment = max(segments) if segments else 0
+        if segments and segments[self._segment]:
+            self._segment += 1
+        path = self._path(self._segment)
+        self._started = None
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                first = file.readline()
+            try:
+                self._started = ujson.loads(first).get("time") if first else None
+            except ValueError:
+                pass
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+        if self.legacy and os.path.exists(self.legacy):
+            self._migrate()
+
+    def _migrate(self):
+        try:
+            with open(self.legacy, "r") as file:
+                entries = ujson.load(file)
+        except ValueError as e:
+            logging.error(f"Skipping unreadable legacy thot log {self.legacy}: {e}")
+            entries = []
+        legacy, self.legacy = self.legacy, None
+        if isinstance(entries, list):
+            self._append([entry for entry in entries if isinstance(entry, dict)])
+        os.replace(legacy, legacy + ".migrated")
+
+    def _compress(self, segment):
+        plain, packed = self._path(segment), self._path(segment, compressed=True)
+        with open(plain, "rb") as source, gzip.open(packed + ".tmp", "wb") as target:
+            shutil.copyfileobj(source, target)
+        os.replace(packed + ".tmp", packed)
+        os.remove(plain)
+
+    def _close_segment(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self):
+        self._close_segment()
+        self._compress(self._segment)
+        self._segment += 1
+        self._file = open(self._path(self._segment), "ab")
+        self._size = 0
+        self._started = None
+
+    def _append(self, batch):
+        if self._file is None:
+            self._open_segment()
+        placed = []
+        for entry in batch:
+            now = time.time()
+            if self._size and (self._size >= self.max_bytes or
+                               (self._started is not None and now - self._started >= self.max_age)):
+                self._rotate()
+            if "time" not in entry:
+                entry = dict(entry, time=now)
+            data = (ujson.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+            placed.append((input_hash(entry.get("input", "")), self._segment, self._size))
+            self._file.write(data)
+            self._size += len(data)
+            if self._started is None:
+                self._started = entry["time"]
+        self._file.flush()
+        with self._index_lock:
+            with open(os.path.join(self.folder, INDEX_FILE), "a") as file:
+                file.writelines(f"{key}\t{segment}\t{offset}\n" for key, segment, offset in placed)
+            if self._index is not None:
+                for key, segment, offset in placed:
+                    self._index.setdefault(key, []).append((segment, offset))
+
+    def _load_index(self):
+        index = {}
+        try:
+            with open(os.path.join(self.folder, INDEX_FILE), "r") as file:
+                for line in file:
+                    parts = line.split("\t")
+                    if len(parts) == 3 and parts[2].endswith("\n"):  # skip a torn last line
+                        index.setdefault(parts[0], []).append((int(parts[1]), int(parts[2])))
+        except FileNotFoundError:
+            pass
+        return index
+
+    def _open(self, segment):
+        try:
+            return open(self._path(segment), "rb")
+        except FileNotFoundError:  # rotated: read through the gzip stream
+            return gzip.open(self._path(segment, compressed=True), "rb")
+
+    def _read(self, segment, offset):
+        with self._open(segment) as file:
+            file.seek(offset)
+            return ujson.loads(file.readline())
+
+    def lookup(self, input_text):
+        """
+        Every thought logged for input_text, oldest first.
+
+        Returns:
+            list: the logged entries.
+        """
+        self.flush()
+        key = input_hash(input_text)
+        with self._index_lock:
+            if self._index is None:
+                self._index = self._load_index()
+            places = list(self._index.get(key, ()))
+        found = []
+        for segment, offset in places:
+            try:
+                entry = self._read(segment, offset)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Unreadable thot log entry in segment {segment}: {e}")
+                continue
+            if entry.get("input") == input_text:
+                found.append(entry)
+        return found
+
+    def entries(self):
+        """Yield every logged thought, oldest first."""
+        self.flush()
+        if not os.path.isdir(self.folder):
+            return
+        for segment in sorted(self._segments()):
+            with self._open(segment) as file:
+                for line in file:
+                    if line.strip():
+                        yield ujson.loads(line)
+
+
+def _flush_all():
+    for log in list(_logs.values()):
+        log.flush()
+
+
+atexit.register(_flush_all)
@@ -0,0 +1,116 @@
+# automindx.abduction: indexed matching and ranked explanations
+import json
+import random
+
+from automindx.abduction import (MAGIC, AbductionAgent, AbductiveReasoning, KnowledgeBase, MappedFacts,
+                                 write_compact)
+
+WORDS = "rain wet ground sprinkler cloud storm leak pipe flood dew night cold".split()
+
+
+def sentence(rng, low=1, high=4):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def test_matches_the_substring_scan():
+    rng = random.Random(0)
+    facts = [sentence(rng) for _ in range(500)] + ["ain", "d w"]  # partial words count too
+    reasoner = AbductiveReasoning({"facts": facts})
+    unique = list(dict.fromkeys(facts))
+    for _ in range(200):
+        observation = sentence(rng, 3, 12)
+        expected = [fact for fact in unique if reasoner.explains(observation, fact)]
+        assert reasoner.find_possible_explanations(observation) == expected
+
+
+def test_ranking_is_deterministic_and_uses_priors():
+    kb = KnowledgeBase(["rain", {"fact": "it rained", "prior": 0.9}, "wet", "ground is wet"])
+    reasoner = AbductiveReasoning(kb)
+    observation = "it rained and the ground is wet"
+    ranked = reasoner.rank(observation, k=3)
+    assert [fact for fact, _ in ranked] == ["it rained", "ground is wet", "rain"]
+    assert ranked[0][1] >= ranked[1][1] >= ranked[2][1]
+    assert reasoner.reason(observation) == "it rained"
+    assert reasoner.reason("nothing here") == "No explanation found."
+    kb.add_fact("ground is wet", prior=1.0)
+    assert reasoner.reason(observation) == "ground is wet"
+
+
+def test_agent_loads_once(tmp_path):
+    path = tmp_path / "kb.json"
+    path.write_text(json.dumps({"facts": ["rain", "sprinkler"]}))
+    agent = AbductionAgent(str(path))
+    assert isinstance(agent.knowledge_base, KnowledgeBase) and len(agent.knowledge_base) == 2
+    assert agent.handle_observation("the sprinkler ran") == "sprinkler"
+    assert len(AbductionAgent(str(tmp_path / "missing.json")).knowledge_base) == 0
+
+
+def test_large_knowledge_base_finds_planted_facts():
+    # timing lives in the abduction.match benchmark
+    rng = random.Random(1)
+    vocabulary = [f"w{i}" for i in range(5000)]
+    kb = KnowledgeBase(" ".join(rng.choice(vocabulary) for _ in range(rng.randint(2, 4)))
+                       for _ in range(100_000))
+    planted = [rng.choice(kb.facts) for _ in range(200)]
+    for fact in planted:
+        observation = " ".join(rng.choice(vocabulary) for _ in range(8)) + " " + fact
+        assert kb.ids[fact] in kb.match(observation)
+
+
+def test_empty_knowledge_base_explains_nothing():
+    reasoner = AbductiveReasoning({"facts": []})
+    assert reasoner.select_best_explanation(["rain"], "rain today") == "rain"
+    assert reasoner.reason("rain today") == "No explanation found."
+    assert KnowledgeBase().specificity("rain") == 0.0
+
+
+def test_streamed_formats_match_in_memory(tmp_path):
+    rng = random.Random(2)
+    entries = [sentence(rng) for _ in range(400)] + [{"fact": "storm", "prior": 0.9}, "dew"]
+    memory = KnowledgeBase(entries)
+    jsonl = tmp_path / "kb.jsonl"
+    jsonl.write_text("\n".join(json.dumps(e) for e in entries) + "\n\nnot json\n")
+    binary = tmp_path / "kb.ezkb"
+    assert write_compact(str(binary), entries) == len(entries)
+    for path in (jsonl, binary):
+        kb = KnowledgeBase.load(str(path))
+        assert isinstance(kb.facts, MappedFacts) and len(kb.ids.recent) == 0  # fact strings stay on disk
+        assert list(dict.fromkeys(kb.facts)) == memory.facts
+        for _ in range(50):
+            observation = sentence(rng, 3, 10)
+            assert [kb.facts[i] for i in kb.match(observation)] == [memory.facts[i] for i in memory.match(observation)]
+        assert kb.priors[kb.ids.get("storm")] == 0.9
+        reasoner = AbductiveReasoning(kb)
+        assert reasoner.reason("a storm at night") == AbductiveReasoning(memory).reason("a storm at night")
+
+
+def test_hot_reload_indexes_appended_facts(tmp_path):
+    binary = str(tmp_path / "kb.ezkb")
+    write_compact(binary, ["rain"])
+    jsonl = tmp_path / "kb.jsonl"
+    jsonl.write_text('"rain"\n')
+    for path in (binary, str(jsonl)):
+        agent = AbductionAgent(path)
+        assert agent.handle_observation("burst pipe") == "No explanation found."
+        if path == binary:
+            write_compact(path, [{"fact": "burst pipe", "prior": 0.7}])
+            with open(path, "ab") as file:
+                file.write(b"\x40\x00")  # a torn record from a writer mid-append
+        else:
+            with open(path, "a") as file:
+                file.write('{"fact": "burst pipe", "prior": 0.7}\n{"fact": "ha')
+        assert agent.reload_knowledge_base() == 1
+        assert agent.handle_observation("burst pipe") == "burst pipe"
+        assert agent.reload_knowledge_base() == 0 and len(agent.knowledge_base) == 2
+    with open(binary, "rb") as file:
+        assert file.read(len(MAGIC)) == MAGIC
+
+
+def test_misshapen_jsonl_lines_are_skipped(tmp_path):
+    path = tmp_path / "kb.jsonl"
+    path.write_text('"rain"\n{"prior": 0.3}\n42\n{"fact": "wet", "prior": "high"}\n'
+                    '["leak"]\n{"fact": "storm", "prior": 0.9}\n')
+    kb = KnowledgeBase.load(str(path))
+    assert list(kb.facts) == ["rain", "storm"]
+    assert kb.priors[kb.ids.get("storm")] == 0.9 and len(kb.priors) == len(kb.facts)
+    assert AbductionAgent(str(path)).handle_observation("a storm") == "storm"
@@ -0,0 +1,199 @@
+# automindx.bdi: BeliefBase shared resources and cached goal checks
+import os
+import threading
+import time
+
+import pytest
+
+from automind.metrics import DELIBERATION_LATENCY, MetricsExporter
+from automind.tracing import Tracer
+from automindx import bdi
+from automindx.bdi import Belief, BeliefBase, Deliberator, Goal, Intention
+
+
+@pytest.fixture
+def offline(monkeypatch):
+    def no_keys():
+        raise AssertionError("BeliefBase must not read API keys unless it reasons")
+    monkeypatch.setattr(bdi, "APIManager", no_keys)
+
+
+def test_construction_touches_neither_disk_nor_network(offline, tmp_workdir):
+    base = BeliefBase()
+    for i in range(10_000):
+        base.add(f"belief {i}")
+    assert len(base) == 10_000 and base.add("belief 7") is base.get("belief 7")
+    Belief("standalone")
+    assert os.listdir(tmp_workdir) == []
+
+
+def test_goal_checks_share_one_truth_table(offline, monkeypatch):
+    base = BeliefBase()
+    for i in range(10_000):
+        base.add(f"b{i}")
+    logic = base.logic
+    logic.add_variable("A")
+    logic.add_expression("A or not A")
+    logic.add_expression("A")
+    base.add("A or not A"), base.add("A")
+    tables = []
+    generate = logic.generate_truth_table
+    monkeypatch.setattr(logic, "generate_truth_table", lambda: tables.append(1) or generate())
+    tautology, contingent = Goal("g1", ["A or not A"], priority=2), Goal("g2", ["A or not A", "A"])
+    for _ in range(100):
+        assert tautology.is_fulfilled(base, [], [])
+        assert not contingent.is_fulfilled(base, [], [])
+    assert not Goal("g3", ["not believed"]).is_fulfilled(base, [], [])
+    assert len(tables) == 1
+    assert base.get("A or not A").evaluate_belief() == "Belief 'A or not A' is valid."
+    logic.add_expression("A or A")  # the tables changed: validity is recomputed
+    assert not base.is_valid("A or A") and len(tables) == 2
+    assert tautology.is_fulfilled(list(base), [], [])  # a plain list of beliefs still works
+
+
+def test_reasoning_uses_the_shared_chatter(mock_chatter):
+    base = BeliefBase(chatter=mock_chatter)
+    first, second = base.add("the sky is blue"), base.add("it is daytime")
+    assert first.reason_belief() == mock_chatter.response
+    asked = len(mock_chatter.calls)
+    assert second.reason_belief() == mock_chatter.response
+    # premises don't leak from one belief into the next one's prompts
+    assert not any(prompt.startswith("- the sky is blue") for prompt in mock_chatter.calls[asked:])
+
+
+class CountingGoal(Goal):
+    checks = 0
+
+    def is_fulfilled(self, belief_system, desire_system, intentions_system):
+        CountingGoal.checks += 1
+        return super().is_fulfilled(belief_system, desire_system, intentions_system)
+
+
+def tautology_base():
+    base = BeliefBase()
+    base.logic.add_variable("A")
+    base.logic.add_expression("A or not A")
+    return base
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_intentions_start_by_priority(offline):
+    base = tautology_base()
+    engine = Deliberator(base, workers=1)
+    order, release = [], threading.Event()
+
+    def plan(name, condition):
+        def action(cancelled):
+            order.append(name)
+            release.wait(5)
+            engine.believe(condition)  # the plan achieves its goal
+        return Intention(f"pursue {name}", action)
+    for name, priority in (("low", 1), ("high", 9), ("mid", 5)):
+        base.logic.add_variable(name)
+        condition = f"{name} or not {name}"
+        base.logic.add_expression(condition)
+        engine.add_goal(Goal(name, [condition], priority=priority), plan(name, condition))
+    try:
+        assert engine.deliberate() == ["high"]
+        assert engine.deliberate() == []  # the one worker is busy
+        release.set()
+        for expected in (["mid"], ["low"], []):
+            wait_for(lambda: not engine.running())
+            assert engine.deliberate() == expected
+        assert order == ["high", "mid", "low"]
+        assert engine.reward.get_reward() == 15
+    finally:
+        engine.shutdown(cancel=True)
+
+
+def test_only_goals_naming_a_changed_belief_are_rechecked(offline):
+    engine = Deliberator(tautology_base())
+    for i in range(10_000):
+        engine.add_goal(CountingGoal(f"g{i}", [f"s{i}"], priority=i))
+    engine.add_goal(CountingGoal("taut", ["A or not A"], priority=7))
+    engine.deliberate()
+    CountingGoal.checks = 0
+    engine.believe("s42")
+    engine.deliberate()
+    assert CountingGoal.checks == 1
+    engine.believe("A or not A")
+    engine.deliberate()
+    assert CountingGoal.checks == 2 and engine.fulfilled["taut"] and engine.reward.get_reward() == 7
+    engine.deliberate()
+    assert CountingGoal.checks == 2 and engine.reward.get_reward() == 7  # credited once
+    engine.forget("A or not A")
+    engine.deliberate()
+    assert not engine.fulfilled["taut"]
+    engine.shutdown()
+
+
+def test_fulfilment_cancels_the_running_intention(offline, monkeypatch):
+    tracer = Tracer()
+    tracer.enable(MetricsExporter())
+    monkeypatch.setattr(bdi, "tracer", tracer)
+    observed = DELIBERATION_LATENCY.collect().get((), [None, 0, 0])[2]
+    engine = Deliberator(tautology_base())
+    stopped, started = threading.Event(), threading.Event()
+
+    def action(cancelled):
+        started.set()
+        cancelled.wait(5)
+        stopped.set()
+    engine.add_goal(Goal("taut", ["A or not A"], priority=3), Intention("wait for it", action))
+    assert engine.deliberate() == ["taut"]
+    assert started.wait(5)
+    engine.believe("A or not A")
+    engine.deliberate()
+    assert stopped.wait(5)
+    wait_for(lambda: engine.running() == [])
+    engine.shutdown()
+    assert DELIBERATION_LATENCY.collect()[()][2] == observed + 2  # one observation per cycle
+
+
+def test_cancelled_intentions_hold_their_worker_until_they_return(offline):
+    engine = Deliberator(tautology_base(), workers=1)
+    release = threading.Event()
+    engine.add_goal(Goal("stubborn", ["s1"], priority=1), Intention("ignore cancel", lambda cancelled: release.wait(5)))
+    try:
+        assert engine.deliberate() == ["stubborn"]
+        engine.cancel("stubborn")  # the action ignores the event and keeps running
+        engine.add_goal(Goal("next", ["s2"], priority=2), Intention("wait", lambda cancelled: None))
+        assert engine.running() == ["stubborn"]
+        assert engine.deliberate() == []  # its worker is still taken
+        release.set()
+        wait_for(lambda: engine.running() == [])
+        assert engine.deliberate() == ["next"]
+    finally:
+        engine.shutdown(cancel=True)
+
+
+def test_unfulfilled_goals_back_off_and_are_given_up_on(offline):
+    engine = Deliberator(tautology_base(), max_attempts=2, retry_delay=0.05)
+    runs = []
+    engine.add_goal(Goal("never", ["s1"], priority=1), Intention("try", lambda cancelled: runs.append(1)))
+
+    def cycle_until_run(count):
+        deadline = time.monotonic() + 5
+        while len(runs) < count:
+            assert time.monotonic() < deadline
+            engine.deliberate()
+            time.sleep(0.005)
+
+    try:
+        cycle_until_run(1)
+        wait_for(lambda: engine.running() == [])
+        assert engine.deliberate() == []  # backing off, not re-queued at once
+        cycle_until_run(2)
+        wait_for(lambda: engine.running() == [])
+        time.sleep(0.25)
+        for _ in range(3):
+            assert engine.deliberate() == []
+        assert len(runs) == 2
+    finally:
+        engine.shutdown(cancel=True)
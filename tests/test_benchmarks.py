@@ -0,0 +1,60 @@
+# benchmarks/ harness: deterministic fake chatter, timing and regression comparison
+import pytest
+
+from benchmarks.compare import compare
+from benchmarks.fake_chatter import FakeChatter
+from benchmarks.suite import run_suite
+from benchmarks.__main__ import main
+
+
+def test_fake_chatter_injects_deterministic_latency():
+    first = FakeChatter(ttft=0.001, tokens_per_s=2000, jitter=0.5, seed=7)
+    second = FakeChatter(ttft=0.001, tokens_per_s=2000, jitter=0.5, seed=7)
+    assert first.generate_response("hello") == first.response
+    second.generate_response("hello")
+    assert first.injected_seconds == second.injected_seconds > 0
+    assert first.last_usage["output_tokens"] == len(first.response.split(" "))
+    assert first.generate_response("... Answer exactly VALID or INVALID.") == "VALID"
+
+
+def test_fake_chatter_failures_surface_as_provider_errors():
+    chatter = FakeChatter(ttft=0, tokens_per_s=0, failure_rate=1.0)
+    assert chatter.generate_response("hello").startswith("error:")
+    assert chatter.failures == 1
+
+
+def test_run_suite_records_timings_and_injected_latency():
+    results = run_suite(["socratic", "logic.tautology"], repeat=2, warmup=0, quick=True,
+                        chatter_config={"ttft": 0.001, "tokens_per_s": 0})
+    draw = results["results"]["socratic.draw_conclusion[premises=1]"]
+    assert draw["repeat"] == 2 and draw["median_s"] > 0
+    assert draw["llm_calls"] == 3  # premise, conclusion, validation
+    assert draw["injected_s"] == pytest.approx(0.003)
+    assert "logic.tautology[variables=4]" in results["results"]
+    assert results["meta"]["chatter"]["ttft"] == 0.001
+
+
+def test_time_case_records_peak_memory():
+    from benchmarks.suite import time_case
+    stats = time_case(lambda: bytearray(1 << 20), repeat=1, warmup=0, memory=True)
+    assert stats["peak_bytes"] >= 1 << 20
+    assert "peak_bytes" not in time_case(lambda: None, repeat=1, warmup=0)
+
+
+def test_compare_flags_regressions():
+    baseline = {"results": {"a": {"median_s": 1.0}, "b": {"median_s": 1.0},
+                            "c": {"median_s": 1.0}, "gone": {"median_s": 1.0}}}
+    candidate = {"results": {"a": {"median_s": 1.05}, "b": {"median_s": 1.5},
+                             "c": {"median_s": 0.5}, "fresh": {"median_s": 1.0}}}
+    status = {row["case"]: row["status"] for row in compare(baseline, candidate, threshold=0.10)}
+    assert status == {"a": "ok", "b": "regression", "c": "improvement",
+                      "gone": "removed", "fresh": "new"}
+
+
+def test_compare_command_exit_code(tmp_path):
+    import ujson
+    base, new = tmp_path / "base.json", tmp_path / "new.json"
+    base.write_text(ujson.dumps({"results": {"a": {"median_s": 1.0}}}))
+    new.write_text(ujson.dumps({"results": {"a": {"median_s": 2.0}}}))
+    assert main(["compare", str(base), str(base)]) == 0
+    assert main(["compare", str(base), str(new)]) == 1
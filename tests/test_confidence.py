@@ -0,0 +1,58 @@
+# fuzzy confidence engine behind SocraticReasoning.last_confidence
+import pytest
+
+pytest.importorskip("numpy")
+
+from automind import confidence
+from automind.confidence import ConfidenceEngine, premise_agreement, score
+
+
+def test_signals_order_the_confidence():
+    tautology = score(truth_table=True)
+    valid = score(verdict=True)
+    retried = score(verdict=True, retries=5)
+    invalid = score(verdict=False)
+    assert tautology > valid > retried > invalid
+    assert score(verdict=True, agreement=1.0) > valid
+    assert score() < 0.4  # nothing validated: a belief, not a truth
+    assert all(0 <= c <= 1 for c in (tautology, valid, retried, invalid))
+
+
+def test_table_matches_the_rule_base():
+    rules, domains = confidence.build_rule_base()
+    np = confidence.fuzzy.np
+    row = {"truth_table": 0.5, "verdict": 1.0, "retries": 2, "agreement": 0.4, "history": 0.7}
+    direct = rules.infer_batch({domains[n]: np.array([v]) for n, v in row.items()})[0]
+    assert score(verdict=True, retries=2, agreement=0.4, history=0.7) == pytest.approx(direct, abs=1e-3)
+
+
+def test_history_and_agreement_signals():
+    engine = ConfidenceEngine(history_size=2)
+    premises = ["Socrates is a human", "all humans are mortal"]
+    assert premise_agreement("Socrates is mortal", premises) == pytest.approx((1 / 2 + 1 / 3) / 2)
+    assert premise_agreement("", premises) == 0.5
+    first = engine.assess("Socrates is mortal", premises, verdict=False)
+    again = engine.assess("socrates   is MORTAL", premises, verdict=True)
+    assert engine.last_signals["history"] == 0.0 and again < score(verdict=True, agreement=0.417)
+    assert first == score(verdict=False, agreement=0.417)
+    engine.assess("b", premises, verdict=True)
+    engine.assess("c", premises, verdict=True)
+    assert list(engine.history) == ["b", "c"]
+
+
+def test_rule_base_is_compiled_once(monkeypatch):
+    # timing lives in the confidence.score benchmark
+    compiled = []
+    compile_table = confidence.compile_table
+    monkeypatch.setattr(confidence, "_table", None)
+    monkeypatch.setattr(confidence, "compile_table", lambda: compiled.append(1) or compile_table())
+    first = score(verdict=True, retries=2, agreement=0.37, history=0.6)
+    for _ in range(1000):
+        assert score(verdict=True, retries=2, agreement=0.37, history=0.6) == first
+    assert len(compiled) == 1
+
+
+def test_fixed_confidences_without_numpy(monkeypatch):
+    monkeypatch.setattr(confidence.fuzzy, "np", None)
+    assert score(truth_table=True) == 1.0 and score(truth_table=False) == 0.4
+    assert score(verdict=True) == 0.9 and score(verdict=False) == 0.4 and score() == 0.3
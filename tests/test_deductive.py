@@ -0,0 +1,122 @@
+# automindx.deductive: indexed implication graph and syllogism queries
+import random
+from collections import defaultdict
+
+from automindx.deductive import Graph, law_of_syllogism, modus_ponens, modus_tollens, proof_chain
+
+
+def random_graph(nodes, edges, seed=0):
+    rng = random.Random(seed)
+    graph = Graph()
+    for _ in range(edges):
+        graph.add_condition_statement(f"n{rng.randrange(nodes)}", f"n{rng.randrange(nodes)}")
+    return graph, rng
+
+
+def brute_force(adjacency, start, dest):
+    seen, stack = {start}, [start]
+    while stack:
+        for nxt in adjacency.get(stack.pop(), ()):
+            if nxt not in seen:
+                seen.add(nxt)
+                stack.append(nxt)
+    return dest in seen
+
+
+def test_reachability_matches_a_plain_search():
+    graph, rng = random_graph(60, 90)
+    plain = {k: list(v) for k, v in graph.get_graph().items()}
+    pairs = [(f"n{rng.randrange(60)}", f"n{rng.randrange(60)}") for _ in range(500)] + [("n1", "x"), ("x", "x")]
+    expected = [brute_force(plain, a, b) for a, b in pairs]
+    assert graph.reachable_many(pairs) == expected
+    assert [law_of_syllogism(graph.get_graph(), a, b) for a, b in pairs] == expected
+    assert [law_of_syllogism(plain, a, b) for a, b in pairs] == expected  # plain dicts still work
+    assert "x" not in plain  # ... without inserting queried names
+
+
+def test_memoized_reach_follows_new_statements():
+    graph = Graph()
+    graph.add_condition_statement("P", "Q")
+    reach = graph.reach("P")
+    assert not graph.reachable("P", "S")
+    graph.add_condition_statement("R", "S")
+    graph.add_condition_statement("Q", "R")  # joins the chains: P now reaches S
+    assert graph.reach("P") is reach and graph.reachable("P", "S")
+    graph.add_condition_statement("S", "P")  # a cycle
+    assert graph.reachable("S", "Q") and graph.reachable("R", "R")
+    assert graph.get_graph()["P"] == ["Q"]
+
+
+def test_modus_ponens_and_tollens():
+    g = Graph()
+    g.add_condition_statement('P', 'Q')
+    g.add_condition_statement('Q', 'R')
+    g.add_condition_statement('P', 'R')
+    assert modus_ponens(g.get_graph(), 'P', 'R', ['P', 'Q']).endswith('3. R')
+    assert modus_ponens(g.get_graph(), 'P', 'K', ['P', 'Q']) == "Don't exist the conclusion"
+    assert modus_tollens(g.get_graph(), 'P', 'Q', ['Q', 'R']).endswith('3. ¬P')
+    g.add_condition_statement('R', 'S')
+    assert modus_ponens(g.get_graph(), 'Q', 'S', ['Q']) == (
+        '1. Q -> R\n2. R -> S\n3. Q\n' + '-' * 20 + '\n4. S')
+    assert modus_tollens(g.get_graph(), 'P', 'S', ['S']) == (
+        '1. P -> R\n2. R -> S\n3. ¬S\n' + '-' * 20 + '\n4. ¬P')
+
+
+def test_unknown_statement_follows_from_itself():
+    graph = Graph()
+    graph.add_condition_statement("P", "Q")
+    assert graph.reachable("K", "K") and graph.proof("K", "K") == ["K"] == proof_chain({}, "K", "K")
+    assert law_of_syllogism(graph.get_graph(), "K", "K")
+    assert modus_ponens(graph.get_graph(), "K", "K", ["K"]) == "1. K -> K\n2. K\n" + "-" * 20 + "\n3. K"
+    assert modus_tollens(graph.get_graph(), "K", "K", ["K"]) == "1. K -> K\n2. ¬K\n" + "-" * 20 + "\n3. ¬K"
+
+
+def test_batched_queries_on_a_large_graph():
+    graph, rng = random_graph(20_000, 20_000, seed=1)
+    pairs = [(f"n{rng.randrange(20_000)}", f"n{rng.randrange(20_000)}") for _ in range(20_000)]
+    answers = graph.reachable_many(pairs)  # timing lives in the deductive.reachable_many benchmark
+    assert len(answers) == len(pairs)
+    sample = defaultdict(list, {k: list(v) for k, v in graph.get_graph().items()})
+    assert [brute_force(sample, a, b) for a, b in pairs[:200]] == answers[:200]
+
+
+def shortest(adjacency, start, dest):
+    frontier, seen, steps = [start], {start}, 0
+    while frontier:
+        if dest in frontier:
+            return steps
+        steps += 1
+        frontier = [n for f in frontier for n in adjacency.get(f, ()) if n not in seen and not seen.add(n)]
+    return None
+
+
+def test_condensation_and_shortest_proofs():
+    graph, rng = random_graph(300, 420, seed=2)  # dense enough for a large cycle plus tails
+    plain = {k: list(v) for k, v in graph.get_graph().items()}
+    condensation = graph.condensation()
+    assert condensation.count < len(graph.names)
+    for targets, c in zip(condensation.dag, range(condensation.count)):
+        assert all(t < c for t in targets)  # reverse topological numbering
+    for _ in range(300):
+        a, b = f"n{rng.randrange(300)}", f"n{rng.randrange(300)}"
+        chain = proof_chain(graph, a, b)
+        assert graph.reachable(a, b) == brute_force(plain, a, b) == (chain is not None)
+        if chain is not None and a in graph.ids:
+            assert chain[0] == a and chain[-1] == b and len(chain) - 1 == shortest(plain, a, b)
+            assert all(y in plain[x] for x, y in zip(chain, chain[1:]))
+            assert proof_chain(plain, a, b) is not None and len(proof_chain(plain, a, b)) == len(chain)
+    graph.add_condition_statement("n0", "fresh")  # invalidates the condensation
+    assert graph.reachable("n0", "fresh") and graph.proof("n0", "fresh") == ["n0", "fresh"]
+
+
+def test_supercritical_graph_queries():
+    graph, rng = random_graph(50_000, 100_000, seed=3)
+    pairs = [(f"n{rng.randrange(50_000)}", f"n{rng.randrange(50_000)}") for _ in range(50_000)]
+    answers = graph.reachable_many(pairs)  # timing lives in the deductive.condensed_queries benchmark
+    sample = defaultdict(list, {k: list(v) for k, v in graph.get_graph().items()})
+    assert [brute_force(sample, a, b) for a, b in pairs[:50]] == answers[:50]
+    for (a, b), reachable in list(zip(pairs, answers))[:50]:
+        chain = graph.proof(a, b)
+        assert (chain is not None) == reachable
+        if chain is not None:
+            assert chain[0] == a and chain[-1] == b and all(y in sample[x] for x, y in zip(chain, chain[1:]))
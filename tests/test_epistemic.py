@@ -0,0 +1,108 @@
+# automindx.epistemic: AutoepistemicAgent truth maintenance and its journal
+import random
+
+import pytest
+
+RULES = [
+    {"default": "Birds can fly", "contradiction": "Penguins can't fly"},
+    {"default": "Birds can fly", "contradiction": "Ostriches can't fly"},
+    {"default": "It is daytime", "contradiction": "It is night"},
+]
+
+
+@pytest.fixture
+def agent_class():
+    from automindx.epistemic import AutoepistemicAgent  # logs to ./epistemic.log: import in the tmp cwd
+    return AutoepistemicAgent
+
+
+def test_new_information_retracts_contradicted_defaults(agent_class):
+    agent = agent_class({"Birds can fly", "It is daytime"}, RULES)
+    agent.add_information({"Penguins can't fly"})
+    assert agent.beliefs == {"It is daytime", "Penguins can't fly"}
+    agent.add_information({"It is night"})
+    assert agent.beliefs == {"Penguins can't fly", "It is night"}
+    agent.prioritize_belief("It is night", 3)
+    assert agent.belief_priority["It is night"] == 3
+
+
+def test_dependents_follow_their_justifications(agent_class):
+    agent = agent_class({"Birds can fly"}, RULES)
+    agent.add_justification("Birds nest in trees", ["Birds can fly"])
+    agent.add_justification("Eggs are safe", ["Birds nest in trees"])
+    assert {"Birds nest in trees", "Eggs are safe"} <= agent.beliefs
+    agent.add_information({"Ostriches can't fly"})
+    assert agent.beliefs == {"Ostriches can't fly"}
+    agent.retract_information({"Ostriches can't fly"})
+    assert agent.beliefs == {"Birds can fly", "Birds nest in trees", "Eggs are safe"}
+
+
+def test_incremental_revision_matches_a_full_revision(agent_class):
+    rng = random.Random(0)
+    defaults = [f"d{i}" for i in range(30)]
+    contradictions = [f"c{i}" for i in range(15)]
+    for _ in range(20):
+        rules = [{"default": rng.choice(defaults), "contradiction": rng.choice(contradictions)} for _ in range(25)]
+        agent = agent_class(set(rng.sample(defaults, 10)), rules)
+        for step in range(40):
+            roll = rng.random()
+            if roll < 0.4:
+                agent.add_information({rng.choice(defaults + contradictions)})
+            elif roll < 0.6:
+                agent.retract_information({rng.choice(sorted(agent.told))} if agent.told else set())
+            elif roll < 0.7:
+                i = rng.randrange(1, len(defaults))
+                agent.add_justification(defaults[i], rng.sample(defaults[:i], min(i, rng.randint(1, 2))))
+            elif roll < 0.8:  # may close a cycle of beliefs justifying each other
+                i = rng.randrange(len(defaults))
+                agent.add_justification(defaults[i], rng.sample(defaults[:i] + defaults[i + 1:], rng.randint(1, 2)))
+            else:
+                agent.add_default_rule(rng.choice(defaults), rng.choice(contradictions))
+            incremental = set(agent.beliefs)
+            agent.revise_beliefs()
+            assert agent.beliefs == incremental
+
+
+def test_cyclic_justifications_fall_with_their_support(agent_class):
+    agent = agent_class({"a"}, [])
+    agent.add_justification("b", ["a"])
+    agent.add_justification("a", ["b"])
+    assert agent.beliefs == {"a", "b"}
+    agent.retract_information({"a"})
+    assert agent.beliefs == set()
+    agent.add_information({"a"})
+    assert agent.beliefs == {"a", "b"}
+
+
+def test_journal_replays_and_compacts(agent_class, tmp_path):
+    journal = tmp_path / "beliefs.jsonl"
+    agent = agent_class({"Birds can fly", "It is daytime"}, RULES, journal_path=str(journal))
+    agent.add_information({"It is night"})
+    agent.add_justification("Birds nest in trees", ["Birds can fly"])
+    agent.add_default_rule("Birds nest in trees", "No trees")
+    agent.prioritize_belief("Birds can fly", 2)
+    agent.retract_information({"It is night"})
+    with open(journal, "a") as f:
+        f.write('{"op": "tell", "beli')  # torn by a crash
+    restored = agent_class({"Birds can fly", "It is daytime"}, RULES)
+    restored.load_journal(str(journal))
+    assert restored.beliefs == agent.beliefs and restored.belief_priority == agent.belief_priority
+    restored.add_information({"No trees"})
+    restored.compact_journal()
+    assert len(journal.read_text().splitlines()) == 1
+    again = agent_class(set(), [])
+    again.load_journal(str(journal))
+    assert again.beliefs == restored.beliefs == {"Birds can fly", "It is daytime", "No trees"}
+
+
+def test_revision_touches_only_affected_beliefs(agent_class):
+    beliefs = {f"default {i}" for i in range(2000)}
+    rules = [{"default": f"default {i}", "contradiction": f"exception {i}"} for i in range(2000)]
+    agent = agent_class(beliefs, rules)
+    checked = []
+    holds = agent._holds
+    agent._holds = lambda belief: checked.append(belief) or holds(belief)
+    for i in range(0, 2000, 10):
+        agent.add_information({f"exception {i}"})
+    assert len(checked) <= 2 * 200  # each exception and its default, not 2000 checks per call
+    assert len(agent.beliefs) == 2000  # 200 defaults out, 200 exceptions in
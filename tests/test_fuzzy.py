@@ -0,0 +1,454 @@
+# automindx.fuzzy: array-native membership functions agree with the scalar closures
+import gc
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("matplotlib")
+
+from automindx import fuzzy
+
+GRID = np.concatenate([np.linspace(-20, 120, 1401), [0, 25, 50, 75, 100, -math.inf, math.inf]])
+
+FACTORIES = {
+    "singleton": lambda: fuzzy.singleton(50),
+    "linear": lambda: fuzzy.linear(0.02, -0.5),
+    "step": lambda: fuzzy.step(50, left=0.2, right=0.9),
+    "bounded_linear": lambda: fuzzy.bounded_linear(20, 80),
+    "bounded_linear_inverse": lambda: fuzzy.bounded_linear(20, 80, inverse=True),
+    "R": lambda: fuzzy.R(10, 90),
+    "S": lambda: fuzzy.S(10, 90),
+    "rectangular": lambda: fuzzy.rectangular(30, 60, c_m=0.8),
+    "triangular": lambda: fuzzy.triangular(0, 100, c=30),
+    "trapezoid": lambda: fuzzy.trapezoid(10, 40, 60, 90, c_m=0.9, no_m=0.1),
+    "sigmoid": lambda: fuzzy.sigmoid(1, 0.3, 50),
+    "bounded_sigmoid": lambda: fuzzy.bounded_sigmoid(20, 80),
+    "bounded_sigmoid_inverse": lambda: fuzzy.bounded_sigmoid(20, 80, inverse=True),
+    "bounded_exponential": lambda: fuzzy.bounded_exponential(0.05),
+    "simple_sigmoid": lambda: fuzzy.simple_sigmoid(),
+    "triangular_sigmoid": lambda: fuzzy.triangular_sigmoid(0, 100),
+    "gauss": lambda: fuzzy.gauss(50, 0.01, c_m=0.9),
+    "inv": lambda: fuzzy.inv(fuzzy.triangular(0, 100)),
+    "alpha": lambda: fuzzy.alpha(floor=0.2, ceiling=0.8, func=fuzzy.triangular(0, 100)),
+    "normalize": lambda: fuzzy.normalize(0.8, fuzzy.gauss(50, 0.01, c_m=0.8)),
+    "moderate": lambda: fuzzy.moderate(fuzzy.R(0, 100)),
+    "very": lambda: fuzzy.very(fuzzy.triangular(0, 100)),
+    "minus": lambda: fuzzy.minus(fuzzy.R(0, 100)),
+}
+
+A, B = fuzzy.triangular(0, 80), fuzzy.gauss(60, 0.005)
+COMBINATORS = {
+    "MIN": fuzzy.MIN(A, B), "MAX": fuzzy.MAX(A, B), "product": fuzzy.product(A, B),
+    "bounded_sum": fuzzy.bounded_sum(A, B), "lukasiewicz_AND": fuzzy.lukasiewicz_AND(A, B),
+    "lukasiewicz_OR": fuzzy.lukasiewicz_OR(A, B), "einstein_product": fuzzy.einstein_product(A, B),
+    "einstein_sum": fuzzy.einstein_sum(A, B), "hamacher_product": fuzzy.hamacher_product(A, B),
+    "hamacher_sum": fuzzy.hamacher_sum(A, B), "lambda_op": fuzzy.lambda_op(0.3)(A, B),
+    "gamma_op": fuzzy.gamma_op(0.4)(A, B), "simple_disjoint_sum": fuzzy.simple_disjoint_sum(A, B),
+}
+
+
+def scalar_reference(func, xs):
+    return np.array([func(x) for x in xs], dtype=float)
+
+
+@pytest.mark.parametrize("name", sorted(FACTORIES))
+def test_membership_vector_matches_scalar(name):
+    func = FACTORIES[name]()
+    assert hasattr(func, "vector")
+    # the scalar bounded_exponential divides by exp(-inf) == 0 at -inf
+    grid = GRID[np.isfinite(GRID)] if name == "bounded_exponential" else GRID
+    np.testing.assert_allclose(fuzzy.evaluate_array(func, grid), scalar_reference(func, grid),
+                               rtol=1e-12, atol=1e-12, equal_nan=True)
+
+
+@pytest.mark.parametrize("name", sorted(COMBINATORS))
+def test_combinator_vector_matches_scalar(name):
+    func = COMBINATORS[name]
+    grid = GRID[np.isfinite(GRID)]
+    np.testing.assert_allclose(fuzzy.evaluate_array(func, grid), scalar_reference(func, grid),
+                               rtol=1e-12, atol=1e-12, equal_nan=True)
+
+
+def test_functions_without_vector_fall_back_to_scalar_calls():
+    xs = np.linspace(0, 1, 11)
+    np.testing.assert_allclose(fuzzy.evaluate_array(lambda x: x * x, xs), xs ** 2)
+
+
+def test_set_and_domain_take_the_vector_path():
+    temp = fuzzy.Domain("temp", 0, 100, res=0.5)
+    temp.hot = fuzzy.R(50, 90)
+    temp.cold = fuzzy.S(10, 50)
+    expected = scalar_reference(temp.hot.func, temp.range)
+    np.testing.assert_allclose(temp.hot.array(), expected)
+    assert temp.hot.cardinality == pytest.approx(expected.sum())
+    assert temp.hot.center_of_gravity() == pytest.approx(np.average(temp.range, weights=expected))
+    values = np.array([0.0, 30.0, 70.0])
+    memberships = temp(values)
+    np.testing.assert_allclose(memberships["cold"], [temp(x)["cold"] for x in values])
+    np.testing.assert_allclose(temp.hot(values), [0.0, 0.0, 0.5])
+    with pytest.raises(fuzzy.FuzzyWarning):
+        temp(np.array([50.0, 101.0]))
+
+
+def test_million_point_domain():
+    # timing lives in the fuzzy.set_array benchmark
+    fine = fuzzy.Domain("fine", 0, 1, res=1e-6)
+    fine.mid = fuzzy.trapezoid(0.2, 0.4, 0.6, 0.8)
+    values = fine.mid.array()
+    assert values.shape == (1_000_001,)
+    np.testing.assert_allclose(values[[0, 300_000, 500_000, 700_000, 1_000_000]], [0.0, 0.5, 1.0, 0.5, 0.0], atol=1e-6)
+
+
+def test_expression_dag_simplifies_hedges_and_associative_ops():
+    temp = fuzzy.Domain("temp", 0, 100)
+    temp.warm = fuzzy.triangular(20, 80)
+    temp.hot = fuzzy.R(60, 90)
+    temp.cold = fuzzy.S(10, 40)
+    hedged = fuzzy.very(fuzzy.plus(temp.warm))
+    assert repr(hedged.expr.simplified()) == "pow(triangular; 2.5)"
+    assert repr((~~temp.warm).expr.simplified()) == "triangular"
+    conj = (temp.warm & temp.hot) & (temp.cold & temp.warm)
+    flat = conj.expr.simplified()
+    assert flat.kind == "min" and len(flat.children) == 3
+    for s in (hedged, conj, temp.warm | ~temp.cold, (temp.warm * temp.hot) ** 0.5, temp.warm ^ temp.hot):
+        np.testing.assert_allclose(s.array(), scalar_reference(s.func, temp.range), atol=1e-12)
+
+
+def test_dag_results_are_cached_per_node_and_domain():
+    calls = []
+
+    def counted(x):
+        return 0.5
+
+    counted.vector = lambda xs: calls.append(len(xs)) or np.full(xs.shape, 0.5)
+    temp = fuzzy.Domain("temp", 0, 100)
+    temp.flat = counted
+    composed = fuzzy.very(temp.flat) | temp.flat
+    first = composed.array()
+    assert composed.array() is first and not first.flags.writeable
+    assert calls == [101]  # the shared leaf was evaluated once
+    temp.flat.array()
+    assert calls == [101]  # ... and its grid values are reused by the plain set
+    finer = fuzzy.Domain("temp", 0, 100, res=0.5)
+    finer.flat = counted
+    finer.flat.array()
+    assert calls == [101, 201]
+
+
+def test_domain_grid_is_cached_and_invalidated():
+    temp = fuzzy.Domain("temp", 0, 10)
+    grid = temp.range
+    assert temp.range is grid and not grid.flags.writeable
+    temp._res = 0.5
+    assert len(temp.range) == 21 and temp.range is not grid
+
+
+def test_set_memoizes_array_and_center_of_gravity():
+    calls = []
+
+    def counted(x):
+        return 1.0
+
+    counted.vector = lambda xs: calls.append(len(xs)) or np.where(xs < 5, 1.0, 0.0)
+    temp = fuzzy.Domain("temp", 0, 10)
+    temp.low = counted
+    assert temp.low.center_of_gravity() == pytest.approx(2.0)
+    assert temp.low.center_of_gravity() == pytest.approx(2.0)
+    assert calls == [11]
+    temp.low.func = fuzzy.R(5, 10)
+    assert temp.low.center_of_gravity() == pytest.approx(np.average(temp.range, weights=temp.low.array()))
+    temp._high = 20
+    assert temp.low.array().shape == (21,)
+
+
+def test_rule_infers_weighted_center_of_gravity():
+    temp = fuzzy.Domain("temp", 0, 100)
+    temp.cold = fuzzy.S(0, 50)
+    temp.hot = fuzzy.R(50, 100)
+    power = fuzzy.Domain("power", 0, 10)
+    power.low = fuzzy.triangular(0, 4)
+    power.high = fuzzy.triangular(6, 10)
+    rule = fuzzy.Rule({(temp.cold,): power.high, (temp.hot,): power.low})
+    assert rule({temp: 0}) == pytest.approx(power.high.center_of_gravity())
+    mixed = rule({temp: 25})  # cold 0.5, hot 0
+    assert mixed == pytest.approx(power.high.center_of_gravity())
+    assert rule({temp: 50}) is None
+
+
+def controller():
+    temp = fuzzy.Domain("temp", 0, 100)
+    temp.cold = fuzzy.S(0, 50)
+    temp.warm = fuzzy.triangular(20, 80)
+    temp.hot = fuzzy.R(50, 100)
+    hum = fuzzy.Domain("hum", 0, 1, res=0.01)
+    hum.dry = fuzzy.S(0, 0.6)
+    hum.wet = fuzzy.R(0.4, 1)
+    fan = fuzzy.Domain("fan", 0, 10, res=0.05)
+    fan.slow = fuzzy.triangular(0, 5)
+    fan.medium = fuzzy.triangular(2, 8)
+    fan.fast = fuzzy.triangular(5, 10)
+    rules = {(temp.cold, hum.dry): fan.slow, (temp.cold, hum.wet): fan.slow,
+             (temp.warm, hum.dry): fan.medium, (temp.warm, hum.wet): fan.fast,
+             (temp.hot,): fan.fast}
+    return temp, hum, fan, rules
+
+
+def mamdani_reference(rules, fan, t, h, implication, aggregation, method):
+    grid = fan.range
+    aggregated = np.zeros(len(grid))
+    for antecedents, consequent in rules.items():
+        w = min(a.func(t if a.domain._name == "temp" else h) for a in antecedents)
+        w = max(w, 0)
+        shaped = np.minimum(w, consequent.array()) if implication == "min" else w * consequent.array()
+        if aggregation == "max":
+            aggregated = np.maximum(aggregated, shaped)
+        else:
+            aggregated = aggregated + shaped
+    if aggregated.sum() == 0:
+        return np.nan
+    if method == "cog":
+        return np.average(grid, weights=aggregated)
+    if method == "mom":
+        return grid[aggregated == aggregated.max()].mean()
+    area = np.cumsum(aggregated)
+    return grid[np.searchsorted(area, area[-1] / 2)]
+
+
+@pytest.mark.parametrize("implication,aggregation,method", [
+    ("min", "max", "cog"), ("min", "max", "mom"), ("min", "max", "bisector"),
+    ("product", "sum", "cog"), ("product", "max", "bisector")])
+def test_infer_batch_mamdani_matches_row_by_row(implication, aggregation, method):
+    temp, hum, fan, rules = controller()
+    rng = np.random.default_rng(1)
+    t, h = rng.uniform(0, 100, 200), rng.uniform(0, 1, 200)
+    base = fuzzy.RuleBase(rules, implication=implication, aggregation=aggregation)
+    batch = base.infer_batch({temp: t, hum: h}, method=method)
+    expected = [mamdani_reference(rules, fan, a, b, implication, aggregation, method) for a, b in zip(t, h)]
+    np.testing.assert_allclose(batch, expected, rtol=1e-9, equal_nan=True)
+
+
+def test_infer_batch_sugeno_and_rule_arrays_match_scalar_rule():
+    temp = fuzzy.Domain("temp", 0, 100)
+    temp.cold = fuzzy.S(0, 50)
+    temp.hot = fuzzy.R(50, 100)
+    fan = fuzzy.Domain("fan", 0, 10)
+    fan.slow = fuzzy.triangular(0, 5)
+    fan.fast = fuzzy.triangular(5, 10)
+    rule = fuzzy.Rule({(temp.cold,): fan.slow, (temp.hot,): fan.fast})
+    t = np.linspace(0, 100, 41)
+    expected = [rule({temp: x}) for x in t]
+    expected = [np.nan if v is None else v for v in expected]
+    np.testing.assert_allclose(rule({temp: t}), expected, equal_nan=True)
+    sugeno = fuzzy.RuleBase({temp.cold: 1.0, temp.hot: lambda inputs: inputs[temp] / 10}, mode="sugeno")
+    np.testing.assert_allclose(sugeno.infer_batch({temp: np.array([0.0, 100.0, 25.0])}), [1.0, 10.0, 1.0])
+
+
+def test_rule_base_rejects_bad_configuration():
+    temp, hum, fan, rules = controller()
+    with pytest.raises(ValueError):
+        fuzzy.RuleBase(rules, defuzzify="centroid")
+    with pytest.raises(fuzzy.FuzzyWarning):
+        fuzzy.RuleBase({temp.cold: fan.slow, temp.hot: hum.dry})
+    with pytest.raises(KeyError):
+        fuzzy.RuleBase(rules).infer_batch({temp: np.zeros(3)})
+
+
+def test_tabulated_set_stays_within_tolerance():
+    temp = fuzzy.Domain("temp", 0, 100, res=0.5)
+    temp.mild = fuzzy.triangular_sigmoid(10, 90)
+    table = temp.mild.tabulate(tolerance=1e-5)
+    lookup = table.func.table
+    assert isinstance(lookup, fuzzy.LookupTable) and lookup.max_deviation() <= 1e-5
+    probe = np.random.default_rng(3).uniform(0, 100, 2000)
+    exact = fuzzy.evaluate_array(temp.mild.func, probe)
+    assert np.max(np.abs(table(probe) - exact)) <= 1e-5
+    assert max(abs(lookup(x) - temp.mild.func(x)) for x in probe[:200]) <= 1e-5
+    assert lookup(150) == temp.mild.func(150)  # outside the grid: exact function
+
+
+def test_nearest_table_and_precompile():
+    temp = fuzzy.Domain("temp", 0, 100)
+    temp.peak = fuzzy.gauss(50, 0.01)
+    nearest = temp.peak.tabulate(1.0, mode="nearest").func.table
+    assert nearest(50.2) == temp.peak.func(50)
+    assert nearest.max_deviation() > 0
+    exact = temp.peak.func
+    temp.peak.precompile(tolerance=1e-4)
+    assert temp.peak.func.exact is exact and temp.peak.func.table.max_deviation() <= 1e-4
+    np.testing.assert_allclose(temp.peak.array(), fuzzy.evaluate_array(exact, temp.range), atol=1e-4)
+    temp.edge = fuzzy.step(50.25)
+    with pytest.raises(fuzzy.FuzzyWarning):
+        temp.edge.tabulate(tolerance=1e-3, max_points=1000)
+
+
+def test_rule_from_table_parses_without_pandas_or_eval():
+    temp, hum, fan, _ = controller()
+    table = """
+                 hum.dry          hum.wet
+    temp.cold    fan.slow         very(fan.slow)
+    temp.hot     fan.medium|fan.fast  -
+    """
+    rule = fuzzy.rule_from_table(table, {"temp": temp, "hum": hum, "fan": fan})
+    assert rule[(temp.cold, hum.dry)] is fan.slow
+    assert repr(rule[(temp.cold, hum.wet)].expr.simplified()) == "pow(triangular; 2)"
+    np.testing.assert_allclose(rule[(temp.hot, hum.dry)].array(), (fan.medium | fan.fast).array())
+    assert len(rule.conditions) == 3  # "-" has no rule
+    with pytest.raises(fuzzy.FuzzyWarning, match="unexpected"):
+        fuzzy.rule_from_table("hum.dry\ntemp.cold __import__('os')", {"temp": temp, "hum": hum})
+    with pytest.raises(fuzzy.FuzzyWarning, match="unknown name"):
+        fuzzy.rule_from_table("hum.dry\ntemp.cold __import__", {"temp": temp, "hum": hum})
+    with pytest.raises(fuzzy.FuzzyWarning, match="no set"):
+        fuzzy.rule_from_table("hum.damp\ntemp.cold fan.slow", {"temp": temp, "hum": hum, "fan": fan})
+
+
+def test_rule_from_table_n_dimensional_and_operators():
+    temp, hum, fan, _ = controller()
+    refs = {"t": temp, "h": hum, "f": fan}
+    table = """
+                 h.dry       h.wet
+    t.cold ~t.hot   f.slow      f.medium**0.5
+    t.hot t.warm    -f.fast     (f.slow&f.medium)+f.fast
+    """
+    conditions = fuzzy.parse_rule_table(table, refs)
+    keys = list(conditions)
+    assert len(keys) == 4 and all(len(k) == 3 for k in keys)
+    assert keys[0][0] is temp.cold and keys[0][2] is hum.dry
+    np.testing.assert_allclose(conditions[keys[2]].array(), 1 - fan.fast.array())
+
+
+def test_rule_table_cache():
+    # parse timing lives in the fuzzy.rule_table benchmark
+    temp = fuzzy.Domain("temp", 0, 100)
+    hum = fuzzy.Domain("hum", 0, 100)
+    fan = fuzzy.Domain("fan", 0, 10)
+    for i in range(100):
+        setattr(temp, f"t{i}", fuzzy.triangular(i - 1, i + 1))
+        setattr(hum, f"h{i}", fuzzy.triangular(i - 1, i + 1))
+    for name in ("slow", "medium", "fast"):
+        setattr(fan, name, fuzzy.triangular(0, 10))
+    speeds = ("fan.slow", "fan.medium", "very(fan.fast)")
+    header = " ".join(f"hum.h{j}" for j in range(100))
+    rows = [f"temp.t{i} " + " ".join(speeds[(i + j) % 3] for j in range(100)) for i in range(100)]
+    table = "\n".join([header] + rows)
+    refs = {"temp": temp, "hum": hum, "fan": fan}
+    rule = fuzzy.rule_from_table(table, refs)
+    assert len(rule.conditions) == 10000
+    assert fuzzy.rule_from_table(table, refs) is rule
+    assert fuzzy.rule_from_table(table, dict(refs, fan=fuzzy.Domain("fan", 0, 10, sets=fan._sets))) is not rule
+    fan.slow = fuzzy.triangular(0, 5)  # reassigned in place: the cached rule would use the old set
+    fresh = fuzzy.rule_from_table(table, refs)
+    assert fresh is not rule and any(v is fan.slow for v in fresh.conditions.values())
+    assert fuzzy.rule_from_table(table, refs) is fresh
+
+
+def test_support_propagates_through_the_dag():
+    temp = fuzzy.Domain("temp", 0, 100)
+    temp.warm, temp.hot = fuzzy.triangular(20, 60), fuzzy.R(50, 90)
+    temp.spike, temp.bell = fuzzy.singleton(70), fuzzy.gauss(50, 0.01)
+    assert temp.warm.expr.support() == ((20, 60),)
+    assert (temp.warm & temp.hot).expr.support() == ((50, 60),)
+    assert (temp.warm | temp.spike).expr.support() == ((20, 60), (70, 70))
+    assert (temp.warm * temp.bell).expr.support() == ((20, 60),)
+    assert fuzzy.very(temp.warm).expr.support() == ((20, 60),)
+    assert (temp.warm | temp.bell).expr.support() is None
+    assert (~temp.warm).expr.support() is None
+    temp.cold = fuzzy.S(0, 10)
+    assert (temp.warm & temp.cold).expr.support() == ()
+
+
+def twin_domains(res):
+    domains = []
+    for _ in range(2):
+        d = fuzzy.Domain("x", 0, 1000, res=res)
+        d.a, d.b = fuzzy.triangular(400, 430), fuzzy.trapezoid(395, 405, 420, 440)
+        d.s = fuzzy.singleton(600)
+        domains.append(d)
+    return domains
+
+
+@pytest.mark.parametrize("res", [1, 0.25])
+def test_sparse_sets_match_the_dense_path(res):
+    sparse, dense = twin_domains(res)
+    cases = [lambda d: d.a, lambda d: d.a | d.s, lambda d: d.a & d.b, lambda d: fuzzy.very(d.b) + d.s]
+    for case in cases:
+        s, t = case(sparse), case(dense)
+        t.array()  # a sampled array switches t to the dense path
+        assert s._sparse() is not None and t._sparse() is None
+        assert len(s) == len(t) == len(dense.range)
+        assert s.cardinality == pytest.approx(t.cardinality)
+        assert s.center_of_gravity() == pytest.approx(t.center_of_gravity())
+        assert s.normalized().cardinality == pytest.approx(t.normalized().cardinality)
+        np.testing.assert_allclose(s.sparse().to_dense(), t.array(), atol=1e-12)
+    for x, y in [("a", "b"), ("a", "a"), ("s", "a"), ("b", "a")]:
+        for op in ("__eq__", "__le__", "__lt__", "__ge__", "__gt__"):
+            expected = getattr(getattr(dense, x), op)(getattr(dense, y))
+            assert getattr(getattr(sparse, x), op)(getattr(sparse, y)) == expected, (x, op, y)
+    roundtrip = fuzzy.SparseSet.from_array(dense, dense.a.array())
+    assert roundtrip.stored < 30 * 4 / res and np.array_equal(roundtrip.to_dense(), dense.a.array())
+
+
+def test_alpha_cuts():
+    sparse, dense = twin_domains(1)
+    assert sparse.a.alpha_cut(0.5) == [(408.0, 422.0)]
+    assert sparse.a.alpha_cut(1) == [(415.0, 415.0)]
+    assert (sparse.a | sparse.s).alpha_cut(0, strong=True) == [(401.0, 429.0), (600.0, 600.0)]
+    assert sparse.a.alpha_cut(0) == [(0, 1000)]
+    dense.a.array()
+    assert dense.a.alpha_cut(0.5) == sparse.a.alpha_cut(0.5)
+
+
+def test_ten_million_point_domain_stays_sparse():
+    import tracemalloc
+    huge = fuzzy.Domain("huge", 0, 10_000_000)
+    huge.narrow, huge.wide = fuzzy.triangular(5e6, 5e6 + 100), fuzzy.trapezoid(4.99e6, 4.995e6, 5.005e6, 5.01e6)
+    tracemalloc.start()
+    try:
+        assert huge.narrow.cardinality == pytest.approx(50)
+        assert huge.narrow.center_of_gravity() == pytest.approx(5e6 + 50)
+        assert huge.narrow <= huge.wide and not huge.narrow < huge.wide
+        assert len(huge.narrow) == 10_000_001
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert huge._grid is None and peak < 4 << 20  # the dense grid alone would be 80 MB
+
+
+def spec_sets():
+    temp = fuzzy.Domain("temp", 0, 100, res=0.5)
+    temp.warm, temp.bell, temp.hot = fuzzy.triangular(20, 60), fuzzy.gauss(50, 0.01), fuzzy.R(30, 70)
+    return temp, [temp.warm, fuzzy.very(temp.warm) | ~temp.bell, (temp.warm & temp.hot).multiplied(0.5),
+                  temp.bell.tabulate(tolerance=1e-4), temp.warm.dilated() + temp.hot * temp.bell,
+                  fuzzy.alpha(floor=0.2, func=temp.bell.func), fuzzy.lambda_op(0.3)(temp.warm.func, temp.hot.func)]
+
+
+def test_function_specs_round_trip_through_pickle():
+    import pickle
+    temp, sets = spec_sets()
+    for s in sets:
+        rebuilt = fuzzy.from_spec(pickle.loads(pickle.dumps(fuzzy.function_spec(s))))
+        expected = s.array() if isinstance(s, fuzzy.Set) else fuzzy.evaluate_array(s, temp.range)
+        np.testing.assert_allclose(fuzzy.evaluate_array(rebuilt, temp.range), expected, atol=1e-12)
+    shared = temp.warm | fuzzy.very(temp.warm)
+    rebuilt = fuzzy.from_spec(fuzzy.function_spec(shared))
+    assert rebuilt.expr.simplified().size() == shared.expr.simplified().size() == 3
+    with pytest.raises(fuzzy.FuzzyWarning):
+        fuzzy.function_spec(lambda x: x / 100)
+
+
+def test_evaluate_sets_in_worker_processes():
+    temp, sets = spec_sets()
+    expected = fuzzy.parallel.evaluate_sets(sets, temp, workers=1)
+    assert expected.shape == (len(sets), len(temp.range))
+    np.testing.assert_allclose(expected[1], sets[1].array())
+    values = fuzzy.parallel.evaluate_sets(sets * 3, temp, workers=2, chunk=4)
+    np.testing.assert_allclose(values, np.vstack([expected] * 3), atol=1e-12)
+    segment = values.base  # the shared output itself, not a copy, mapped while a view of it lives
+    row = values[4]
+    del values
+    gc.collect()
+    assert not segment.closed
+    np.testing.assert_allclose(row, expected[4], atol=1e-12)
+    del row
+    gc.collect()
+    assert segment.closed
@@ -5,6 +5,7 @@ import pytest
 
 MODULES = [
     "memory.memory",
+    "memory.thotlog",
     "webmind.api",
     "webmind.chatter",
     "webmind.ollama_handler",
@@ -20,7 +21,9 @@ MODULES = [
     "automindx.make_decision",
     "automindx.epistemic",
     "automindx.deductive",
+    "automindx.unification",
     "automindx.fuzzy",
+    "automindx.fuzzy.parallel",
     "automindx.nonmonotonic",
     "automindx.abduction",
     "automindx.prediction",
@@ -0,0 +1,72 @@
+# automindx.make_decision: budgeted, convergent decision loop
+import json
+import pathlib
+import time
+
+import pytest
+
+from automind.metrics import CACHE_REQUESTS
+from automindx.make_decision import UNDECIDED, DecisionBudget, DecisionMaker
+
+
+def judged(base, valid, drifting=False, delay=0.0):
+    """A chatter class judging every conclusion VALID or INVALID; drifting answers never repeat."""
+    class Judge(base):
+        def _answer(self, knowledge):
+            time.sleep(delay)
+            if "Answer exactly VALID or INVALID" in knowledge:
+                return "VALID" if valid else "INVALID"
+            return f"{self.response} {len(self.calls)}" if drifting else self.response
+    return Judge()
+
+
+def decide(chatter, **options):
+    maker = DecisionMaker(chatter, budget=DecisionBudget(**options))
+    maker.add_premise("All humans are mortal.")
+    maker.add_premise("Socrates is a human.")
+    decision = maker.make_decision(enable_additional_premises=True, autonomous=True)
+    saved = sorted(pathlib.Path("mindx/decisions").glob("decision_*.json"))[-1]
+    return maker, decision, json.loads(saved.read_text())
+
+
+def test_unbounded_autonomous_loop_stops_at_the_call_budget(mock_chatter):
+    chatter = judged(type(mock_chatter), valid=False, drifting=True)
+    maker, decision, saved = decide(chatter, max_calls=40)
+    assert decision == "Unable to make a decision based on the current premises."
+    assert saved["budget"]["stop"] == "max_calls" and saved["budget"]["llm_calls"] == 40 == len(chatter.calls)
+    assert saved["budget"]["tokens"] > 0 and maker.chatter is chatter
+
+
+def test_stops_when_the_conclusion_stops_changing(mock_chatter):
+    chatter = judged(type(mock_chatter), valid=False)
+    _, _, saved = decide(chatter, max_calls=500)
+    assert saved["budget"]["stop"] == "converged" and saved["budget"]["llm_calls"] < 20
+
+
+def test_validation_verdicts_are_memoized(mock_chatter):
+    def hits():
+        return CACHE_REQUESTS.collect().get(("decision.validation", "hit"), 0)
+    before = hits()
+    maker, decision, saved = decide(mock_chatter)
+    assert decision == mock_chatter.response and saved["budget"]["stop"] == "decided"
+    judgments = [c for c in mock_chatter.calls if "Answer exactly VALID or INVALID" in c]
+    assert len(judgments) == len(maker.verdicts) == 1  # asked once, reused by the loop
+    assert hits() > before and saved["budget"]["llm_calls"] == len(mock_chatter.calls)
+
+
+@pytest.mark.parametrize("limit", [{"deadline": 0.3}, {"max_tokens": 200}])
+def test_deadline_and_token_limits(mock_chatter, limit):
+    chatter = judged(type(mock_chatter), valid=False, drifting=True, delay=0.02)
+    _, _, saved = decide(chatter, max_calls=None, **limit)
+    assert saved["budget"]["stop"] == next(iter(limit))
+
+
+def test_an_unvalidated_decision_says_so(mock_chatter):
+    chatter = judged(type(mock_chatter), valid=False, drifting=True)
+    maker = DecisionMaker(chatter, budget=DecisionBudget(max_calls=200))
+    maker.set_max_premises(0)  # no additional-premise pass to converge in
+    maker.add_premise("All humans are mortal.")
+    maker.add_premise("Socrates is a human.")
+    assert maker.make_decision(enable_additional_premises=False, autonomous=False) == UNDECIDED
+    saved = json.loads(sorted(pathlib.Path("mindx/decisions").glob("decision_*.json"))[-1].read_text())
+    assert saved["budget"]["stop"] == "unvalidated"
@@ -0,0 +1,110 @@
+# Prometheus text exposition: per-thread counters, histograms, span feed, /metrics route
+import asyncio
+import threading
+
+import httpx
+
+from automind.metrics import (Registry, MetricsExporter, LLM_REQUESTS, FILE_IO_LATENCY, record_tokens, TOKENS,
+                              CACHE_REQUESTS)
+from automind.tracing import Tracer
+
+
+def test_counter_sums_per_thread_cells():
+    registry = Registry()
+    calls = registry.counter("test_calls_total", "calls", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            calls.inc(kind="a")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls.value(kind="a") == 4000
+    assert 'test_calls_total{kind="a"} 4000' in registry.render()
+
+
+def test_exited_threads_fold_their_cells():
+    registry = Registry()
+    latency = registry.histogram("test_churn_seconds", "latency", buckets=(0.1, 1.0))
+    calls = registry.counter("test_churn_total", "calls")
+    for _ in range(200):  # short-lived threads, like a pool per call
+        t = threading.Thread(target=lambda: (latency.observe(0.05), calls.inc()))
+        t.start()
+        t.join()
+    assert len(latency._cells) <= 1 and len(calls._cells) <= 1
+    assert latency.collect()[()][2] == 200 and calls.value() == 200
+    latency.observe(0.5)
+    assert latency.collect()[()][0] == [200, 1]
+
+
+def test_histogram_exposition():
+    registry = Registry()
+    latency = registry.histogram("test_seconds", "latency", buckets=(0.1, 1.0))
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+    text = registry.render()
+    assert "# TYPE test_seconds histogram" in text
+    assert 'test_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_seconds_bucket{le="1"} 2' in text
+    assert 'test_seconds_bucket{le="+Inf"} 3' in text
+    assert "test_seconds_count 3" in text
+
+
+def test_gauge_callback_and_label_escaping():
+    registry = Registry()
+    registry.gauge("test_depth", "depth", lambda: {('say "hi"',): 2}, labelnames=("queue",))
+    assert 'test_depth{queue="say \\"hi\\""} 2' in registry.render()
+
+
+def test_spans_feed_metrics():
+    tracer = Tracer()
+    tracer.enable(MetricsExporter())
+    before = LLM_REQUESTS.value(provider="unit", status="error")
+    try:
+        with tracer.span("llm", provider="unit"):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+    with tracer.span("file.write", path="./memory/unit/x.json"):
+        pass
+    assert LLM_REQUESTS.value(provider="unit", status="error") == before + 1
+    assert ("memory/unit",) in FILE_IO_LATENCY.collect()
+
+
+def test_record_tokens():
+    before = TOKENS.value(provider="unit", direction="output")
+    record_tokens("unit", 10, 25)
+    assert TOKENS.value(provider="unit", direction="output") == before + 25
+
+
+def test_caches_count_hits_and_misses():
+    from automind.logic import LogicTables
+    from automindx.bdi import BeliefBase
+    logic = LogicTables()
+    logic.add_variable("A")
+    logic.add_expression("A or not A")
+    base = BeliefBase(logic=logic, chatter=object())
+    hits = CACHE_REQUESTS.value(cache="bdi.validity", result="hit")
+    misses = CACHE_REQUESTS.value(cache="bdi.validity", result="miss")
+    assert base.is_valid("A or not A") and base.is_valid("A or not A")
+    assert CACHE_REQUESTS.value(cache="bdi.validity", result="miss") == misses + 1
+    assert CACHE_REQUESTS.value(cache="bdi.validity", result="hit") == hits + 1
+
+
+def test_metrics_endpoint():
+    import ezAGI
+
+    async def scrape():
+        transport = httpx.ASGITransport(app=ezAGI.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://ezagi") as client:
+            return await client.get("/metrics")
+
+    response = asyncio.run(scrape())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'ezagi_queue_depth{queue="internal_queue"} 0' in response.text
+    assert "ezagi_active_sessions" in response.text
@@ -0,0 +1,79 @@
+# automindx.nonmonotonic: DefaultLogic's incremental fixpoint against the naive loop
+import random
+
+import pytest
+
+from automindx.nonmonotonic import Default, DefaultLogic, Rule
+
+
+def naive_beliefs(rules, defaults, facts):
+    """The fixpoint loop DefaultLogic.evaluate used to run, seeded with the facts."""
+    beliefs = set(facts)
+    while True:
+        new_beliefs = set()
+        for rule in rules:
+            if rule.applies(beliefs):
+                new_beliefs.update(rule.conclusions)
+        for default in defaults:
+            if default.applies(beliefs):
+                new_beliefs.update(default.conclusions)
+        if new_beliefs.issubset(beliefs):
+            return beliefs
+        beliefs.update(new_beliefs)
+
+
+def random_theory(rng, atoms=40, rules=60, defaults=10, facts=8):
+    names = [f"a{i}" for i in range(atoms)]
+
+    def sample(low, high):
+        return set(rng.sample(names, rng.randint(low, high)))
+    return ([Rule(sample(0, 3), sample(1, 2)) for _ in range(rules)],
+            [Default(sample(1, 2), sample(1, 2)) for _ in range(defaults)],
+            sample(facts, facts))
+
+
+def test_matches_the_naive_fixpoint():
+    rng = random.Random(0)
+    for _ in range(50):
+        rules, defaults, facts = random_theory(rng)
+        logic = DefaultLogic()
+        for rule in rules:
+            logic.add_rule(rule)
+        for default in defaults:
+            logic.add_default(default)
+        logic.add_facts(facts)
+        assert logic.beliefs() == naive_beliefs(rules, defaults, facts)
+
+
+def test_incremental_additions_match_a_rebuild():
+    rng = random.Random(1)
+    for _ in range(30):
+        rules, defaults, facts = random_theory(rng)
+        items = [("rule", r) for r in rules] + [("default", d) for d in defaults] + [("fact", f) for f in facts]
+        rng.shuffle(items)
+        logic = DefaultLogic()
+        seen = {"rule": [], "default": [], "fact": set()}
+        for kind, item in items:
+            getattr(logic, f"add_{kind}")(item)
+            seen[kind].add(item) if kind == "fact" else seen[kind].append(item)
+            if rng.random() < 0.3:  # queries between additions keep the fixpoint live
+                assert logic.beliefs() == naive_beliefs(seen["rule"], seen["default"], seen["fact"])
+        assert logic.beliefs() == naive_beliefs(rules, defaults, facts)
+
+
+def test_a_blocking_fact_retracts_a_default():
+    logic = DefaultLogic()
+    logic.add_default(Default({"penguin"}, {"flies"}))
+    logic.add_rule(Rule({"flies"}, {"nests_in_trees"}))
+    assert logic.evaluate("nests_in_trees")
+    logic.add_fact("penguin")
+    assert not logic.evaluate("flies") and not logic.evaluate("nests_in_trees")
+    assert logic.evaluate("penguin")
+
+
+def test_rejects_non_rules():
+    logic = DefaultLogic()
+    with pytest.raises(ValueError):
+        logic.add_rule(Default(set(), set()))
+    with pytest.raises(ValueError):
+        Rule(["a"], {"b"})
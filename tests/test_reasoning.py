@@ -16,7 +16,7 @@ def test_draw_conclusion_end_to_end(mock_chatter):
 
     assert conclusion == mock_chatter.response
     assert reasoning.premises == []  # cleared for the next round
-    assert reasoning.last_confidence == 0.9  # LLM-judged VALID
+    assert 0.7 < reasoning.last_confidence < 0.95  # LLM-judged VALID on the first attempt
 
     kinds = [kind for kind, _ in events]
     assert "premise" in kinds
@@ -35,7 +35,8 @@ def test_validated_truth_recorded(mock_chatter):
     data = json.loads(truth_file.read_text())
     assert isinstance(data, list)
     assert data[-1]["truth"] == mock_chatter.response
-    assert data[-1]["confidence"] == 0.9
+    assert data[-1]["confidence"] == reasoning.last_confidence > 0.7
+    assert data[-1]["signals"]["verdict"] is True
 
     # a second conclusion must keep the file a valid JSON array (regression)
     reasoning.add_premise("fire is hot")
@@ -56,13 +57,30 @@ def test_unvalidated_conclusion_not_saved_as_truth(mock_chatter):
     reasoning.add_premise("something dubious")
     reasoning.draw_conclusion()
 
-    assert reasoning.last_confidence == 0.3
+    assert reasoning.last_confidence < 0.4
     truth_file = pathlib.Path("memory/logs/truth.json")
     assert not truth_file.exists()
     notpremise = json.loads(pathlib.Path("memory/logs/notpremise.json").read_text())
     assert any("Unvalidated conclusion" in entry["message"] for entry in notpremise)
 
 
+def test_direct_validation_scores_a_first_attempt(mock_chatter):
+    class InvalidJudge(type(mock_chatter)):
+        def _answer(self, knowledge):
+            if "Answer exactly VALID or INVALID" in knowledge:
+                return "INVALID"
+            return self.response
+
+    reasoning = SocraticReasoning(InvalidJudge())
+    reasoning.add_premise("something dubious")
+    reasoning.draw_conclusion()
+    assert reasoning.confidence.last_signals["retries"] == 5  # every attempt failed
+
+    reasoning.add_premise("something dubious")
+    reasoning.logical_conclusion = "something dubious"
+    reasoning.validate_conclusion()
+    assert reasoning.confidence.last_signals["retries"] == 1  # not the previous turn's count
+
 def test_streaming_token_hook(mock_chatter):
     reasoning = SocraticReasoning(mock_chatter)
     tokens = []
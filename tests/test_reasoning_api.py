@@ -0,0 +1,131 @@
+# headless /v1 reasoning routes with a mock chatter — isolated turns, SSE, batch, limits
+import asyncio
+import threading
+
+import httpx
+import ujson
+from fastapi import FastAPI
+
+from webmind.reasoning_api import ReasonRequest, ReasoningAPI, create_router
+from conftest import MockChatter
+
+
+def make_app(factory=None, **kwargs):
+    api = ReasoningAPI(factory or (lambda provider, model: MockChatter()), **kwargs)
+    app = FastAPI()
+    app.include_router(create_router(api))
+    return app, api
+
+
+def post(app, path, payload):
+    async def call():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://ezagi") as client:
+            return await client.post(path, json=payload)
+    return asyncio.run(call())
+
+
+def test_reason_sync():
+    app, _ = make_app()
+    response = post(app, "/v1/reason", {"prompt": "why is the sky blue",
+                                        "premises": ["light scatters"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["conclusion"] == MockChatter().response
+    assert body["validated"] is True
+    assert body["provider"] == "mock"
+
+
+def test_each_request_gets_its_own_chatter():
+    built = []
+
+    def factory(provider, model):
+        chatter = MockChatter()
+        if model:
+            chatter.set_model(model)
+        built.append(chatter)
+        return chatter
+
+    app, _ = make_app(factory)
+    post(app, "/v1/reason", {"prompt": "one", "model": "m1"})
+    post(app, "/v1/reason", {"prompt": "two"})
+    assert len(built) == 2
+    assert built[0].current_model == "m1" and built[1].current_model == "mock-model"
+    assert not any("two" in call for call in built[0].calls)
+
+
+def test_reason_stream_sse():
+    app, _ = make_app()
+    response = post(app, "/v1/reason/stream", {"prompt": "stream me"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block.split("\n") for block in response.text.strip().split("\n\n")]
+    kinds = [lines[0].removeprefix("event: ") for lines in events]
+    assert "token" in kinds and "trace" in kinds
+    assert kinds[-1] == "done"
+    done = ujson.loads(events[-1][1].removeprefix("data: "))
+    tokens = "".join(ujson.loads(lines[1].removeprefix("data: "))["text"]
+                     for lines in events if lines[0] == "event: token")
+    assert tokens.strip() == done["conclusion"]
+
+
+def test_batch_and_size_limit():
+    app, _ = make_app(max_batch=2)
+    response = post(app, "/v1/batch", {"requests": [{"prompt": "a"}, {"prompt": "b"}]})
+    results = response.json()["results"]
+    assert len(results) == 2 and all(r["validated"] for r in results)
+    assert post(app, "/v1/batch", {"requests": [{"prompt": "x"}] * 3}).status_code == 413
+
+
+def test_no_chatter_is_503():
+    app, _ = make_app(lambda provider, model: None)
+    assert post(app, "/v1/reason", {"prompt": "hello"}).status_code == 503
+    batch = post(app, "/v1/batch", {"requests": [{"prompt": "hello"}]}).json()
+    assert batch["results"][0]["status"] == 503
+
+
+def test_concurrency_limit_rejects_with_429():
+    app, api = make_app(max_concurrency=1, queue_timeout=0.05)
+
+    async def saturated():
+        await api.acquire()  # hold the only slot
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://ezagi") as client:
+                return await client.post("/v1/reason", json={"prompt": "wait"})
+        finally:
+            api.release()
+
+    assert asyncio.run(saturated()).status_code == 429
+
+
+def test_cancelled_request_keeps_its_slot_until_the_turn_ends():
+    release_llm = threading.Event()
+    threads = []
+
+    class SlowChatter(MockChatter):
+        def generate_response(self, knowledge):
+            release_llm.wait(5)
+            return super().generate_response(knowledge)
+
+    def factory(provider, model):
+        threads.append(threading.current_thread())
+        return SlowChatter()
+
+    api = ReasoningAPI(factory, max_concurrency=1)
+
+    async def scenario():
+        task = asyncio.create_task(api.reason(ReasonRequest(prompt="slow")))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.sleep(0.05)
+        held = api._slots.locked()  # the client is gone but the LLM call still runs
+        release_llm.set()
+        for _ in range(100):
+            if not api._slots.locked():
+                break
+            await asyncio.sleep(0.02)
+        return held, api._slots.locked()
+
+    held, still_held = asyncio.run(scenario())
+    assert held and not still_held
+    assert threads and threads[0] is not threading.main_thread()  # built off the event loop
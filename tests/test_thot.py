@@ -0,0 +1,130 @@
+# automindx.reasoning: THOT dispatch across template and LLM-backed reasoning styles
+import threading
+import time
+
+from automindx.reasoning import THOT, LLMReasoner, Proposition, agree, conclusion_of
+
+
+class SlowChatter:
+    """Answers after a per-style delay; records the prompts it was given."""
+    def __init__(self, delay=0.1, delays=None, answer="Socrates is mortal."):
+        self.delay = delay
+        self.delays = delays or {}
+        self.answer = answer
+        self.prompts = []
+        self.in_flight = 0
+        self.peak = 0  # most calls in flight at once
+        self.lock = threading.Lock()
+
+    def generate_response(self, prompt):
+        with self.lock:
+            self.prompts.append(prompt)
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        heading = prompt.split(" reasoning.")[0]
+        time.sleep(self.delays.get(heading, self.delay))
+        with self.lock:
+            self.in_flight -= 1
+        return f"{heading} view.\nConclusion: {self.answer}"
+
+
+def test_template_styles_are_unchanged():
+    thot = THOT()
+    results = thot.think("Socrates is a human")
+    assert list(results) == list(THOT.STYLES)
+    assert results["deductive"].startswith("Deductive Reasoning:\nSocrates is a human")
+    assert results["inductive"] == "Inductive Reasoning:\nSocrates is a human\nTherefore, all X are Y.\n"
+    assert thot.thot_log.lookup("Socrates is a human")[-1]["results"] == results
+    assert len(thot.combine_results(Proposition("p: All X are Y."), Proposition("q: Z is X."))) == len(THOT.STYLES)
+
+
+def test_llm_styles_run_concurrently_with_their_own_prompts():
+    chatter = SlowChatter(delay=0.2)
+    thot = THOT(chatter)
+    assert all(isinstance(r, LLMReasoner) for r in thot.reasoners.values())
+    results = thot.think("Socrates is a human")
+    assert chatter.peak > 1  # timing lives in the thot.think benchmark
+    assert list(results) == list(THOT.STYLES)
+    assert results["causal"].startswith("Causal view.")
+    assert len(chatter.prompts) == 15
+    assert any("causes and effects" in p for p in chatter.prompts)
+
+
+def test_slow_styles_time_out_and_results_stream_in_completion_order():
+    chatter = SlowChatter(delay=0.05, delays={"Deductive": 2.0, "Formal": 0.3})
+    thot = THOT(chatter, timeout=0.5)
+    streamed = list(thot.think_stream("Socrates is a human", styles=["deductive", "formal", "causal"]))
+    assert [name for name, _ in streamed] == ["causal", "formal", "deductive"]
+    assert streamed[-1][1] == "Error: timed out after 0.5s"
+
+
+def test_quorum_stops_early():
+    chatter = SlowChatter(delay=0.05)
+    thot = THOT(chatter, workers=1, quorum=3)
+    results = thot.think("Socrates is a human")
+    assert len(results) == 3 and thot.consensus == list(results)
+    assert len(chatter.prompts) <= 4  # queued styles were cancelled
+    assert conclusion_of("Causal view.\nConclusion: Socrates is mortal.") == "Socrates is mortal."
+    assert agree("Socrates is mortal.", "Therefore Socrates is mortal") and not agree("Socrates is mortal.", "Dogs bark")
+
+
+def test_calls_share_one_bounded_pool():
+    chatter = SlowChatter(delay=0.01)
+    for _ in range(5):
+        THOT(chatter, workers=4).think("Socrates is a human")
+        assert chatter.peak <= 4
+    pool_threads = [t for t in threading.enumerate() if t.name.startswith("thot-style")]
+    assert len(pool_threads) <= THOT.MAX_WORKERS
+
+
+def test_concurrent_thinks_keep_their_own_consensus():
+    first, second = [], []
+    thot = THOT(SlowChatter(delay=0.01), quorum=2)
+    a = thot.think_stream("Socrates is a human", consensus=first)
+    b = thot.think_stream("Plato is a human", consensus=second)
+    next(a), next(b)
+    list(a), list(b)
+    assert len(first) == 2 and len(second) == 2
+
+
+def test_styles_are_called_by_name():
+    class Recorder:
+        def reason(self, *args):
+            self.args = args
+            return "Conclusion: recorded"
+
+    inductive, nonmonotonic = Recorder(), Recorder()
+    THOT(reasoners={"inductive": inductive, "nonmonotonic": nonmonotonic}).think("Socrates is a human")
+    assert isinstance(inductive.args[0], list) and len(inductive.args) == 1
+    assert isinstance(nonmonotonic.args[0], list) and len(nonmonotonic.args) == 2
+    assert "Socrates is a human" in LLMReasoner(SlowChatter(), "inductive").prompt([Proposition("Socrates is a human")])
+
+
+def test_stragglers_in_a_full_pool_do_not_block_later_calls(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    from automindx import reasoning
+    hung = threading.Event()
+
+    class Hung:
+        concurrent = True
+
+        def reason(self, p, q):
+            hung.wait(10)
+            return "Conclusion: late"
+
+    class Instant:
+        concurrent = True
+
+        def reason(self, p, q):
+            return "Conclusion: quick"
+
+    pool = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(reasoning, "_pool", pool)
+    try:
+        stuck = THOT(reasoners={"one": Hung(), "two": Hung()}, timeout=0.2).think("Socrates is a human")
+        assert all(r.startswith("Error: timed out") for r in stuck.values())  # both threads still busy
+        results = THOT(reasoners={"quick": Instant()}, timeout=0.2).think("Socrates is a human")
+        assert results == {"quick": "Error: timed out after 0.2s"}  # queued past its deadline, given up on
+    finally:
+        hung.set()
+        pool.shutdown()
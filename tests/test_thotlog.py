@@ -0,0 +1,54 @@
+# memory.thotlog: rotated, indexed, asynchronous THOT log
+import gzip
+import json
+import os
+import threading
+import time
+
+from memory.thotlog import INDEX_FILE, ThotLog
+
+
+def test_log_returns_before_the_write_and_lookup_finds_it(tmp_path):
+    log = ThotLog(str(tmp_path / "thots"))
+    gate, append = threading.Event(), log._append
+    log._append = lambda batch: gate.wait(5) and append(batch)  # hold the writer back
+    for i in range(500):
+        log.log({"input": f"thought {i % 50}", "results": {"n": i}})
+    assert not (tmp_path / "thots").exists()  # every log() returned before anything was written
+    gate.set()
+    found = log.lookup("thought 7")
+    assert [e["results"]["n"] for e in found] == list(range(7, 500, 50))
+    assert all("time" in e for e in found)
+    assert log.lookup("never thought") == []
+    assert len(list(log.entries())) == 500
+
+
+def test_segments_rotate_by_size_and_age_and_are_gzipped(tmp_path):
+    folder = tmp_path / "thots"
+    log = ThotLog(str(folder), max_bytes=2000, idle=0.05)
+    for i in range(200):
+        log.log({"input": f"thought {i}", "results": "x" * 20})
+    log.flush()
+    names = sorted(os.listdir(folder))
+    packed = [n for n in names if n.endswith(".jsonl.gz")]
+    assert len(packed) >= 3 and [n for n in names if n.endswith(".jsonl")] == ["thots-%06d.jsonl" % len(packed)]
+    with gzip.open(folder / packed[0]) as file:
+        assert json.loads(file.readline())["input"] == "thought 0"
+    assert log.lookup("thought 3")[0]["results"] == "x" * 20  # read back through gzip
+    assert [e["input"] for e in log.entries()] == [f"thought {i}" for i in range(200)]
+    time.sleep(0.3)  # the idle writer exits; a new log instance resumes the active segment
+    aged = ThotLog(str(folder), max_age=0.0)
+    aged.log({"input": "late", "results": {}})
+    aged.log({"input": "later", "results": {}})
+    assert aged.lookup("later") and len(list(aged.entries())) == 202
+    assert len([n for n in os.listdir(folder) if n.endswith(".gz")]) == len(packed) + 2
+
+
+def test_legacy_json_log_is_migrated_once(tmp_path):
+    legacy = tmp_path / "thots.json"
+    legacy.write_text(json.dumps([{"input": "old", "results": {"deductive": "r"}}]))
+    log = ThotLog(str(tmp_path / "thots"), legacy=str(legacy))
+    log.log({"input": "new", "results": {}})
+    assert [e["input"] for e in log.entries()] == ["old", "new"]
+    assert not legacy.exists() and (tmp_path / "thots.json.migrated").exists()
+    assert (tmp_path / "thots" / INDEX_FILE).read_text().count("\n") == 2
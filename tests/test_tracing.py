@@ -0,0 +1,116 @@
+# tracing: no-op when off, span nesting, exporters, pipeline instrumentation
+import asyncio
+import json
+import pathlib
+
+import pytest
+
+from automind.tracing import tracer, NOOP_SPAN, RingBufferExporter, JSONLExporter, percentile
+from automind.SocraticReasoning import SocraticReasoning
+
+
+@pytest.fixture(autouse=True)
+def isolated_tracer():
+    """Start each test with tracing off and restore the process-wide state after."""
+    enabled, exporters = tracer.enabled, tracer.exporters
+    tracer.disable()
+    yield
+    tracer.enabled, tracer.exporters = enabled, exporters
+
+
+@pytest.fixture
+def ring():
+    buffer = RingBufferExporter(capacity=64)
+    tracer.enable(buffer)
+    return buffer
+
+
+def test_span_is_noop_when_disabled():
+    with tracer.span("validation") as span:
+        span.set(valid=True)
+        span.mark("ttft_ms")
+    assert span is NOOP_SPAN
+
+
+def test_nested_spans_and_stats(ring):
+    with tracer.span("reasoning.turn") as outer:
+        with tracer.span("validation", method="llm_judgment") as inner:
+            inner.set(valid=True)
+    spans = ring.spans()
+    assert [s["name"] for s in spans] == ["validation", "reasoning.turn"]
+    assert spans[0]["parent_id"] == outer.span_id
+    assert spans[0]["valid"] is True
+    stats = ring.stats()
+    assert stats["validation"]["count"] == 1
+    assert stats["reasoning.turn"]["p95_ms"] >= stats["validation"]["p50_ms"]
+
+
+def test_interleaved_tasks_keep_their_own_parents(ring):
+    async def traced(name):
+        with tracer.span(name) as outer:
+            await asyncio.sleep(0.01)
+            with tracer.span(name + ".child") as inner:
+                await asyncio.sleep(0.01)
+        return outer, inner
+
+    async def both():
+        return await asyncio.gather(traced("a"), traced("b"))
+
+    (a, a_child), (b, b_child) = asyncio.run(both())
+    assert a.parent_id is None and b.parent_id is None
+    assert a_child.parent_id == a.span_id and b_child.parent_id == b.span_id
+    with tracer.span("later") as later:  # nothing left open on this thread
+        pass
+    assert later.parent_id is None
+
+
+def test_ring_buffer_is_bounded(ring):
+    for _ in range(100):
+        with tracer.span("file.write"):
+            pass
+    assert len(ring.spans()) == 64
+
+
+def test_jsonl_exporter(ring):
+    exporter = JSONLExporter("memory/logs/trace.jsonl")
+    tracer.add_exporter(exporter)
+    with tracer.span("truth_table", rows=4):
+        pass
+    lines = pathlib.Path("memory/logs/trace.jsonl").read_text().splitlines()
+    assert json.loads(lines[-1])["rows"] == 4
+
+
+def test_percentile():
+    assert percentile([], 50) == 0.0
+    assert percentile([1, 2, 3, 4], 50) == 2
+    assert percentile(list(range(1, 101)), 95) == 95
+
+
+def test_reasoning_turn_is_traced(ring, mock_chatter):
+    reasoning = SocraticReasoning(mock_chatter)
+    reasoning.add_premise("All humans are mortal.")
+    reasoning.draw_conclusion()
+    names = {s["name"] for s in ring.spans()}
+    assert {"reasoning.turn", "premise_generation", "conclusion_generation",
+            "validation", "file.write"} <= names
+    turn = ring.spans("reasoning.turn")[-1]
+    assert turn["validated"] is True
+
+
+def test_llm_span_records_ttft_and_usage(ring):
+    from webmind.chatter import BaseChatter
+
+    class Streamy(BaseChatter):
+        provider = "mock"
+
+        async def generate_response_stream(self, knowledge):
+            self.last_usage = None
+            for word in ("augmented", "generative", "intelligence"):
+                yield word + " "
+            self.last_usage = {"input_tokens": 3, "output_tokens": 3}
+
+    assert Streamy().generate_response("x") == "augmented generative intelligence"
+    llm = ring.spans("llm")[-1]
+    assert llm["provider"] == "mock"
+    assert llm["ttft_ms"] <= llm["duration_ms"]
+    assert llm["output_tokens"] == 3 and llm["tokens_per_s"] > 0
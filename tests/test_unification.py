@@ -0,0 +1,94 @@
+# automindx.unification: terms, iterative unification and the fact index
+import random
+
+import pytest
+
+from automindx.deductive import unify_expressions
+from automindx.unification import (Bindings, FactIndex, Var, compound, format_term, parse,
+                                   rename, unify)
+
+
+def test_parse_and_format_round_trip():
+    text = "likes(X, pair(socrates, 3), [a, Y, X], [], 'Ancient Greece')"
+    term = parse(text)
+    assert format_term(term) == text
+    assert term[1] is term[3][3]  # one Var per name within a parse
+    assert parse("f(_, _)")[1] is not parse("f(_, _)")[2]
+    with pytest.raises(ValueError):
+        parse("f(a, ")
+
+
+def test_unify_resolves_and_fails_cleanly():
+    a, b = parse("p(X, g(Y), Y)"), parse("p(f(Z), g(W), c)")
+    bindings = unify(a, b)
+    assert format_term(bindings.resolve(a)) == "p(f(Z), g(c), c)"
+    assert bindings.resolve(a) == bindings.resolve(b)
+    before = bindings.as_dict()
+    x = a[1]
+    assert unify(x, parse("h(q)"), bindings) is None  # X is already f(Z)
+    assert bindings.as_dict() == before  # the failed attempt left nothing behind
+
+
+def test_occurs_check():
+    x = Var("X")
+    assert unify(x, compound("f", x)) is None
+    assert unify(x, compound("f", x), occurs_check=False) is not None
+    shared = {}
+    assert unify(parse("p(X, Y)", shared), parse("p(Y, f(X))", shared)) is None
+
+
+def test_deep_terms_do_not_recurse():
+    depth = 100_000
+    x = Var("X")
+    left, right = x, "end"
+    for _ in range(depth):
+        left, right = compound("s", left), compound("s", right)
+    bindings = unify(left, right)
+    assert bindings.find(x) == "end"
+    assert format_term(bindings.resolve(left)) == format_term(right)  # == on the tuples would recurse
+    assert format_term(right).endswith("end" + ")" * depth)
+    assert unify(compound("s", left), left) is None  # different depths
+
+
+def test_legacy_unify_expressions():
+    assert unify_expressions(['f', 'x', 'y'], ['f', 'a', 'b'], {}) == {'x': 'a', 'y': 'b'}
+    substitution = {'x': 'Plato'}
+    assert unify_expressions('x', 'Socrates', substitution) is None
+    assert substitution == {'x': 'Plato'}
+    assert unify_expressions(['p', 'x', ['g', 'x']], ['p', 'y', 'y'], {}) is None
+
+
+def random_term(rng, depth, variables):
+    roll = rng.random()
+    if depth == 0 or roll < 0.3:
+        return rng.choice(variables) if roll < 0.1 else rng.choice(["a", "b", "c", 1])
+    functor = rng.choice(["f", "g", "h"])
+    return compound(functor, *(random_term(rng, depth - 1, variables) for _ in range(len(functor) + (functor == "g"))))
+
+
+def test_fact_index_matches_a_linear_scan():
+    rng = random.Random(0)
+    index, facts = FactIndex(), []
+    for i in range(400):
+        fact = random_term(rng, 3, [Var(f"V{i}"), Var(f"W{i}")])
+        facts.append(fact)
+        index.add(fact)
+    assert len(index) == 400
+    for _ in range(200):
+        query = random_term(rng, 3, [Var("Q"), Var("R")])
+        expected = [f for f in facts if unify(query, f) is not None]
+        candidates = list(index.candidates(query))
+        assert len(candidates) <= len(facts)
+        found = [f for f, _ in index.unifiable(query)]
+        assert sorted(map(id, found)) == sorted(map(id, expected))
+    for fact in facts[:200]:
+        index.remove(fact)
+    assert len(index) == 200 and {id(f) for f in index.candidates(Var("Any"))} == set(map(id, facts[200:]))
+
+
+def test_rename_standardizes_apart():
+    rule = parse("parent(X, Y)")
+    fresh = rename(rule)
+    assert format_term(fresh) == format_term(rule) and fresh[1] is not rule[1]
+    bindings = unify(rule, parse("parent(a, X)"))
+    assert isinstance(bindings, Bindings)
@@ -20,6 +20,7 @@ try:
 except ImportError:  # optional dependency: pip install "ezagi[anthropic]"
     anthropic = None
 
+from automind.tracing import tracer, NOOP_SPAN
 from webmind.ollama_handler import OllamaHandler, OLLAMA_CLOUD_MODELS
 
 DEFAULT_MODELS = {
@@ -103,12 +104,32 @@ class BaseChatter:
             self.cumulative_usage["input_tokens"] += u.get("input_tokens") or 0
             self.cumulative_usage["output_tokens"] += u.get("output_tokens") or 0
 
+    async def _collect_stream(self, knowledge, on_token=None):
+        """
+        Drain generate_response_stream into the full response inside an "llm"
+        trace span (time to first token, tokens/sec, usage), forwarding each
+        chunk to on_token when given.
+        """
+        with tracer.span("llm", provider=self.provider, model=self.current_model) as span:
+            pieces = []
+            async for chunk in self.generate_response_stream(knowledge):
+                if not pieces:
+                    span.mark("ttft_ms")
+                pieces.append(chunk)
+                if on_token is not None:
+                    on_token(chunk)
+            self._fold_usage()
+            response = "".join(pieces).strip()
+            if span is not NOOP_SPAN:
+                usage = self.last_usage or {}
+                output_tokens = usage.get("output_tokens") or max(1, len(response) // 4)
+                elapsed_s = span.elapsed_ms() / 1000.0
+                span.set(input_tokens=usage.get("input_tokens"), output_tokens=output_tokens,
+                         tokens_per_s=round(output_tokens / elapsed_s, 2) if elapsed_s > 0 else None)
+            return response
+
     async def generate_response_async(self, knowledge):
-        pieces = []
-        async for chunk in self.generate_response_stream(knowledge):
-            pieces.append(chunk)
-        self._fold_usage()
-        return "".join(pieces).strip()
+        return await self._collect_stream(knowledge)
 
     def generate_response(self, knowledge):
         try:
@@ -122,15 +143,8 @@ class BaseChatter:
         Synchronous generation that forwards each streamed chunk to on_token
         (called from the calling thread) and returns the full response.
         """
-        async def _collect():
-            pieces = []
-            async for chunk in self.generate_response_stream(knowledge):
-                pieces.append(chunk)
-                on_token(chunk)
-            self._fold_usage()
-            return "".join(pieces).strip()
         try:
-            return _run_coro_sync(_collect())
+            return _run_coro_sync(self._collect_stream(knowledge, on_token))
         except Exception as e:
             logging.error(f"{self.provider} api error: {e}")
             return f"error: unable to generate a response due to an issue with the {self.provider} api."
@@ -0,0 +1,201 @@
+# reasoning_api.py (c) 2024 Gregory L. Magnusson MIT license
+# headless HTTP/JSON reasoning API mounted on the console's FastAPI app, alongside the UI
+#   POST /v1/reason          reason about one prompt, answer when the conclusion is drawn
+#   POST /v1/reason/stream   the same as server-sent events: token, trace, done (or error)
+#   POST /v1/batch           several reason requests in one call, run concurrently
+# every request gets its own chatter and SocraticReasoning, built and run in executor threads,
+# so requests never share premises, callbacks or usage counters and no UI object is touched;
+# an asyncio semaphore bounds how many reasoning turns run at once (429 when saturated), and a
+# slot is only freed when its executor work finishes, even if the client went away first
+
+import asyncio
+import logging
+from typing import List, Optional
+
+import ujson
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from automind.SocraticReasoning import SocraticReasoning
+
+
+class ReasonRequest(BaseModel):
+    prompt: str = Field(..., min_length=1)
+    premises: List[str] = Field(default_factory=list)  # premises added before the prompt
+    provider: Optional[str] = None   # None = cloud-first resolution, local Ollama failsafe
+    model: Optional[str] = None
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+
+
+class BatchRequest(BaseModel):
+    requests: List[ReasonRequest]
+
+
+class ReasoningAPI:
+    """
+    Runs isolated reasoning turns for the /v1 routes.
+
+    Args:
+        chatter_factory: callable(provider, model) -> a fresh chatter, or None when
+            no provider is available.
+        max_concurrency: reasoning turns allowed to run at the same time.
+        queue_timeout: seconds a request may wait for a free slot before a 429.
+        max_batch: largest accepted /v1/batch.
+    """
+    def __init__(self, chatter_factory, max_concurrency=4, queue_timeout=30.0, max_batch=64):
+        self.chatter_factory = chatter_factory
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_batch = max_batch
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def acquire(self):
+        """Wait for a reasoning slot or refuse the request with 429."""
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=429, detail="too many concurrent reasoning requests")
+
+    def release(self):
+        self._slots.release()
+
+    def build_reasoning(self, request):
+        """Make the turn's chatter and SocraticReasoning (blocking; called in an executor thread)."""
+        chatter = self.chatter_factory(request.provider, request.model)
+        if chatter is None:
+            raise HTTPException(status_code=503,
+                                detail="no chatter available: add an API key or start Ollama")
+        if hasattr(chatter, 'set_sampling'):
+            chatter.set_sampling(temperature=request.temperature, max_tokens=request.max_tokens)
+        return SocraticReasoning(chatter)
+
+    async def prepare(self, request):
+        """
+        Take a slot and build the turn's SocraticReasoning off the event loop.
+
+        On success the caller owns the slot and hands it to start(). If building fails or
+        the caller is cancelled, the slot is freed once the build job itself has finished.
+
+        Returns:
+            SocraticReasoning: the turn's reasoning.
+        """
+        await self.acquire()
+        building = asyncio.get_running_loop().run_in_executor(None, self.build_reasoning, request)
+        try:
+            return await asyncio.shield(building)
+        except BaseException:
+            building.add_done_callback(lambda _: self.release())
+            raise
+
+    def start(self, request, reasoning, on_token=None, on_event=None):
+        """
+        Run a prepared turn in an executor thread. Its slot is freed by the executor
+        future's done-callback, so a dropped client cannot free it while the LLM still works;
+        await the returned future under asyncio.shield.
+
+        Returns:
+            asyncio.Future: the turn's result, see run().
+        """
+        turn = asyncio.get_running_loop().run_in_executor(None, self.run, request, reasoning,
+                                                          on_token, on_event)
+        turn.add_done_callback(lambda _: self.release())
+        return turn
+
+    def run(self, request, reasoning, on_token=None, on_event=None):
+        """
+        One reasoning turn (blocking; called in an executor thread).
+
+        Returns:
+            dict: conclusion, validated, confidence, provider, model and usage.
+        """
+        verdict = {}
+
+        def observe(event_type, payload):
+            if event_type == "conclusion":
+                verdict.update(payload)
+            if on_event is not None:
+                on_event(event_type, payload)
+
+        reasoning.on_event = observe
+        reasoning.on_token = on_token
+        for premise in request.premises:
+            reasoning.add_premise(premise)
+        reasoning.add_premise(request.prompt)
+        conclusion = reasoning.draw_conclusion()
+        chatter = reasoning.chatter
+        return {
+            "conclusion": conclusion,
+            "validated": bool(verdict.get("validated", False)),
+            "confidence": reasoning.last_confidence,
+            "provider": getattr(chatter, "provider", None),
+            "model": chatter.get_current_model() if hasattr(chatter, "get_current_model") else None,
+            "usage": dict(getattr(chatter, "cumulative_usage", None) or chatter.last_usage or {}),
+        }
+
+    async def reason(self, request):
+        reasoning = await self.prepare(request)
+        return await asyncio.shield(self.start(request, reasoning))
+
+    async def batch_item(self, request):
+        try:
+            return await self.reason(request)
+        except HTTPException as e:
+            return {"error": e.detail, "status": e.status_code}
+        except Exception as e:
+            logging.error(f"batch reasoning error: {e}")
+            return {"error": str(e), "status": 500}
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {ujson.dumps(data)}\n\n"
+
+
+def create_router(api):
+    """Build the /v1 router for a ReasoningAPI."""
+    router = APIRouter(prefix="/v1", tags=["reasoning"])
+
+    @router.post("/reason")
+    async def reason(request: ReasonRequest):
+        return await api.reason(request)
+
+    @router.post("/reason/stream")
+    async def reason_stream(request: ReasonRequest):
+        reasoning = await api.prepare(request)
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+
+        def on_token(chunk):
+            loop.call_soon_threadsafe(events.put_nowait, ("token", {"text": chunk}))
+
+        def on_event(event_type, payload):
+            loop.call_soon_threadsafe(events.put_nowait, ("trace", {"type": event_type, **payload}))
+
+        # started before the response so the slot is tied to the turn, not to the stream
+        turn = api.start(request, reasoning, on_token, on_event)
+
+        async def stream():
+            while not (turn.done() and events.empty()):
+                try:
+                    event, data = await asyncio.wait_for(events.get(), timeout=0.25)
+                except asyncio.TimeoutError:
+                    continue
+                yield _sse(event, data)
+            try:
+                yield _sse("done", await asyncio.shield(turn))
+            except Exception as e:
+                logging.error(f"streamed reasoning error: {e}")
+                yield _sse("error", {"error": str(e)})
+
+        return StreamingResponse(stream(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache"})
+
+    @router.post("/batch")
+    async def batch(request: BatchRequest):
+        if len(request.requests) > api.max_batch:
+            raise HTTPException(status_code=413, detail=f"batch larger than {api.max_batch} requests")
+        results = await asyncio.gather(*(api.batch_item(r) for r in request.requests))
+        return {"results": list(results)}
+
+    return router